@@ -3,15 +3,31 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from job_app.models import User, Company, Job, Application
+from django.utils import timezone
+from job_app.models import User, Company, Job, Application, ApplicationStatusChange, OutboxEvent
+from django.db import transaction
+from job_app.caching import invalidate_model
+from job_app.events import record_status_changes
+from job_app.pagination import EstimatedCountPaginator, KeysetChangeList
+
+
+class LargeTableAdminMixin:
+    """Changelist settings for tables too big to count or OFFSET through"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
 
 # Custom User Admin
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
     list_display = ('email', 'first_name', 'last_name', 'user_type', 'company', 'is_active', 'date_joined')
-    list_filter = ('user_type', 'is_active', 'is_staff', 'date_joined', 'company')
+    list_filter = ('user_type', 'is_active', 'is_staff', 'date_joined')
     search_fields = ('email', 'first_name', 'last_name', 'phone')
     ordering = ('-date_joined',)
+    autocomplete_fields = ('company',)
     
     # Customize the fieldsets for add/edit forms
     fieldsets = BaseUserAdmin.fieldsets + (
@@ -32,19 +48,26 @@ class UserAdmin(BaseUserAdmin):
 # Company Admin
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
-    list_display = ('name', 'website', 'jobs_count', 'logo_preview')
+    list_display = ('name', 'website', 'jobs_count', 'open_applications_count', 'logo_preview')
     search_fields = ('name', 'description')
-    list_filter = ('name',)
     ordering = ('name',)
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_stats()
+    
     def jobs_count(self, obj):
         """Display count of jobs for this company"""
-        count = obj.jobs.count()
-        if count > 0:
+        if obj.jobs_count > 0:
             url = reverse('admin:job_app_job_changelist') + f'?company__id__exact={obj.id}'
-            return format_html('<a href="{}">{} jobs</a>', url, count)
+            return format_html('<a href="{}">{} jobs</a>', url, obj.jobs_count)
         return '0 jobs'
     jobs_count.short_description = 'Jobs Posted'
+    jobs_count.admin_order_field = 'jobs_count'
+    
+    def open_applications_count(self, obj):
+        return obj.open_applications_count
+    open_applications_count.short_description = 'Open Applications'
+    open_applications_count.admin_order_field = 'open_applications_count'
     
     def logo_preview(self, obj):
         """Display logo preview in admin"""
@@ -58,12 +81,14 @@ class CompanyAdmin(admin.ModelAdmin):
 
 # Job Admin
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
-    list_display = ('title', 'company', 'job_type', 'location', 'salary', 'is_active', 'applications_count', 'posted_by', 'created_at')
-    list_filter = ('job_type', 'is_active', 'created_at', 'company', 'location')
+class JobAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('title', 'company', 'job_type', 'location', 'salary', 'is_active', 'applications_link', 'posted_by', 'created_at')
+    # Company and location are searched, not listed: each has too many distinct values
+    list_filter = ('job_type', 'is_active', 'created_at')
     search_fields = ('title', 'description', 'location', 'company__name', 'posted_by__email')
-    readonly_fields = ('created_at', 'updated_at', 'applications_count')
+    readonly_fields = ('created_at', 'updated_at', 'applications_link')
     ordering = ('-created_at',)
+    autocomplete_fields = ('company', 'posted_by')
     
     fieldsets = (
         ('Job Information', {
@@ -81,14 +106,15 @@ class JobAdmin(admin.ModelAdmin):
         }),
     )
     
-    def applications_count(self, obj):
+    def applications_link(self, obj):
         """Display count of applications for this job"""
-        count = obj.applications.count()
+        count = obj.applications_count
         if count > 0:
             url = reverse('admin:job_app_application_changelist') + f'?job__id__exact={obj.id}'
             return format_html('<a href="{}">{} applications</a>', url, count)
         return '0 applications'
-    applications_count.short_description = 'Applications'
+    applications_link.short_description = 'Applications'
+    applications_link.admin_order_field = 'applications_count'
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('company', 'posted_by')
@@ -99,14 +125,26 @@ class JobAdmin(admin.ModelAdmin):
             kwargs["queryset"] = User.objects.filter(user_type='employer')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+class ApplicationStatusChangeInline(admin.TabularInline):
+    model = ApplicationStatusChange
+    fields = ('old_status', 'new_status', 'changed_by', 'changed_at', 'notified_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 # Application Admin  
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('candidate_name', 'job_title', 'company_name', 'status', 'applied_at')
-    list_filter = ('status', 'applied_at', 'job__company', 'job__job_type')
+    list_filter = ('status', 'applied_at', 'job__job_type')
     search_fields = ('candidate__email', 'candidate__first_name', 'candidate__last_name', 'job__title', 'job__company__name')
     readonly_fields = ('applied_at',)
     ordering = ('-applied_at',)
+    inlines = [ApplicationStatusChangeInline]
+    raw_id_fields = ('job', 'candidate')
     
     fieldsets = (
         ('Application Details', {
@@ -140,12 +178,30 @@ class ApplicationAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('job__company', 'candidate')
     
+    def save_model(self, request, obj, form, change):
+        """Log status edits made through the change form"""
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change and 'status' in form.changed_data:
+                record_status_changes([(obj.id, form.initial['status'], obj.status)], changed_by=request.user)
+    
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         """Customize foreign key fields"""
         if db_field.name == "candidate":
             kwargs["queryset"] = User.objects.filter(user_type='candidate')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+# Outbox Admin
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'created_at', 'dispatched_at', 'attempts', 'failed_at')
+    list_filter = ('task', ('dispatched_at', admin.EmptyFieldListFilter), ('failed_at', admin.EmptyFieldListFilter))
+    readonly_fields = ('task', 'args', 'kwargs', 'created_at', 'dispatched_at', 'attempts', 'failed_at', 'last_error')
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
 # Customize admin site headers
 admin.site.site_header = "Job Board Administration"
 admin.site.site_title = "Job Board Admin"
@@ -154,16 +210,30 @@ admin.site.index_title = "Welcome to Job Board Administration"
 # Custom admin actions
 @admin.action(description='Activate selected jobs')
 def make_jobs_active(modeladmin, request, queryset):
-    queryset.update(is_active=True)
+    queryset.update(is_active=True, updated_at=timezone.now())
+    invalidate_model('Job')
 
 @admin.action(description='Deactivate selected jobs')
 def make_jobs_inactive(modeladmin, request, queryset):
-    queryset.update(is_active=False)
+    queryset.update(is_active=False, updated_at=timezone.now())
+    invalidate_model('Job')
 
 @admin.action(description='Mark applications as reviewed')
 def mark_applications_reviewed(modeladmin, request, queryset):
-    queryset.update(status='REV')
+    with transaction.atomic():
+        changes = [
+            (app_id, old_status, 'REV')
+            for app_id, old_status in queryset.exclude(status='REV').select_for_update().values_list('id', 'status')
+        ]
+        Application.objects.filter(pk__in=[app_id for app_id, _, _ in changes]).update(status='REV')
+        record_status_changes(changes, changed_by=request.user)
+    invalidate_model('Application')
+
+@admin.action(description='Retry selected failed events')
+def retry_outbox_events(modeladmin, request, queryset):
+    queryset.filter(failed_at__isnull=False, dispatched_at__isnull=True).update(failed_at=None, attempts=0)
 
 # Add custom actions to respective admins
 JobAdmin.actions = [make_jobs_active, make_jobs_inactive]
-ApplicationAdmin.actions = [mark_applications_reviewed]
\ No newline at end of file
+ApplicationAdmin.actions = [mark_applications_reviewed]
+OutboxEventAdmin.actions = [retry_outbox_events]
\ No newline at end of file
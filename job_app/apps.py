@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JobAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job_app'
+
+    def ready(self):
+        from . import checks, dbpool, signals  # noqa: F401
@@ -0,0 +1,172 @@
+"""
+Async read endpoints for the public job and company catalogue.
+
+Served under ``/api/v1/async/`` and meant for the ASGI application
+(``job_board.asgi``, e.g. under uvicorn), where they run on the event loop
+from middleware to response: a slow client holds a coroutine instead of a
+worker thread. Rows are read with the async ORM as ``values()`` and
+serialized by the compiled serializers, so responses match the DRF
+endpoints byte for byte for an anonymous client.
+
+These views only ever serve that anonymous view of the catalogue (active
+jobs, no per-user visibility) and ignore credentials; employers listing
+their own inactive jobs use the DRF endpoints. Responses are not cached,
+and ``?view=compact`` is not supported.
+"""
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from django_filters.filterset import filterset_factory
+from rest_framework import status
+from rest_framework.exceptions import NotFound, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .fast_serializers import compile_serializer
+from .models import Company, Job
+from .pagination import AsyncPageNumberPagination, JobCursorPagination
+from .ratelimit import RateLimitUnavailable, hit
+from .search import SearchUnavailable, get_database_search_backend, get_search_backend
+from .search.backends import SimpleSearchBackend, VENDOR_BACKENDS
+from .serializers import CompanySerializer, JobDetailSerializer, JobListSerializer
+from .throttling import ScopedRateLimitThrottle, add_rate_limit_headers
+from .views import CompanyViewSet, JobViewSet
+
+logger = logging.getLogger(__name__)
+
+JobFilterSet = filterset_factory(Job, fields=JobViewSet.filterset_fields)
+CompanyFilterSet = filterset_factory(Company, fields=CompanyViewSet.filterset_fields)
+
+DATABASE_SEARCH_BACKENDS = (*VENDOR_BACKENDS.values(), SimpleSearchBackend)
+
+
+def render(data, status=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def not_found(model):
+    return render({'detail': f'No {model._meta.object_name} matches the given query.'}, status.HTTP_404_NOT_FOUND)
+
+
+def rate_limited(scope):
+    """``settings.RATE_LIMITS[scope]`` per client address, with the same headers as RateLimitMixin"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            result = None
+            if settings.RATE_LIMIT_ENABLED:
+                identity = f'ip:{ScopedRateLimitThrottle().get_ident(request)}'
+                try:
+                    # The Redis and SQLite counter clients block, so they run off the loop
+                    result = await sync_to_async(hit, thread_sensitive=False)(scope, identity)
+                except RateLimitUnavailable as exc:
+                    logger.error(f"Rate limiting disabled for this request: {exc}")
+            if result is not None and not result.allowed:
+                response = render({'detail': Throttled(wait=result.reset).detail}, status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(result.reset)
+            else:
+                response = await view(request, *args, **kwargs)
+            if result is not None:
+                add_rate_limit_headers(response, result)
+            return response
+        return wrapper
+    return decorator
+
+
+def filter_errors(filterset):
+    return render({name: list(errors) for name, errors in filterset.errors.items()}, status.HTTP_400_BAD_REQUEST)
+
+
+async def serialize_rows(queryset, serializer_class, request):
+    compiled = compile_serializer(serializer_class)
+    rows = [row async for row in queryset.values(*compiled.paths).aiterator()]
+    return compiled.serialize(rows, {'request': request})
+
+
+@require_safe
+@rate_limited('anon_list')
+async def job_list(request):
+    filterset = JobFilterSet(request.GET, queryset=Job.objects.filter(is_active=True))
+    if not filterset.is_valid():
+        return filter_errors(filterset)
+
+    compiled = compile_serializer(JobListSerializer)
+    rows = filterset.qs.values(*compiled.paths)
+    paginator = JobCursorPagination()
+    try:
+        page = await paginator.apaginate_queryset(rows, Request(request))
+    except NotFound as exc:
+        return render({'detail': exc.detail}, status.HTTP_404_NOT_FOUND)
+    if page is None:
+        return render(compiled.serialize([row async for row in rows.aiterator()], {'request': request}))
+    return render(paginator.get_paginated_response(compiled.serialize(page, {'request': request})).data)
+
+
+@require_safe
+async def job_detail(request, pk):
+    compiled = compile_serializer(JobDetailSerializer)
+    try:
+        row = await Job.objects.values(*compiled.paths).aget(pk=pk)
+    except Job.DoesNotExist:
+        return not_found(Job)
+    return render(compiled.serialize([row], {'request': request})[0])
+
+
+@require_safe
+@rate_limited('anon_list')
+async def job_search(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return render({'detail': "The 'q' query parameter is required."}, status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+    except ValueError:
+        limit = 50
+
+    filterset = JobFilterSet(request.GET, queryset=Job.objects.filter(is_active=True))
+    if not filterset.is_valid():
+        return filter_errors(filterset)
+    queryset = filterset.qs
+    backend = get_search_backend()
+    try:
+        if isinstance(backend, DATABASE_SEARCH_BACKENDS):
+            jobs = backend.search(queryset, query)  # Lazy: the match runs with the query below
+        else:
+            # External engines are queried with blocking clients
+            jobs = await sync_to_async(backend.search, thread_sensitive=False)(queryset, query)
+    except SearchUnavailable:
+        jobs = get_database_search_backend().search(queryset, query)
+    return render(await serialize_rows(jobs[:limit], JobListSerializer, request))
+
+
+@require_safe
+@rate_limited('anon_list')
+async def company_list(request):
+    filterset = CompanyFilterSet(request.GET, queryset=Company.objects.with_stats())
+    if not filterset.is_valid():
+        return filter_errors(filterset)
+
+    compiled = compile_serializer(CompanySerializer)
+    rows = filterset.qs.values(*compiled.paths)
+    paginator = AsyncPageNumberPagination()
+    try:
+        page = await paginator.apaginate_queryset(rows, Request(request))
+    except NotFound as exc:
+        return render({'detail': exc.detail}, status.HTTP_404_NOT_FOUND)
+    if page is None:
+        return render(compiled.serialize([row async for row in rows.aiterator()], {'request': request}))
+    return render(paginator.get_paginated_response(compiled.serialize(page, {'request': request})).data)
+
+
+@require_safe
+async def company_detail(request, pk):
+    compiled = compile_serializer(CompanySerializer)
+    try:
+        row = await Company.objects.with_stats().values(*compiled.paths).aget(pk=pk)
+    except Company.DoesNotExist:
+        return not_found(Company)
+    return render(compiled.serialize([row], {'request': request})[0])
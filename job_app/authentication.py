@@ -0,0 +1,137 @@
+"""
+JWT authentication that answers read requests from signed token claims.
+
+Access tokens issued by ``CustomTokenObtainPairSerializer`` carry the
+user's ``user_type``, ``company_id``, ``is_staff`` and token version. On
+safe requests to actions a view lists in ``token_claims_actions`` the
+request user is a ``ClaimsUser`` built from those claims instead of a row
+loaded from the users table. Revocation works through ``User.token_version``:
+bumping it (``revoke_tokens``) makes every token carrying the old version
+fail, and the current version is read from the cache, not the database.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from .models import User
+
+TOKEN_VERSION_KEY = 'auth:tokver:{}'
+TOKEN_VERSION_CLAIM = 'ver'
+# Claims a token must carry to be served without loading the user
+STATELESS_CLAIMS = ('user_type', 'company_id', 'is_staff', TOKEN_VERSION_CLAIM)
+
+# Cached version of users that are gone or deactivated; never matches a token
+REVOKED = -1
+
+
+def add_token_claims(token, user):
+    """Stamp the authorization claims of ``user`` onto ``token``"""
+    token['user_type'] = user.user_type
+    token['company_id'] = user.company_id
+    token['is_staff'] = user.is_staff
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """Current token version of an active user (``REVOKED`` otherwise), cached"""
+    key = TOKEN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list('token_version', flat=True)
+            .first()
+        )
+        if version is None:
+            version = REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached version now and again on commit, like invalidate_model"""
+    key = TOKEN_VERSION_KEY.format(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def revoke_tokens(user):
+    """Invalidate every token issued to ``user`` so far"""
+    User.objects.filter(pk=user.pk).update(token_version=F('token_version') + 1)
+    user.refresh_from_db(fields=['token_version'])
+    forget_token_version(user.pk)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user rebuilt from token claims. It carries the attributes the
+    read paths branch on (pk, user_type, company_id, is_staff) and compares
+    equal to the ``User`` row with the same primary key.
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token.get('user_type')
+
+    @cached_property
+    def company_id(self):
+        return self.token.get('company_id')
+
+    def __eq__(self, other):
+        if isinstance(other, (User, TokenUser)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips the user lookup on read-only requests.
+
+    Views opt in per action with ``token_claims_actions``; other requests,
+    and tokens issued before the claims were added, load the user as usual.
+    Either way a token whose version no longer matches the user's is refused.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        if self.accepts_claims(request, validated_token):
+            return self.get_claims_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def accepts_claims(self, request, validated_token):
+        if not settings.JWT_STATELESS_READS or request.method not in SAFE_METHODS:
+            return False
+        view = request.parser_context.get('view') if request.parser_context else None
+        if getattr(view, 'action', None) not in getattr(view, 'token_claims_actions', ()):
+            return False
+        return all(claim in validated_token for claim in STATELESS_CLAIMS)
+
+    def get_claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+        if get_token_version(user.pk) != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return user
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if version is not None and version != user.token_version:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return user
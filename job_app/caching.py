@@ -0,0 +1,223 @@
+import hashlib
+import math
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+GENERATION_KEY = 'respcache:gen:{}'
+CHANGED_KEY = 'respcache:changed:{}'
+RESPONSE_KEY = 'respcache:resp:{}:{}'
+
+# Cache scopes whose responses embed data from each model
+INVALIDATES = {
+    'Job': ('jobs', 'companies'),
+    'Company': ('jobs', 'companies'),
+    'Application': ('jobs', 'companies'),
+    'User': ('jobs',),
+}
+
+
+def get_generations(scopes):
+    """Current generation counter of each scope, seeding missing ones in one round trip"""
+    keys = {scope: GENERATION_KEY.format(scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    generations = {}
+    for scope, key in keys.items():
+        if key not in found:
+            # Seed from the clock so an evicted counter never rewinds onto old entries
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        generations[scope] = found[key]
+    return generations
+
+
+def bump_generation(*scopes):
+    """Invalidate every cached response of the given scopes in O(1)"""
+    for scope in scopes:
+        key = GENERATION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+        cache.set(CHANGED_KEY.format(scope), time.time(), timeout=None)
+
+
+def last_changed(scopes):
+    """Unix time of the latest write to any of ``scopes``, or None without scopes"""
+    keys = [CHANGED_KEY.format(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Unknown (evicted or never written): assume now, which can only cause a 200
+            cache.add(key, time.time(), timeout=None)
+            found[key] = cache.get(key)
+    return max(found.values(), default=None)
+
+
+def invalidate_model(model_name):
+    """Bump the scopes affected by a write to ``model_name``.
+
+    Bumped now and again on commit, so a reader racing the transaction
+    cannot cache pre-commit data under the post-write generation.
+    """
+    scopes = INVALIDATES.get(model_name, ())
+    if not scopes:
+        return
+    bump_generation(*scopes)
+    transaction.on_commit(lambda: bump_generation(*scopes))
+
+
+class CachedResponseMixin:
+    """
+    Serves anonymous ``list``/``retrieve`` responses from the cache.
+
+    Entries are keyed on path, normalized query parameters, renderer and
+    the generation of each of ``cache_scopes``; writes bump the generation
+    instead of deleting keys. The key digest doubles as the ETag, so
+    clients revalidating with If-None-Match get a 304.
+    """
+    cache_scopes = ()
+    cached_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def response_cache_digest(self, request):
+        generations = get_generations(self.cache_scopes)
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+        raw = '|'.join([
+            request.path,
+            urlencode(params),
+            request.accepted_renderer.format,
+            ','.join(f'{scope}={generations[scope]}' for scope in self.cache_scopes),
+        ])
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def serves_cached_response(self, request):
+        return (
+            not request.user.is_authenticated
+            and self.action in self.cached_actions
+            and bool(self.cache_scopes)
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.serves_cached_response(request):
+            return handler(request, *args, **kwargs)
+
+        digest = self.response_cache_digest(request)
+        etag = quote_etag(digest)
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        key = RESPONSE_KEY.format(self.basename, digest)
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for ``list``/``retrieve`` backed by a single aggregate query.
+
+    The validator is Max(updated_at) and the row count of the filtered
+    queryset (one row for retrieve), mixed with the requesting user, the
+    query parameters (so each page, cursor and ordering gets its own tag),
+    the renderer and the response-cache generations, which cover nested
+    data such as company names and application counts. Last-Modified is the
+    later of Max(updated_at) and the last write to those scopes (which also
+    catches deletions), rounded up to the second, and is left out until
+    that second has passed so a later write within it cannot share the
+    date. If-None-Match and If-Modified-Since are answered with a 304
+    before the page is loaded or serialized. Requests already answered by
+    CachedResponseMixin keep that mixin's zero-query ETag.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        try:
+            if self.action == 'retrieve':
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            stats = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup: the handler answers it with a 404 as get_object_or_404 does
+            return None, None, 0
+
+        # Pages, cursors and orderings of one filtered queryset are different responses
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+
+        scopes = getattr(self, 'cache_scopes', ())
+        generations = get_generations(scopes)
+        raw = '|'.join([
+            str(request.user.pk),
+            request.accepted_renderer.format,
+            urlencode(params),
+            stats['last_modified'].isoformat() if stats['last_modified'] else '',
+            str(stats['count']),
+            ','.join(f'{scope}={generation}' for scope, generation in sorted(generations.items())),
+        ])
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        changed = [stats['last_modified'].timestamp()] if stats['last_modified'] else []
+        scope_changed = last_changed(scopes)
+        if scope_changed is not None:
+            changed.append(scope_changed)
+        # HTTP dates have whole-second precision
+        last_modified = math.ceil(max(changed)) if changed else None
+        if last_modified is not None and last_modified > time.time():
+            last_modified = None
+        return etag, last_modified, stats['count']
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        serves_cached = getattr(self, 'serves_cached_response', None)
+        if serves_cached is not None and serves_cached(request):
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified, count = self.get_validators(request)
+        if self.action == 'retrieve' and not count:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
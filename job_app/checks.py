@@ -0,0 +1,23 @@
+"""System checks for settings that only work with a cache shared by every process."""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches, Tags.security, deploy=True)
+def check_token_version_cache(app_configs, **kwargs):
+    """Stateless JWT reads need revocations to reach every worker through a shared cache"""
+    if not settings.JWT_STATELESS_READS or not isinstance(caches['default'], LocMemCache):
+        return []
+    return [
+        Error(
+            'JWT_STATELESS_READS is on but the default cache is local to each process.',
+            hint=(
+                'Revoked tokens stay valid on other workers for up to TOKEN_VERSION_CACHE_TIMEOUT '
+                'seconds. Point CACHE_URL at a shared cache such as Redis, or set '
+                'JWT_STATELESS_READS=False.'
+            ),
+            id='job_app.E001',
+        )
+    ]
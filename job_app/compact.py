@@ -0,0 +1,53 @@
+from rest_framework.response import Response
+
+from .models import Company, User
+from .serializers import CompanyCompactSerializer, JobCompactSerializer
+
+JOB_COLUMNS = (
+    'id', 'title', 'job_type', 'location', 'salary', 'company_id',
+    'posted_by_id', 'applications_count', 'is_active', 'created_at',
+)
+COMPANY_COLUMNS = ('id', 'name', 'website', 'logo')
+EMPLOYER_COLUMNS = ('id', 'first_name', 'last_name')
+
+
+class CompactJobListMixin:
+    """
+    ``?view=compact`` job lists.
+
+    Jobs are emitted flat with company/posted_by ids, and each referenced
+    company and employer is side-loaded once in ``companies``/``employers``
+    maps keyed by id. Only the columns the compact payload needs are read:
+    three queries regardless of page size.
+    """
+    compact_view_param = 'view'
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.compact_view_param) != 'compact':
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).only(*JOB_COLUMNS)
+        page = self.paginate_queryset(queryset)
+        jobs = page if page is not None else list(queryset)
+
+        results = JobCompactSerializer(jobs, many=True).data
+        side_loaded = self.side_load(jobs)
+        if page is not None:
+            response = self.get_paginated_response(results)
+            response.data.update(side_loaded)
+            return response
+        return Response({'results': results, **side_loaded})
+
+    def side_load(self, jobs):
+        company_ids = {job.company_id for job in jobs}
+        employer_ids = {job.posted_by_id for job in jobs}
+
+        companies = Company.objects.filter(pk__in=company_ids).only(*COMPANY_COLUMNS)
+        company_data = CompanyCompactSerializer(
+            companies, many=True, context=self.get_serializer_context()
+        ).data
+        employers = User.objects.filter(pk__in=employer_ids).values(*EMPLOYER_COLUMNS)
+        return {
+            'companies': {str(company['id']): company for company in company_data},
+            'employers': {str(employer['id']): employer for employer in employers},
+        }
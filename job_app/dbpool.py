@@ -0,0 +1,121 @@
+"""
+Database connection pool metrics.
+
+PostgreSQL aliases draw connections from psycopg's pool (configured in
+settings from the DATABASE_POOL_* variables); each worker process has its
+own pool per alias. After a request finishes, every process publishes its
+pool statistics to the cache at most every ``DATABASE_POOL_STATS_INTERVAL``
+seconds and logs a warning when a pool is saturated, so ``pool_status`` can
+report utilization across all workers sharing the cache.
+"""
+import logging
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = 'dbpool:stats:{}'
+PROCESSES_KEY = 'dbpool:processes'
+
+_last_published = None
+
+
+def get_pool(alias):
+    """The psycopg pool behind ``alias``, or None when the alias is not pooled"""
+    if not settings.DATABASES[alias].get('OPTIONS', {}).get('pool'):
+        return None
+    return getattr(connections[alias], 'pool', None)
+
+
+def pool_stats(alias):
+    """Current pool figures for ``alias`` in this process"""
+    pool = get_pool(alias)
+    if pool is None:
+        database = settings.DATABASES[alias]
+        return {
+            'pooled': False,
+            'conn_max_age': database.get('CONN_MAX_AGE', 0),
+            'health_checks': database.get('CONN_HEALTH_CHECKS', False),
+            'connected': connections[alias].connection is not None,
+        }
+    stats = pool.get_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    return {
+        'pooled': True,
+        'min_size': stats.get('pool_min', pool.min_size),
+        'max_size': stats.get('pool_max', pool.max_size),
+        'size': stats.get('pool_size', 0),
+        'available': stats.get('pool_available', 0),
+        'in_use': in_use,
+        'waiting': stats.get('requests_waiting', 0),
+        'utilization': round(in_use / pool.max_size, 3),
+        'requests': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'requests_wait_ms': stats.get('requests_wait_ms', 0),
+        'requests_errors': stats.get('requests_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+    }
+
+
+def is_saturated(stats):
+    return stats['pooled'] and (
+        stats['waiting'] > 0 or stats['utilization'] >= settings.DATABASE_POOL_SATURATION_WARNING
+    )
+
+
+def process_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def publish_pool_stats():
+    """Store this process's pool figures in the cache for pool_status"""
+    pooled = {}
+    for alias in settings.DATABASES:
+        stats = pool_stats(alias)
+        if not stats['pooled']:
+            continue
+        pooled[alias] = stats
+        if is_saturated(stats):
+            logger.warning(
+                f"Database pool {alias} saturated: {stats['in_use']}/{stats['max_size']} in use, "
+                f"{stats['waiting']} waiting"
+            )
+    if not pooled:
+        return
+
+    ttl = settings.DATABASE_POOL_STATS_INTERVAL * 3
+    process = process_id()
+    cache.set(STATS_KEY.format(process), {'published_at': time.time(), 'pools': pooled}, ttl)
+    processes = cache.get(PROCESSES_KEY) or []
+    if process not in processes:
+        cache.set(PROCESSES_KEY, [*processes, process][-1000:], None)
+
+
+def published_pool_stats():
+    """Pool figures of every process that published recently, keyed by process"""
+    processes = cache.get(PROCESSES_KEY) or []
+    found = cache.get_many([STATS_KEY.format(process) for process in processes])
+    live = {process: found[STATS_KEY.format(process)] for process in processes if STATS_KEY.format(process) in found}
+    if len(live) != len(processes):
+        cache.set(PROCESSES_KEY, list(live), None)  # Forget processes that stopped publishing
+    return live
+
+
+@receiver(request_finished)
+def publish_pool_stats_periodically(**kwargs):
+    global _last_published
+    now = time.monotonic()
+    if _last_published is not None and now - _last_published < settings.DATABASE_POOL_STATS_INTERVAL:
+        return
+    _last_published = now
+    try:
+        publish_pool_stats()
+    except Exception as exc:
+        logger.debug(f"Could not publish database pool stats: {exc}")
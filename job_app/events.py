@@ -0,0 +1,84 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+from .models import ApplicationStatusChange
+
+logger = logging.getLogger(__name__)
+
+
+def record_status_changes(changes, changed_by=None):
+    """
+    Append ``(application_id, old_status, new_status)`` transitions to the
+    history and emit one notification event per application.
+
+    History rows and outbox events are each written with a single INSERT in
+    the caller's transaction. Events carry an eta of now plus
+    APPLICATION_STATUS_NOTIFY_DELAY so the consumer can fold rapid
+    successive transitions into one email.
+    """
+    rows = [
+        ApplicationStatusChange(
+            application_id=application_id,
+            old_status=old_status,
+            new_status=new_status,
+            changed_by=changed_by,
+        )
+        for application_id, old_status, new_status in changes
+        if old_status != new_status
+    ]
+    if not rows:
+        return []
+
+    from .tasks import notify_application_status_change
+
+    with transaction.atomic():
+        ApplicationStatusChange.objects.bulk_create(rows)
+        eta = timezone.now() + timedelta(seconds=settings.APPLICATION_STATUS_NOTIFY_DELAY)
+        application_ids = sorted({row.application_id for row in rows})
+        outbox.enqueue_many(notify_application_status_change, [[app_id] for app_id in application_ids], eta=eta)
+    return rows
+
+
+class NotificationPending(Exception):
+    """The latest transition is still within the notify delay until ``eta``"""
+
+    def __init__(self, eta):
+        super().__init__(f"Status transitions settle at {eta.isoformat()}")
+        self.eta = eta
+
+
+def collect_status_notification(application_id):
+    """
+    Claim the application's unnotified transitions and return the net
+    ``(old_status, new_status)`` to notify about, or None.
+
+    Nothing is claimed while the latest transition is younger than the
+    notify delay; NotificationPending then says when it settles, so a
+    consumer running early (or on a skewed clock) can try again instead of
+    dropping it. Transitions that cancel out (REV → INT → REV) are claimed
+    without producing a notification.
+    """
+    delay = timedelta(seconds=settings.APPLICATION_STATUS_NOTIFY_DELAY)
+    with transaction.atomic():
+        changes = list(
+            ApplicationStatusChange.objects.select_for_update()
+            .filter(application_id=application_id, notified_at__isnull=True)
+            .order_by('id')
+        )
+        if not changes:
+            return None
+        if changes[-1].changed_at > timezone.now() - delay:
+            raise NotificationPending(changes[-1].changed_at + delay)
+
+        ApplicationStatusChange.objects.filter(pk__in=[change.pk for change in changes]).update(
+            notified_at=timezone.now()
+        )
+    old_status, new_status = changes[0].old_status, changes[-1].new_status
+    if old_status == new_status:
+        return None
+    return old_status, new_status
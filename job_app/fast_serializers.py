@@ -0,0 +1,151 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+DISPLAY_SOURCE = re.compile(r'^get_(\w+)_display$')
+
+
+class CompiledSerializer:
+    """
+    Read-only serializer compiled from a ModelSerializer's declared fields.
+
+    Each output key is bound once to a ``values()`` column and a plain
+    converter, so serializing a row is a loop of dict lookups instead of
+    DRF's per-field get_attribute/to_representation dispatch. Output is
+    identical to ``serializer_class(instance, many=True).data`` for the same
+    request context.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.paths = []
+        self.plan = self.compile(serializer_class(), '')
+
+    def compile(self, serializer, prefix):
+        model = serializer.Meta.model
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ModelSerializer):
+                nested = self.compile(field, f'{prefix}{field.source}__')
+                plan.append((name, 'nested', self.add_path(f'{prefix}{field.source}__pk'), nested))
+                continue
+
+            source = field.source
+            display = DISPLAY_SOURCE.match(source)
+            if display:
+                choices = dict(model._meta.get_field(display.group(1)).flatchoices)
+                plan.append((name, 'choice', self.add_path(prefix + display.group(1)), choices))
+            elif '.' in source or source == '*':
+                raise ImproperlyConfigured(
+                    f"{serializer.__class__.__name__}.{name}: source '{source}' cannot be compiled"
+                )
+            elif isinstance(field, serializers.DateTimeField):
+                plan.append((name, 'datetime', self.add_path(prefix + source), field))
+            elif isinstance(field, serializers.DecimalField):
+                plan.append((name, 'decimal', self.add_path(prefix + source), field))
+            elif isinstance(field, serializers.FileField):
+                storage = model._meta.get_field(source).storage
+                plan.append((name, 'file', self.add_path(prefix + source), storage))
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.HiddenField)):
+                raise ImproperlyConfigured(
+                    f"{serializer.__class__.__name__}.{name}: {type(field).__name__} cannot be compiled"
+                )
+            else:
+                plan.append((name, 'value', self.add_path(prefix + source), None))
+        return plan
+
+    @property
+    def columns(self):
+        """The paths as ``QuerySet.only()`` arguments: a relation's key is its foreign key field"""
+        return [path[:-4] if path.endswith('__id') else path for path in self.paths]
+
+    def add_path(self, path):
+        if path.endswith('__pk'):
+            path = path[:-4] + '__id'
+        if path not in self.paths:
+            self.paths.append(path)
+        return path
+
+    def serialize(self, rows, context=None):
+        """Serialize ``values(*self.paths)`` rows"""
+        request = (context or {}).get('request')
+        current_tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        iso_format = api_settings.DATETIME_FORMAT
+
+        def convert(plan, row):
+            ret = {}
+            for name, kind, path, arg in plan:
+                value = row[path]
+                if value is None:
+                    ret[name] = None
+                elif kind == 'value':
+                    ret[name] = value
+                elif kind == 'choice':
+                    ret[name] = arg.get(value, value)
+                elif kind == 'nested':
+                    ret[name] = convert(arg, row)
+                elif kind == 'datetime':
+                    if iso_format.lower() != 'iso-8601' or current_tz is None:
+                        ret[name] = arg.to_representation(value)
+                        continue
+                    value = value.astimezone(current_tz).isoformat()
+                    if value.endswith('+00:00'):
+                        value = value[:-6] + 'Z'
+                    ret[name] = value
+                elif kind == 'decimal':
+                    ret[name] = arg.to_representation(value)
+                elif kind == 'file':
+                    if not value:
+                        ret[name] = None
+                        continue
+                    url = arg.url(value)
+                    ret[name] = request.build_absolute_uri(url) if request is not None else url
+            return ret
+
+        plan = self.plan
+        return [convert(plan, row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class):
+    return CompiledSerializer(serializer_class)
+
+
+class FastListMixin:
+    """
+    Opt-in (settings.FAST_LIST_SERIALIZERS) compiled serialization for list actions.
+
+    ``list`` and any action that builds its response with ``serialize_list``
+    read ``values()`` rows instead of model instances.
+    """
+
+    def uses_fast_serializers(self):
+        return settings.FAST_LIST_SERIALIZERS
+
+    def list(self, request, *args, **kwargs):
+        if not self.uses_fast_serializers():
+            return super().list(request, *args, **kwargs)
+
+        compiled = compile_serializer(self.get_serializer_class())
+        rows = self.filter_queryset(self.get_queryset()).values(*compiled.paths)
+        page = self.paginate_queryset(rows)
+        data = compiled.serialize(page if page is not None else rows, self.get_serializer_context())
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def serialize_list(self, queryset, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        context = self.get_serializer_context()
+        if self.uses_fast_serializers():
+            compiled = compile_serializer(serializer_class)
+            return compiled.serialize(queryset.values(*compiled.paths), context)
+        return serializer_class(queryset, many=True, context=context).data
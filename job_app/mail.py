@@ -0,0 +1,166 @@
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.core.mail import get_connection
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+# Errors after which the pooled connection is assumed dead and reopened
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+class PooledMailConnection:
+    """
+    Long-lived mail backend connection reused across messages.
+
+    One is kept per worker thread. Before reuse after ``MAIL_KEEPALIVE``
+    seconds idle the SMTP session is probed with NOOP, connections older than
+    ``MAIL_CONNECTION_MAX_AGE`` are recycled, and a send that fails because
+    the server dropped the session is retried once on a fresh connection.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.opened_at = None
+        self.last_used = None
+
+    def open(self):
+        self.close()
+        self.backend = get_connection(fail_silently=False)
+        self.backend.open()
+        self.opened_at = self.last_used = time.monotonic()
+
+    def close(self):
+        if self.backend is not None:
+            try:
+                self.backend.close()
+            except Exception as exc:
+                logger.debug(f"Error closing mail connection: {exc}")
+        self.backend = None
+
+    def is_usable(self):
+        if self.backend is None:
+            return False
+        now = time.monotonic()
+        if now - self.opened_at > settings.MAIL_CONNECTION_MAX_AGE:
+            return False
+        smtp = getattr(self.backend, 'connection', None)
+        if smtp is None or now - self.last_used < settings.MAIL_KEEPALIVE:
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send_messages(self, messages):
+        """Deliver ``messages`` over the pooled connection, reconnecting once if it was dropped"""
+        if not messages:
+            return 0
+        if not self.is_usable():
+            self.open()
+        sent = 0
+        # One message per backend call so a reconnect only resends the message that failed
+        for message in messages:
+            try:
+                sent += self.backend.send_messages([message])
+            except CONNECTION_ERRORS as exc:
+                logger.info(f"Mail connection lost ({exc}), reconnecting")
+                self.open()
+                sent += self.backend.send_messages([message])
+            self.last_used = time.monotonic()
+        return sent
+
+
+def get_pooled_connection():
+    connection = getattr(_local, 'connection', None)
+    if connection is None:
+        connection = _local.connection = PooledMailConnection()
+    return connection
+
+
+def close_pooled_connection(**kwargs):
+    connection = getattr(_local, 'connection', None)
+    if connection is not None:
+        connection.close()
+
+
+class MessageBatch:
+    """Messages queued inside ``batched_delivery()``, and the outcome of flushing them"""
+
+    def __init__(self):
+        self.queue = []
+        self.sent = 0
+        self.failed = []  # (message, exception) pairs
+
+    def failed_messages(self):
+        return {id(message): exc for message, exc in self.failed}
+
+
+def send_message(message):
+    """Send now over the pooled connection, or queue it inside ``batched_delivery()``"""
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        batch.queue.append(message)
+        return 0
+    return get_pooled_connection().send_messages([message])
+
+
+def flush_queued_messages():
+    """
+    Deliver the queued messages over the pooled connection. A message that
+    fails is recorded in ``failed`` and the rest are still sent; each
+    leaves the queue only once it has been attempted.
+    """
+    batch = getattr(_local, 'batch', None)
+    if batch is None:
+        return 0
+    connection = get_pooled_connection()
+    sent = 0
+    while batch.queue:
+        message = batch.queue[0]
+        try:
+            sent += connection.send_messages([message])
+        except Exception as exc:
+            logger.error(f"Queued message {message.subject!r} to {message.to} failed: {exc}")
+            batch.failed.append((message, exc))
+        batch.queue.pop(0)
+    batch.sent += sent
+    return sent
+
+
+@contextmanager
+def batched_delivery():
+    """
+    Queue messages passed to send_message() and deliver them together on
+    exit. Yields the MessageBatch, whose ``failed`` lists what could not be
+    sent once the block (or an explicit flush_queued_messages()) is done.
+    """
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        yield batch  # Already batching: the outermost block flushes
+        return
+    batch = _local.batch = MessageBatch()
+    try:
+        yield batch
+        flush_queued_messages()
+    finally:
+        _local.batch = None
+
+
+@receiver(setting_changed)
+def reset_pooled_connection(setting, **kwargs):
+    if setting.startswith('EMAIL_') or setting.startswith('MAIL_'):
+        close_pooled_connection()
+        _local.connection = None
+
+
+worker_process_shutdown.connect(close_pooled_connection)
@@ -0,0 +1,297 @@
+# management/commands/audit_queries.py
+import json
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.migrations import Migration
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import AddIndex
+from django.db.migrations.writer import MigrationWriter
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from job_app.models import Company, Job, User
+from job_app.serializers import CustomTokenObtainPairSerializer
+
+from .benchmark_endpoints import TIERS, Command as EndpointBenchmark, tier_counts
+
+SQLITE_SORT = re.compile(r'^USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT|RIGHT PART OF ORDER BY)')
+SQLITE_SCAN = re.compile(r'^SCAN (\S+)(?: AS (\S+))?$')
+TABLE_ALIAS = re.compile(r'(?:FROM|JOIN) "(\w+)"(?: (\w+))?')
+# A column compared for equality/membership, or tested as a bare boolean
+CONDITION = re.compile(r'(?:"(\w+)"|\b([UT]\d+))\."(\w+)"(?=\s*(?:=|IN\b|IS\b|AND\b|OR\b|\)|ORDER\b|LIMIT\b|GROUP\b|$))')
+ORDER_COLUMN = re.compile(r'(?:"(\w+)"|\b([UT]\d+))\."(\w+)" (ASC|DESC)')
+
+
+def explain(sql):
+    """[(kind, table, detail)] for each sequential scan ('scan') and sort ('sort') in the plan of ``sql``"""
+    findings = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = [plan[0]['Plan']]
+            while nodes:
+                node = nodes.pop()
+                if node['Node Type'] == 'Seq Scan':
+                    findings.append(('scan', node['Relation Name'], f"Seq Scan on {node['Relation Name']}"))
+                elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+                    findings.append(('sort', None, f"{node['Node Type']} by {', '.join(node.get('Sort Key', []))}"))
+                nodes.extend(node.get('Plans', []))
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            aliases = {alias or table: table for table, alias in TABLE_ALIAS.findall(sql)}
+            for *_, detail in cursor.fetchall():
+                scan = SQLITE_SCAN.match(detail)
+                if scan:
+                    name = scan.group(2) or scan.group(1)
+                    findings.append(('scan', aliases.get(name, scan.group(1)), detail))
+                elif SQLITE_SORT.match(detail):
+                    findings.append(('sort', None, detail))
+        else:
+            raise CommandError(f'EXPLAIN is not supported for {connection.vendor}')
+    return findings
+
+
+def driving_table(sql):
+    match = TABLE_ALIAS.search(top_level(sql))
+    return match.group(1) if match else None
+
+
+def top_level(sql):
+    """``sql`` with the body of every subquery replaced by ``(...)``"""
+    kept, subqueries = [], []  # Whether each open parenthesis is inside a subquery
+    for position, char in enumerate(sql):
+        if char == '(':
+            subqueries.append(sql.startswith('(SELECT ', position) or any(subqueries))
+        if not any(subqueries):
+            kept.append(char)
+        elif char == ')' and subqueries[-1] and not any(subqueries[:-1]):
+            kept.append('(...)')
+        if char == ')' and subqueries:
+            subqueries.pop()
+    return ''.join(kept)
+
+
+def suggest_index(sql, table):
+    """Columns of an index on ``table`` serving the filters and ordering of ``sql``, or None"""
+    aliases = {alias or name: name for name, alias in TABLE_ALIAS.findall(sql)}
+
+    def columns(pattern, text):
+        return [
+            match.groups()[2:] for match in pattern.finditer(text)
+            if aliases.get(match.group(1) or match.group(2), match.group(1)) == table
+        ]
+
+    outer = top_level(sql).split(' LIMIT ')[0]
+    rest, _, order = outer.partition(' ORDER BY ')
+    where = rest.partition(' WHERE ')[2]
+    if ' OR ' in where:
+        return None  # One composite index cannot serve a disjunction
+    filtered = [column for column, in columns(CONDITION, where) if column != 'id']
+    ordered = [f'-{column}' if direction == 'DESC' else column for column, direction in columns(ORDER_COLUMN, order)]
+    if order and len(ordered) != len(order.split(', ')):
+        ordered = []  # Ordered by an expression or another table's column: no index serves the sort
+    if not filtered and (where or not ordered):
+        return None  # Filtered only through joined tables (their own indexes apply), or nothing to serve
+    fields = list(dict.fromkeys(filtered))
+    return tuple(fields + [column for column in ordered if column.lstrip('-') not in fields])
+
+
+def existing_indexes(model):
+    """Column tuples of the indexes ``model`` already has"""
+    indexed = [
+        (field.column,) for field in model._meta.local_fields
+        if field.primary_key or field.unique or field.db_index
+    ]
+    for index in model._meta.indexes:
+        indexed.append(tuple(
+            ('-' if name.startswith('-') else '') + model._meta.get_field(name.lstrip('-')).column
+            for name in index.fields
+        ))
+    for fields in model._meta.unique_together:
+        indexed.append(tuple(model._meta.get_field(name).column for name in fields))
+    return indexed
+
+
+def is_covered(columns, indexed):
+    return any(index[:len(columns)] == columns for index in indexed)
+
+
+class Command(BaseCommand):
+    help = (
+        'Replays the SQL of each API read action, runs EXPLAIN on it, flags sequential scans and '
+        'sorts and prints a migration adding the indexes that would serve them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tier', choices=TIERS,
+            help='Audit a seeded test database of this size instead of the configured database',
+        )
+        parser.add_argument('--keepdb', action='store_true', help='Keep the seeded test database between runs')
+        parser.add_argument('--workers', type=int, default=1, help='Seeding worker processes')
+        parser.add_argument('--check', action='store_true', help='Exit with an error when an index is suggested')
+
+    def handle(self, *args, **options):
+        if options['tier'] is None:
+            with transaction.atomic():
+                report = self.audit()
+                transaction.set_rollback(True)  # Read actions only, but leave nothing behind
+        else:
+            setup_test_environment(debug=False)
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+            try:
+                EndpointBenchmark(stdout=self.stdout).seed(tier_counts(TIERS[options['tier']]), options['workers'])
+                report = self.audit()
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+                teardown_test_environment()
+
+        self.print_report(report)
+        suggestions = self.suggestions(report)
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS('No missing indexes found'))
+            return
+        self.print_migrations(suggestions)
+        if options['check']:
+            raise CommandError(f'{len(suggestions)} missing index(es)')
+
+    def scenarios(self):
+        """(name, path, user) for each audited read action"""
+        job = Job.objects.filter(is_active=True).order_by('-applications_count', 'pk').first()
+        candidate = User.objects.filter(user_type='candidate', application__isnull=False).order_by('pk').first()
+        company = Company.objects.order_by('pk').first()
+        if job is None or candidate is None or company is None:
+            raise CommandError('Nothing to audit: seed jobs and applications first, or pass --tier')
+        employer = job.posted_by
+        term = job.title.split()[0]
+        return [
+            ('jobs-list', '/api/v1/jobs/', None),
+            ('jobs-list-paged', '/api/v1/jobs/?page_size=50', None),
+            ('jobs-list-employer', '/api/v1/jobs/', employer),
+            ('jobs-detail', f'/api/v1/jobs/{job.pk}/', None),
+            ('jobs-search', f'/api/v1/jobs/search/?q={term}', None),
+            ('jobs-export', '/api/v1/jobs/export/', None),
+            ('jobs-applications', f'/api/v1/jobs/{job.pk}/applications/', employer),
+            ('my_jobs', '/api/v1/jobs/my_jobs/', employer),
+            ('companies-list', '/api/v1/companies/', None),
+            ('companies-detail', f'/api/v1/companies/{company.pk}/', None),
+            ('applications-list', '/api/v1/applications/', employer),
+            ('applications-list-candidate', '/api/v1/applications/', candidate),
+            ('my_applications', '/api/v1/applications/my_applications/', candidate),
+            ('applications-export', '/api/v1/applications/export/', candidate),
+        ]
+
+    def audit(self):
+        """Findings per action: [(sql, [(kind, table, detail)], suggested columns)]"""
+        # Every read reaches the database: no response cache, no replicas, no rate limits
+        overrides = {
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            'DATABASE_REPLICAS': [],
+            'RATE_LIMIT_ENABLED': False,
+        }
+        report = {}
+        with override_settings(**overrides):
+            for name, path, user in self.scenarios():
+                client = Client()
+                headers = {}
+                if user is not None:
+                    headers['HTTP_AUTHORIZATION'] = f'Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}'
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(path, **headers)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                if response.status_code >= 400:
+                    raise CommandError(f'{name}: GET {path} returned {response.status_code}')
+
+                audited = []
+                for query in queries.captured_queries:
+                    sql = query['sql']
+                    if not sql.lstrip().upper().startswith('SELECT'):
+                        continue
+                    findings = explain(sql)
+                    suggestion = None
+                    if findings:
+                        scanned = {table for kind, table, _ in findings if kind == 'scan'}
+                        table = driving_table(sql)
+                        if table in scanned or any(kind == 'sort' for kind, _, _ in findings):
+                            columns = suggest_index(sql, table)
+                            suggestion = columns and (table, columns)
+                    audited.append((sql, findings, suggestion))
+                report[name] = {'path': path, 'queries': audited}
+        return report
+
+    def suggestions(self, report):
+        """{model: [field names]} for suggested indexes no existing index already serves"""
+        models_by_table = {model._meta.db_table: model for model in apps.get_models()}
+        wanted = defaultdict(set)
+        for result in report.values():
+            for _, _, suggestion in result['queries']:
+                if suggestion and suggestion[0] in models_by_table:
+                    wanted[models_by_table[suggestion[0]]].add(suggestion[1])
+
+        suggestions = {}
+        for model, candidates in wanted.items():
+            indexed = existing_indexes(model)
+            # The longest of several suggestions sharing a prefix serves them all
+            kept = [
+                columns for columns in candidates
+                if not any(other != columns and other[:len(columns)] == columns for other in candidates)
+            ]
+            fields = []
+            for columns in sorted(kept):
+                if is_covered(columns, indexed):
+                    continue
+                by_column = {field.column: field.name for field in model._meta.local_fields}
+                fields.append([
+                    ('-' if column.startswith('-') else '') + by_column[column.lstrip('-')] for column in columns
+                ])
+            if fields:
+                suggestions[model] = fields
+        return suggestions
+
+    def print_report(self, report):
+        for name, result in report.items():
+            flagged = [(sql, findings, suggestion) for sql, findings, suggestion in result['queries'] if findings]
+            status = self.style.WARNING(f'{len(flagged)} flagged') if flagged else self.style.SUCCESS('ok')
+            self.stdout.write(f"{name:<30}{len(result['queries']):>3} queries  {status}")
+            for sql, findings, suggestion in flagged:
+                self.stdout.write(f'    {sql[:160]}')
+                for kind, _, detail in findings:
+                    self.stdout.write(f'      {kind:<6}{detail}')
+                if suggestion:
+                    self.stdout.write(f"      index {suggestion[0]}({', '.join(suggestion[1])})")
+
+    def print_migrations(self, suggestions):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        by_app = defaultdict(list)
+        for model, indexes in suggestions.items():
+            for fields in indexes:
+                index = models.Index(fields=fields, name='')
+                index.set_name_with_model(model)
+                by_app[model._meta.app_label].append((model, index))
+
+        self.stdout.write('Add to Meta.indexes:')
+        for app_label, indexes in by_app.items():
+            for model, index in indexes:
+                self.stdout.write(f'  {model.__name__}: models.Index(fields={index.fields!r}, name={index.name!r})')
+
+        for app_label, indexes in by_app.items():
+            leaves = loader.graph.leaf_nodes(app_label)
+            number = MigrationAutodetector.parse_number(leaves[-1][1]) + 1 if leaves else 1
+            migration = Migration(f'{number:04d}_audit_indexes', app_label)
+            migration.dependencies = leaves
+            migration.operations = [
+                AddIndex(model_name=model._meta.model_name, index=index) for model, index in indexes
+            ]
+            writer = MigrationWriter(migration)
+            self.stdout.write(f'Suggested migration {app_label}/migrations/{migration.name}.py:')
+            self.stdout.write(writer.as_string())
@@ -0,0 +1,231 @@
+# management/commands/benchmark_asgi.py
+import asyncio
+import io
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from job_app.models import Company, Job
+
+from .benchmark_endpoints import TIERS, Command as EndpointBenchmark, percentile, tier_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the async read endpoints under ASGI with their DRF counterparts under WSGI '
+        'for many concurrent slow clients, on a seeded test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tier', choices=TIERS, default='1k', help='Dataset size (jobs)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and server')
+        parser.add_argument('--clients', type=int, default=100, help='Concurrent clients')
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='WSGI worker threads, as in gunicorn --threads (the ASGI side runs on one event loop)',
+        )
+        parser.add_argument(
+            '--client-delay', type=float, default=0.1,
+            help='Seconds a slow client takes to read each response; the server holds it meanwhile',
+        )
+        parser.add_argument('--output', default='benchmark-asgi-report.json', help='Report path')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the seeded test database between runs')
+        parser.add_argument('--workers', type=int, default=1, help='Seeding worker processes')
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1 or options['threads'] < 1:
+            raise CommandError('--clients and --threads must be at least 1')
+
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            EndpointBenchmark(stdout=self.stdout).seed(tier_counts(TIERS[options['tier']]), options['workers'])
+            unlimited = {
+                scope: {**config, 'rate': '1000000000/s', 'burst': 1_000_000_000}
+                for scope, config in settings.RATE_LIMITS.items()
+            }
+            # No response cache: both sides answer every request from the database
+            dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+            with override_settings(RATE_LIMITS=unlimited, CACHES=dummy_cache):
+                report = self.measure(
+                    options['requests'], options['clients'], options['threads'], options['client_delay'],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report['tier'] = options['tier']
+        Path(options['output']).write_text(json.dumps(report, indent=2))
+        self.print_report(report)
+        self.stdout.write(f"Report written to {options['output']}")
+
+    def scenarios(self):
+        """(name, WSGI path, ASGI path) for each benchmarked endpoint"""
+        job = Job.objects.filter(is_active=True).order_by('pk').first()
+        company = Company.objects.order_by('pk').first()
+        if job is None or company is None:
+            raise CommandError('No active jobs to benchmark')
+        term = job.title.split()[0]
+        return [
+            ('jobs-list', '/api/v1/jobs/?page_size=50', '/api/v1/async/jobs/?page_size=50'),
+            ('jobs-detail', f'/api/v1/jobs/{job.pk}/', f'/api/v1/async/jobs/{job.pk}/'),
+            ('jobs-search', f'/api/v1/jobs/search/?q={term}', f'/api/v1/async/jobs/search/?q={term}'),
+            ('companies-list', '/api/v1/companies/', '/api/v1/async/companies/'),
+            ('companies-detail', f'/api/v1/companies/{company.pk}/', f'/api/v1/async/companies/{company.pk}/'),
+        ]
+
+    def measure(self, requests, clients, threads, delay):
+        wsgi, asgi = WSGIHandler(), ASGIHandler()
+        endpoints = {}
+        for name, wsgi_path, asgi_path in self.scenarios():
+            endpoints[name] = {
+                'wsgi': self.summarize(self.run_wsgi(wsgi, wsgi_path, requests, clients, threads, delay)),
+                'asgi': self.summarize(asyncio.run(self.run_asgi(asgi, asgi_path, requests, clients, delay))),
+            }
+        return {
+            'database': connection.vendor,
+            'requests': requests,
+            'clients': clients,
+            'wsgi_threads': threads,
+            'client_delay_s': delay,
+            'endpoints': endpoints,
+        }
+
+    def run_wsgi(self, application, path, requests, clients, threads, delay):
+        """Clients queue on a fixed pool of worker threads, each blocked until its client has read the response"""
+        url = urlsplit(path)
+
+        def serve():
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': url.path,
+                'QUERY_STRING': url.query,
+                'SERVER_NAME': 'testserver',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'REMOTE_ADDR': '127.0.0.1',
+                'wsgi.version': (1, 0),
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            status = []
+            response = application(environ, lambda line, headers, exc_info=None: status.append(int(line[:3])))
+            try:
+                b''.join(response)
+                time.sleep(delay)  # Writing to the slow client's socket
+            finally:
+                response.close()
+            return status[0]
+
+        counter = iter(range(requests))
+        lock = threading.Lock()
+        samples = []
+        with ThreadPoolExecutor(max_workers=threads) as server:
+            def client():
+                while True:
+                    with lock:
+                        if next(counter, None) is None:
+                            return
+                    started = time.perf_counter()
+                    status = server.submit(serve).result()
+                    samples.append((status, time.perf_counter() - started))
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                list(pool.map(lambda _: client(), range(clients)))
+            elapsed = time.perf_counter() - started
+        return samples, elapsed
+
+    async def run_asgi(self, application, path, requests, clients, delay):
+        """Clients share one event loop; a response awaiting its slow client holds only a coroutine"""
+        url = urlsplit(path)
+        remaining = iter(range(requests))
+        samples = []
+
+        async def serve():
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': url.path,
+                'raw_path': url.path.encode(),
+                'query_string': url.query.encode(),
+                'headers': [(b'host', b'testserver')],
+                'client': ('127.0.0.1', 50000),
+                'server': ('testserver', 80),
+            }
+            done = asyncio.Event()
+            sent_request = False
+            status = []
+
+            async def receive():
+                nonlocal sent_request
+                if not sent_request:
+                    sent_request = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif not message.get('more_body', False):
+                    await asyncio.sleep(delay)  # Writing to the slow client's socket
+
+            try:
+                await application(scope, receive, send)
+            finally:
+                done.set()
+            return status[0]
+
+        async def client():
+            while next(remaining, None) is not None:
+                started = time.perf_counter()
+                status = await serve()
+                samples.append((status, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return samples, time.perf_counter() - started
+
+    def summarize(self, result):
+        samples, elapsed = result
+        timings = [seconds * 1000 for _, seconds in samples]
+        return {
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'errors': sum(1 for status, _ in samples if status >= 400),
+        }
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{report['requests']} requests per endpoint, {report['clients']} clients reading for "
+            f"{report['client_delay_s'] * 1000:.0f} ms, WSGI on {report['wsgi_threads']} threads"
+        )
+        self.stdout.write(f"{'endpoint':<18}{'server':<7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for name, servers in report['endpoints'].items():
+            for server, result in servers.items():
+                self.stdout.write(
+                    f"{name:<18}{server:<7}{result['throughput_rps']:>9.1f}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['errors']:>8}"
+                )
+            speedup = servers['asgi']['throughput_rps'] / servers['wsgi']['throughput_rps']
+            self.stdout.write(f"{'':<18}asgi/wsgi throughput x{speedup:.2f}")
@@ -0,0 +1,241 @@
+# management/commands/benchmark_endpoints.py
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from job_app.models import Application, Company, Job, User
+from job_app.serializers import CustomTokenObtainPairSerializer
+
+# Dataset tiers: jobs, with companies, users and applications scaled from it
+TIERS = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+# Allowed growth over the baseline before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def tier_counts(jobs):
+    return {
+        'companies': max(jobs // 50, 20),
+        'users': max(jobs // 20, 50),  # of each type
+        'jobs': jobs,
+        'applications': jobs * 10,
+    }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the main REST endpoints on a seeded test database, writes p50/p95 latency, '
+        'query count and peak memory per endpoint to JSON and fails on regressions against a baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tier', choices=TIERS, default='1k', help='Dataset size (jobs)')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint')
+        parser.add_argument('--output', default='benchmark-report.json', help='Report path')
+        parser.add_argument('--baseline', help='Baseline report to compare against')
+        parser.add_argument(
+            '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+            help='Allowed relative growth of p95 latency and peak memory (query counts must not grow)',
+        )
+        parser.add_argument(
+            '--update-baseline', action='store_true', help='Write the report to --baseline instead of comparing',
+        )
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Keep the seeded test database between runs (large tiers take a while to seed)',
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Seeding worker processes')
+
+    def handle(self, *args, **options):
+        if options['update_baseline'] and not options['baseline']:
+            raise CommandError('--update-baseline needs --baseline')
+
+        # DEBUG off: production code paths, and no per-query logging skewing the timings
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.seed(tier_counts(TIERS[options['tier']]), options['workers'])
+            # Limits stay on so their cost is measured, but are raised out of reach
+            unlimited = {
+                scope: {**config, 'rate': '1000000000/s', 'burst': 1_000_000_000}
+                for scope, config in settings.RATE_LIMITS.items()
+            }
+            with override_settings(RATE_LIMITS=unlimited):
+                report = self.measure(options['requests'], options['warmup'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report['tier'] = options['tier']
+        Path(options['output']).write_text(json.dumps(report, indent=2))
+        self.print_report(report)
+        self.stdout.write(f"Report written to {options['output']}")
+
+        if not options['baseline']:
+            return
+        if options['update_baseline']:
+            Path(options['baseline']).write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline updated: {options['baseline']}"))
+            return
+
+        baseline = json.loads(Path(options['baseline']).read_text())
+        if baseline.get('tier') != report['tier']:
+            raise CommandError(f"Baseline is for tier {baseline.get('tier')}, not {report['tier']}")
+        regressions = self.compare(report, baseline, options['tolerance'])
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def seed(self, counts, workers):
+        if Job.objects.count() >= counts['jobs']:
+            return  # --keepdb run against an already seeded database
+        self.stdout.write(f"Seeding {counts['jobs']} jobs / {counts['applications']} applications...")
+        common = {'seed': 'benchmark', 'workers': workers, 'verbosity': 0, 'stdout': self.stdout}
+        call_command('seed_companies', count=counts['companies'], **common)
+        call_command('seed_users', count=counts['users'], resume_ratio=0, **common)
+        call_command('seed_jobs', count=counts['jobs'], **common)
+        call_command('seed_applications', count=counts['applications'], **common)
+
+    def scenarios(self):
+        """(name, method, path, user, payload factory) for each benchmarked endpoint"""
+        busiest_job = Job.objects.filter(is_active=True).order_by('-applications_count', 'pk').first()
+        if busiest_job is None:
+            raise CommandError('No active jobs to benchmark')
+        employer = busiest_job.posted_by
+        candidate = (
+            User.objects.filter(user_type='candidate', application__isnull=False).order_by('pk').first()
+        )
+        registrations = iter(range(10 ** 9))
+
+        def registration():
+            number = next(registrations)
+            return {
+                'email': f'benchmark.{number}@example.com',
+                'password': 'benchmark-pass-123',
+                'user_type': 'candidate',
+                'first_name': 'Bench',
+                'last_name': f'Mark{number}',
+            }
+
+        return [
+            ('jobs-list', 'get', '/api/v1/jobs/?page_size=50', None, None),
+            ('jobs-detail', 'get', f'/api/v1/jobs/{busiest_job.pk}/', None, None),
+            ('applications-list', 'get', '/api/v1/applications/', employer, None),
+            ('my_jobs', 'get', '/api/v1/jobs/my_jobs/', employer, None),
+            ('my_applications', 'get', '/api/v1/applications/my_applications/', candidate, None),
+            ('companies-list', 'get', '/api/v1/companies/', None, None),
+            ('registration', 'post', '/api/v1/users/', None, registration),
+        ]
+
+    def measure(self, requests, warmup):
+        """Time each scenario through the real URLconf and middleware"""
+        endpoints = {}
+        for name, method, path, user, payload in self.scenarios():
+            client = Client()
+            headers = {}
+            if user is not None:
+                headers['HTTP_AUTHORIZATION'] = f'Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}'
+
+            def call():
+                # Cold responses: the anonymous response cache would otherwise answer every call
+                cache.clear()
+                kwargs = {'data': payload(), 'content_type': 'application/json'} if payload else {}
+                started = time.perf_counter()
+                response = getattr(client, method)(path, **kwargs, **headers)
+                elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise CommandError(f'{name}: {method.upper()} {path} returned {response.status_code}')
+                return response, elapsed
+
+            for _ in range(warmup):
+                call()
+            timings = [call()[1] * 1000 for _ in range(requests)]
+
+            # Queries and memory are taken on separate calls so their overhead stays out of the timings
+            with CaptureQueriesContext(connection) as queries:
+                response, _ = call()
+            # Read now: the next request resets the connection's query log
+            query_count = len(queries)
+            tracemalloc.start()
+            try:
+                call()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            endpoints[name] = {
+                'method': method.upper(),
+                'path': path,
+                'status': response.status_code,
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(percentile(timings, 95), 3),
+                'mean_ms': round(statistics.fmean(timings), 3),
+                'queries': query_count,
+                'peak_memory_kb': round(peak / 1024, 1),
+            }
+
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'dataset': {
+                'companies': Company.objects.count(),
+                'users': User.objects.count(),
+                'jobs': Job.objects.count(),
+                'applications': Application.objects.count(),
+            },
+            'requests': requests,
+            'endpoints': endpoints,
+        }
+
+    def compare(self, report, baseline, tolerance):
+        regressions = []
+        for name, expected in baseline['endpoints'].items():
+            actual = report['endpoints'].get(name)
+            if actual is None:
+                regressions.append(f'{name}: missing from the report')
+                continue
+            if actual['queries'] > expected['queries']:
+                regressions.append(f"{name}: {actual['queries']} queries (baseline {expected['queries']})")
+            for metric in ('p95_ms', 'peak_memory_kb'):
+                limit = expected[metric] * (1 + tolerance)
+                if actual[metric] > limit:
+                    regressions.append(
+                        f'{name}: {metric} {actual[metric]} exceeds baseline {expected[metric]} '
+                        f'by more than {tolerance:.0%}'
+                    )
+        return regressions
+
+    def print_report(self, report):
+        self.stdout.write(f"{'endpoint':<18}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KB':>11}")
+        for name, result in report['endpoints'].items():
+            self.stdout.write(
+                f"{name:<18}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['queries']:>9}{result['peak_memory_kb']:>11.1f}"
+            )
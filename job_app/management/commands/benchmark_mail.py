@@ -0,0 +1,66 @@
+# management/commands/benchmark_mail.py
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from job_app.mail import batched_delivery, close_pooled_connection, send_message
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures email throughput against a local SMTP sink '
+        '(e.g. `python -m aiosmtpd -n -l localhost:8025`): a connection per message, '
+        'the pooled connection, and batched delivery'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--messages', type=int, default=500, help='Messages per mode')
+
+    def handle(self, *args, **options):
+        smtp = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': options['host'],
+            'EMAIL_PORT': options['port'],
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+        count = options['messages']
+
+        def per_message():
+            for message in self.messages(count):
+                message.connection = get_connection()
+                message.send()
+
+        def pooled():
+            for message in self.messages(count):
+                send_message(message)
+
+        def batched():
+            with batched_delivery():
+                for message in self.messages(count):
+                    send_message(message)
+
+        with override_settings(**smtp):
+            for name, run in (('connection per message', per_message), ('pooled', pooled), ('batched', batched)):
+                close_pooled_connection()
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"{name:<24}{count / elapsed:>10.1f} msg/s ({elapsed:.2f}s)")
+            close_pooled_connection()
+
+    def messages(self, count):
+        return (
+            EmailMessage(
+                subject=f'Benchmark {number}',
+                body='Throughput test message',
+                from_email='benchmark@jobboard.com',
+                to=['sink@example.com'],
+            )
+            for number in range(count)
+        )
@@ -0,0 +1,61 @@
+# management/commands/benchmark_serializers.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from job_app.fast_serializers import compile_serializer
+from job_app.models import Application, Job
+from job_app.serializers import ApplicationListSerializer, JobListSerializer
+
+TARGETS = {
+    'jobs': (JobListSerializer, lambda: Job.objects.select_related('company', 'posted_by')),
+    'applications': (
+        ApplicationListSerializer,
+        lambda: Application.objects.select_related('job__company', 'job__posted_by', 'candidate'),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares DRF and compiled list serialization on existing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows serialized per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer (best is kept)')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        context = {'request': Request(RequestFactory().get('/api/v1/'))}
+
+        for name, (serializer_class, queryset) in TARGETS.items():
+            compiled = compile_serializer(serializer_class)
+            instances = list(queryset()[:options['rows']])
+            rows = list(queryset().values(*compiled.paths)[:options['rows']])
+            if not instances:
+                self.stdout.write(self.style.WARNING(f'{name}: no rows, run the seed commands first'))
+                continue
+
+            drf_data = serializer_class(instances, many=True, context=context).data
+            fast_data = compiled.serialize(rows, context)
+            if renderer.render(drf_data) != renderer.render(fast_data):
+                raise CommandError(f'{name}: compiled output differs from {serializer_class.__name__}')
+
+            drf_time = self.best_of(
+                options['repeat'], lambda: serializer_class(instances, many=True, context=context).data
+            )
+            fast_time = self.best_of(options['repeat'], lambda: compiled.serialize(rows, context))
+            self.stdout.write(
+                f'{name}: {len(rows)} rows, identical JSON, '
+                f'DRF {drf_time * 1000:.1f} ms, compiled {fast_time * 1000:.1f} ms '
+                f'({drf_time / fast_time:.1f}x faster)'
+            )
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
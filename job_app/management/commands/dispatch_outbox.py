@@ -0,0 +1,39 @@
+# management/commands/dispatch_outbox.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from job_app.outbox import dispatch_pending, purge_dispatched
+
+
+class Command(BaseCommand):
+    help = 'Publishes pending outbox events to Celery (runs until interrupted unless --once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain pending events and exit')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            '--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL,
+            help='Seconds to sleep when there is nothing to dispatch',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        last_purge = time.monotonic()
+        try:
+            while True:
+                sent = dispatch_pending(options['batch_size'])
+                total += sent
+                if sent and options['verbosity'] > 1:
+                    self.stdout.write(f"Dispatched {sent} events")
+                if sent == options['batch_size']:
+                    continue  # More may be waiting
+                if options['once']:
+                    break
+                if time.monotonic() - last_purge > 3600:
+                    purge_dispatched()
+                    last_purge = time.monotonic()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Dispatched {total} outbox events'))
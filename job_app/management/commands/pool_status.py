@@ -0,0 +1,133 @@
+# management/commands/pool_status.py
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from job_app.dbpool import get_pool, pool_stats, published_pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports database connection pool configuration and the utilization published by '
+        'worker processes; --load runs a concurrent checkout test against the pool'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', help='Alias to report (repeatable; default all)')
+        parser.add_argument('--load', type=int, default=0, help='Queries to run in the load test')
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help='Load test threads (default: twice the pool size, to drive it into saturation)',
+        )
+        parser.add_argument(
+            '--hold', type=float, default=0.05, help='Seconds each load test query keeps its connection',
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['database'] or list(settings.DATABASES)
+        unknown = set(aliases) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f"Unknown database alias: {', '.join(sorted(unknown))}")
+
+        self.stdout.write('Configuration')
+        for alias in aliases:
+            self.stdout.write(f'  {alias:<12}{self.describe(alias)}')
+
+        published = published_pool_stats()
+        self.stdout.write(f'Published by {len(published)} worker process(es)')
+        for alias in aliases:
+            pools = [
+                (process, entry['pools'][alias]) for process, entry in sorted(published.items())
+                if alias in entry['pools']
+            ]
+            for process, stats in pools:
+                self.stdout.write(f'  {alias:<12}{process:<28}{self.utilization(stats)}')
+            if len(pools) > 1:
+                self.stdout.write(
+                    f"  {alias:<12}{'total':<28}"
+                    f"{sum(stats['in_use'] for _, stats in pools)}/{sum(stats['max_size'] for _, stats in pools)} "
+                    f"in use, {sum(stats['waiting'] for _, stats in pools)} waiting"
+                )
+
+        if options['load']:
+            for alias in aliases:
+                self.load_test(alias, options['load'], options['concurrency'], options['hold'])
+
+    def describe(self, alias):
+        database = settings.DATABASES[alias]
+        checks = 'on' if database.get('CONN_HEALTH_CHECKS') else 'off'
+        pool = database.get('OPTIONS', {}).get('pool')
+        if pool:
+            return (
+                f"psycopg pool min={pool.get('min_size')} max={pool.get('max_size')} "
+                f"timeout={pool.get('timeout')}s, health checks {checks}"
+            )
+        return f"not pooled, persistent connections CONN_MAX_AGE={database.get('CONN_MAX_AGE', 0)}s, health checks {checks}"
+
+    def utilization(self, stats):
+        wait = stats['requests_wait_ms'] / stats['requests'] if stats['requests'] else 0
+        return (
+            f"{stats['in_use']}/{stats['max_size']} in use, {stats['waiting']} waiting, "
+            f"{stats['utilization']:.0%} utilized, {wait:.1f} ms mean wait, "
+            f"{stats['requests_errors']} checkout errors"
+        )
+
+    def load_test(self, alias, count, concurrency, hold):
+        pool = get_pool(alias)
+        if concurrency is None:
+            concurrency = pool.max_size * 2 if pool is not None else 8
+        peaks = {'in_use': 0, 'waiting': 0}
+        running = threading.Event()
+        running.set()
+
+        def sample():
+            while running.is_set():
+                stats = pool_stats(alias)
+                if stats['pooled']:
+                    peaks['in_use'] = max(peaks['in_use'], stats['in_use'])
+                    peaks['waiting'] = max(peaks['waiting'], stats['waiting'])
+                time.sleep(0.01)
+
+        def query(_):
+            connection = connections[alias]
+            started = time.perf_counter()
+            try:
+                connection.ensure_connection()
+                checkout = time.perf_counter() - started
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                time.sleep(hold)
+                return checkout, None
+            except DatabaseError as exc:
+                return time.perf_counter() - started, exc
+            finally:
+                connection.close()  # Returned to the pool when pooled
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(query, range(count)))
+        finally:
+            running.clear()
+            sampler.join()
+        elapsed = time.perf_counter() - started
+
+        checkouts = sorted(checkout * 1000 for checkout, _ in results)
+        errors = [error for _, error in results if error is not None]
+        self.stdout.write(f'Load test {alias}: {count} queries on {concurrency} threads, {hold * 1000:.0f} ms hold')
+        self.stdout.write(
+            f'  {count / elapsed:.1f} queries/s, checkout p50 {statistics.median(checkouts):.1f} ms, '
+            f'p95 {checkouts[int(0.95 * (len(checkouts) - 1))]:.1f} ms, max {checkouts[-1]:.1f} ms'
+        )
+        if pool is not None:
+            self.stdout.write(f"  peak {peaks['in_use']}/{pool.max_size} in use, peak {peaks['waiting']} waiting")
+        if errors:
+            self.stdout.write(self.style.ERROR(f'  {len(errors)} failed: {errors[0]}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('  no errors'))
@@ -0,0 +1,16 @@
+# management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from job_app.search import get_database_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the database full-text index used by /jobs/search/'
+
+    def handle(self, *args, **options):
+        backend = get_database_search_backend()
+        with transaction.atomic():
+            backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt job search index ({type(backend).__name__})')
+        )
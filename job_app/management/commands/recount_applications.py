@@ -0,0 +1,49 @@
+# management/commands/recount_applications.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from job_app.caching import invalidate_model
+from job_app.models import Application, Job
+
+
+def actual_applications_count():
+    """Subquery expression counting a job's applications"""
+    counts = (
+        Application.objects.filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Job.applications_count and repairs any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report jobs whose counter has drifted',
+        )
+
+    def handle(self, *args, **options):
+        drifted_count = (
+            Job.objects.alias(actual=actual_applications_count())
+            .exclude(applications_count=F('actual'))
+            .count()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"{drifted_count} jobs have a drifted applications_count")
+            return
+
+        with transaction.atomic():
+            Job.objects.update(applications_count=actual_applications_count())
+            invalidate_model('Job')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Recounted applications ({drifted_count} jobs repaired)')
+        )
@@ -0,0 +1,37 @@
+# management/commands/reindex_jobs.py
+from django.core.management.base import BaseCommand, CommandError
+from elastic_transport import TransportError
+from elasticsearch import ApiError
+from job_app.search import SearchUnavailable
+from job_app.search.elastic import get_job_index
+
+
+class Command(BaseCommand):
+    help = 'Mirrors active jobs into the Elasticsearch job index with bulk requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only sync jobs changed since the last stored watermark',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Jobs read per database chunk and sent per _bulk request',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            index = get_job_index()
+            if options['incremental']:
+                indexed, deleted = index.sync(batch_size=options['batch_size'])
+            else:
+                indexed, deleted = index.reindex(batch_size=options['batch_size'])
+        except (SearchUnavailable, ApiError, TransportError) as exc:
+            raise CommandError(f"Reindex failed: {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {indexed} jobs, removed {deleted} from "{index.name}"')
+        )
@@ -1,107 +1,60 @@
 # management/commands/seed_applications.py
-from django.core.management.base import BaseCommand
-from job_app.models import Application, Job, User
-from faker import Faker
 import random
+
+from django.core.management import call_command
 from django.utils import timezone
-from datetime import timedelta
+from job_app.caching import invalidate_model
+from job_app.models import Application, Job, User
+from job_app.seeding import SeedCommand, application_rows
+
+
+class Command(SeedCommand):
+    help = 'Seeds the database with realistic job applications (default: 3-10 per candidate)'
+    default_count = None
 
-class Command(BaseCommand):
-    help = 'Seeds the database with realistic job applications'
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fake = Faker()
-        
     def handle(self, *args, **options):
         self.stdout.write("Seeding applications...")
-        
-        # Get active jobs and candidates
-        jobs = Job.objects.filter(is_active=True)
-        candidates = User.objects.filter(user_type='candidate')
-        
-        if not jobs.exists():
+
+        # Job ids and candidate ids are loaded once; pairs are drawn in memory
+        jobs = list(
+            Job.objects.filter(is_active=True).order_by('pk')
+            .values_list('pk', 'posted_by__company_id', 'created_at')
+        )
+        candidates = list(
+            User.objects.filter(user_type='candidate').order_by('pk').values_list('pk', 'company_id')
+        )
+
+        if not jobs:
             self.stdout.write(self.style.ERROR('No active jobs found. Run seed_jobs first.'))
             return
-            
-        if not candidates.exists():
+
+        if not candidates:
             self.stdout.write(self.style.ERROR('No candidates found. Run seed_users first.'))
             return
-            
-        applications_created = 0
-        
-        # Each candidate applies to 3-10 jobs
-        for candidate in candidates:
-            num_applications = random.randint(3, 10)
-            jobs_to_apply = random.sample(list(jobs), num_applications)
-            
-            for job in jobs_to_apply:
-                # Ensure candidate doesn't apply to their own company's jobs
-                if job.posted_by.company != candidate.company:
-                    self.create_application(job, candidate)
-                    applications_created += 1
-        
-        self.stdout.write(
-            self.style.SUCCESS(f'Successfully seeded {applications_created} applications')
-        )
-    
-    def create_application(self, job, candidate):
-        # Determine application status with weighted probabilities
-        status = random.choices(
-            ['APP', 'REV', 'INT', 'OFF', 'REJ'],
-            weights=[40, 30, 15, 5, 10]  # 40% Applied, 30% Review, etc.
-        )[0]
-        
-        # Generate realistic application dates (within job posting timeframe)
-        days_since_posted = (timezone.now() - job.created_at).days
-        applied_at = job.created_at + timedelta(
-            days=random.randint(0, min(days_since_posted, 30))
-        )
-        
-        # Create the application with historical timestamp
-        application = Application.objects.create(
-            job=job,
-            candidate=candidate,
-            cover_letter=self.generate_cover_letter(job, candidate),
-            status=status,
-            applied_at=applied_at
-        )
-        
-        # Update status timestamps realistically
-        self.update_application_status(application)
-        
-        self.stdout.write(
-            f"{candidate.email} applied to {job.title} ({status})"
-        )
-    
-    def generate_cover_letter(self, job, candidate):
-        return f"""
-Dear Hiring Manager,
 
-I'm excited to apply for the {job.title} position at {job.company.name}. 
-{self.fake.paragraph()}
+        count = options['count']
+        if count is None:
+            rng = random.Random(options['seed'])
+            count = sum(rng.randint(3, 10) for _ in candidates)
 
-My skills in {random.choice(['Python', 'Django', 'JavaScript', 'React'])} align well with your requirements. 
-{self.fake.paragraph()}
+        context = {'jobs': jobs, 'candidates': candidates, 'now': timezone.now()}
+        before = Application.objects.count()
+        created = attempt = 0
+        # Pairs repeated across batches or already in the table are skipped, so top up until
+        # --count rows exist or a pass adds nothing (every pair taken)
+        while created < count:
+            batches = self.generate(application_rows, count - created, options, context, attempt)
+            self.insert(Application, batches, ignore_conflicts=True, timestamps=('applied_at',))
+            added = Application.objects.count() - before - created
+            if not added:
+                break
+            created += added
+            attempt += 1
 
-{self.fake.paragraph()}
+        # bulk_create bypasses Application.save, so rebuild the denormalized counters
+        call_command('recount_applications', stdout=self.stdout)
+        invalidate_model('Application')
 
-Sincerely,
-{candidate.get_full_name()}
-"""
-    
-    def update_application_status(self, application):
-        """Simulate realistic status progression"""
-        if application.status in ['REV', 'INT', 'OFF']:
-            application.status_updated_at = application.applied_at + timedelta(
-                days=random.randint(2, 7)
-            )
-            application.save()
-        
-        if application.status in ['INT', 'OFF']:
-            # Create interview records if needed
-            pass
-        
-        if application.status == 'OFF':
-            # Add offer details if needed
-            pass
\ No newline at end of file
+        if created < count:
+            self.stdout.write(self.style.WARNING(f'Only {created} of {count} applications could be created'))
+        self.stdout.write(self.style.SUCCESS(f'Successfully seeded {created} applications'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:28
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    Job = apps.get_model('job_app', 'Job')
+    Application = apps.get_model('job_app', 'Application')
+    counts = (
+        Application.objects.filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Job.objects.update(applications_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
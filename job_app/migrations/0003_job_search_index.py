@@ -0,0 +1,49 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_app_job_fts USING fts5("
+    "title, description, location, company_name, tokenize='porter unicode61')",
+    "INSERT INTO job_app_job_fts (rowid, title, description, location, company_name) "
+    "SELECT j.id, j.title, j.description, j.location, c.name "
+    "FROM job_app_job j JOIN job_app_company c ON c.id = j.company_id",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS job_app_job_fts",
+]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE job_app_job ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS job_app_job_search_vector_gin ON job_app_job USING GIN (search_vector)",
+    "UPDATE job_app_job AS j SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(j.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(c.name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(j.location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(j.description, '')), 'C') "
+    "FROM job_app_company AS c WHERE c.id = j.company_id",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS job_app_job_search_vector_gin",
+    "ALTER TABLE job_app_job DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    """Native full-text index for job search (FTS5 on SQLite, tsvector + GIN on PostgreSQL)"""
+
+    dependencies = [
+        ('job_app', '0002_job_applications_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run_for_vendor({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_app', '0005_outboxevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='eta',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_status', models.CharField(choices=[('APP', 'Applied'), ('REV', 'Under Review'), ('INT', 'Interview'), ('OFF', 'Offer'), ('REJ', 'Rejected')], max_length=3)),
+                ('new_status', models.CharField(choices=[('APP', 'Applied'), ('REV', 'Under Review'), ('INT', 'Interview'), ('OFF', 'Offer'), ('REJ', 'Rejected')], max_length=3)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='job_app.application')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['application', 'id'], name='status_change_unnotified_idx')],
+            },
+        ),
+    ]
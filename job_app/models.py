@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
 
@@ -14,9 +16,11 @@ class User(AbstractUser):
     phone = models.CharField(max_length=15, blank=True)
     resume = models.FileField(upload_to='resumes/', null=True, blank=True)
     company = models.ForeignKey('Company', on_delete=models.SET_NULL, null=True, blank=True)
+    # Embedded in access tokens; bumping it revokes every token issued so far
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     
     def delete(self, *args, **kwargs):
-        """Soft delete implementation"""
+        """Soft delete implementation; saving the deactivation revokes the user's tokens"""
         self.is_active = False
         self.save()
     
@@ -29,11 +33,29 @@ class User(AbstractUser):
         return f"{self.email}"
 
 # Company model
+class CompanyQuerySet(models.QuerySet):
+    def with_stats(self):
+        """Annotate job and open application counts, one grouped subquery per count"""
+        def count(queryset, group_by):
+            counts = queryset.filter(**{group_by: OuterRef('pk')}).order_by().values(group_by)
+            return Coalesce(Subquery(counts.annotate(n=Count('pk')).values('n')), 0)
+
+        return self.annotate(
+            jobs_count=count(Job.objects.all(), 'company'),
+            active_jobs_count=count(Job.objects.filter(is_active=True), 'company'),
+            open_applications_count=count(
+                Application.objects.filter(status__in=Application.OPEN_STATUSES), 'job__company'
+            ),
+        )
+
+
 class Company(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     website = models.URLField(blank=True)
     logo = models.ImageField(upload_to='company_logos/', null=True, blank=True)
+
+    objects = CompanyQuerySet.as_manager()
     
     class Meta:
         verbose_name_plural = "Companies"
@@ -64,6 +86,8 @@ class Job(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='jobs')
     is_active = models.BooleanField(default=True)
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Denormalized; maintained by Application.save and the post_delete signal
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -77,6 +101,21 @@ class Job(models.Model):
         return f"{self.title} at {self.company.name}"
 
 # Application model
+class ApplicationQuerySet(models.QuerySet):
+    def for_list(self):
+        """Everything the list serializer needs in a single joined query.
+
+        Only the columns ApplicationListSerializer reads are loaded (derived
+        from the serializer, so new fields follow); long texts such as
+        job.description stay in the database.
+        """
+        from .fast_serializers import compile_serializer
+        from .serializers import ApplicationListSerializer
+
+        columns = compile_serializer(ApplicationListSerializer).columns
+        return self.select_related('job__company', 'job__posted_by', 'candidate').only(*columns)
+
+
 class Application(models.Model):
     STATUS_CHOICES = (
         ('APP', 'Applied'),
@@ -85,16 +124,95 @@ class Application(models.Model):
         ('OFF', 'Offer'),
         ('REJ', 'Rejected'),
     )
+    # Not yet decided with an offer or a rejection
+    OPEN_STATUSES = ('APP', 'REV', 'INT')
     
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     candidate = models.ForeignKey(User, on_delete=models.CASCADE)
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=3, choices=STATUS_CHOICES, default='APP')
     applied_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ApplicationQuerySet.as_manager()
     
     class Meta:
         unique_together = ['job', 'candidate']  # Prevent duplicate applications
         ordering = ['-applied_at']
         
     def __str__(self):
-        return f"{self.candidate.email} → {self.job.title}"
\ No newline at end of file
+        return f"{self.candidate.email} → {self.job.title}"
+
+    def save(self, *args, **kwargs):
+        """Bump the job's applications_count in the same transaction as the insert"""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Job.objects.filter(pk=self.job_id).update(
+                    applications_count=F('applications_count') + 1
+                )
+
+# Application status history
+class ApplicationStatusChange(models.Model):
+    """Append-only log of Application.status transitions"""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_changes')
+    old_status = models.CharField(max_length=3, choices=Application.STATUS_CHOICES)
+    new_status = models.CharField(max_length=3, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_at = models.DateTimeField(auto_now_add=True)
+    # Set once the change has been folded into a candidate notification
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['application', 'id'],
+                condition=models.Q(notified_at__isnull=True),
+                name='status_change_unnotified_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Application {self.application_id}: {self.old_status} → {self.new_status}"
+
+# Search index sync state
+class SearchIndexState(models.Model):
+    """Watermark of the last Job.updated_at mirrored into an external search index"""
+    index_name = models.CharField(max_length=100, unique=True)
+    synced_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.index_name} @ {self.synced_until}"
+
+# Transactional outbox
+class OutboxEvent(models.Model):
+    """
+    Celery task call recorded in the same transaction as the change that
+    caused it, and published by the outbox dispatcher after commit.
+    """
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    # Earliest time the task may run, passed to apply_async(eta=...)
+    eta = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Set once the event has failed OUTBOX_MAX_ATTEMPTS times; it is no longer dispatched
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(dispatched_at__isnull=True, failed_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
@@ -0,0 +1,83 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from kombu.exceptions import OperationalError
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, *args, **kwargs):
+    """
+    Record a call to ``task`` in the current transaction.
+
+    Nothing touches the broker here: the dispatcher publishes the event once
+    the transaction has committed, and a rollback discards it with the rest.
+    """
+    return OutboxEvent.objects.create(task=task.name, args=list(args), kwargs=kwargs)
+
+
+def enqueue_many(task, calls, eta=None):
+    """Record one call to ``task`` per argument list in ``calls`` with a single INSERT"""
+    return OutboxEvent.objects.bulk_create(
+        [OutboxEvent(task=task.name, args=list(args), eta=eta) for args in calls]
+    )
+
+
+def dispatch_pending(batch_size=None):
+    """
+    Publish the oldest pending events to Celery, returning how many were sent.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED so several
+    dispatchers can run side by side. A broker connection error stops the
+    batch; the failed event keeps its place and is retried on the next pass.
+    Any other error (a task path that no longer imports, arguments that do
+    not serialize) only skips that event, and after ``OUTBOX_MAX_ATTEMPTS``
+    failures the event is parked with ``failed_at`` so it stops being retried.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True, failed_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        dispatched = []
+        for event in events:
+            try:
+                import_string(event.task).apply_async(args=event.args, kwargs=event.kwargs, eta=event.eta)
+            except (ConnectionError, OperationalError) as exc:
+                logger.warning(f"Outbox dispatch of {event} failed: {exc}")
+                OutboxEvent.objects.filter(pk=event.pk).update(
+                    attempts=F('attempts') + 1, last_error=str(exc)
+                )
+                break
+            except Exception as exc:
+                parked = event.attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS
+                logger.warning(f"Outbox dispatch of {event} failed{' for good' if parked else ''}: {exc}")
+                OutboxEvent.objects.filter(pk=event.pk).update(
+                    attempts=F('attempts') + 1, last_error=str(exc),
+                    failed_at=timezone.now() if parked else None,
+                )
+                continue
+            dispatched.append(event.pk)
+
+        OutboxEvent.objects.filter(pk__in=dispatched).update(
+            dispatched_at=timezone.now(), attempts=F('attempts') + 1, last_error=''
+        )
+    return len(dispatched)
+
+
+def purge_dispatched(older_than=None):
+    """Delete events dispatched more than ``older_than`` ago"""
+    older_than = older_than or timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    deleted, _ = OutboxEvent.objects.filter(
+        dispatched_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
@@ -0,0 +1,312 @@
+import base64
+import json
+
+from django.conf import settings
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class JobCursorPagination(BasePagination):
+    """
+    Keyset pagination over (-created_at, id).
+
+    Pages are located with a WHERE clause on the last seen row instead of
+    OFFSET, and no COUNT(*) is issued, so page N costs the same as page 1.
+    Pagination is opt-in: it is only applied when the request carries a
+    ``cursor`` or ``page_size`` query parameter, otherwise the full list is
+    returned as before.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, fetching the page with the async ORM"""
+        queryset = self.page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def page_queryset(self, queryset, request):
+        """The unevaluated slice holding the requested page plus one row, or None when not paginating"""
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            return queryset.order_by('-created_at', 'id')[:self.limit + 1]
+        created_at, pk, reverse = self.cursor
+        if reverse:
+            # Walk backwards from the first row of the current page.
+            keyset = Q(created_at__gt=created_at) | Q(created_at=created_at, id__lt=pk)
+            return queryset.filter(keyset).order_by('created_at', '-id')[:self.limit + 1]
+        keyset = Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=pk)
+        return queryset.filter(keyset).order_by('-created_at', 'id')[:self.limit + 1]
+
+    def set_page(self, rows):
+        reverse = self.cursor is not None and self.cursor[2]
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            created_at = parse_datetime(data['c'])
+            pk = int(data['i'])
+            reverse = bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk, reverse
+
+    def encode_cursor(self, obj, reverse):
+        data = {'c': self.get_position(obj, 'created_at').isoformat(), 'i': self.get_position(obj, 'id')}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(data, separators=(',', ':')).encode('ascii')
+        ).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_position(self, obj, field):
+        # Rows may be model instances or values() dicts
+        if isinstance(obj, dict):
+            return obj[field]
+        return getattr(obj, field)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination for async views: the count and the page are read with the async ORM"""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()  # Primes the cached property Paginator would query
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * paginator.per_page
+        rows = [row async for row in queryset[bottom:bottom + paginator.per_page]]
+        self.page = Page(rows, number, paginator)
+        return rows
+
+
+def estimated_count(queryset):
+    """The planner's row estimate for the queryset's whole table, or None where the database keeps none"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    # -1: never vacuumed or analyzed
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin changelist paginator for very large tables.
+
+    An unfiltered changelist takes its total from the planner's statistics
+    instead of COUNT(*); a filtered one counts at most
+    ``ADMIN_EXACT_COUNT_LIMIT`` rows. Numbered pages are still located
+    with OFFSET, so they get slower with depth and stop at the capped
+    count; ``KeysetChangeList`` pages past both with its Next links.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        if not self.object_list.query.where:
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return self.object_list[:limit].count()
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        ids = list(self.object_list.values_list('pk', flat=True)[bottom:bottom + self.per_page])
+        # Same ordering, so the rows come back in page order
+        return self._get_page(list(self.object_list.filter(pk__in=ids)), number, self)
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Admin changelist that pages with "Next" links instead of page numbers.
+
+    The link carries the sort key of the last row shown, and the next page
+    is the rows after it, found with a WHERE clause rather than OFFSET, so
+    every page costs the same and rows beyond a capped count stay
+    reachable. Orderings that are not all plain non-null columns of the
+    model (related or computed columns) fall back to page numbers.
+    """
+    CURSOR_VAR = 'after'
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(self.CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Sort, filter and search links start again from the first page
+        new_params = {self.CURSOR_VAR: None, **(new_params or {})}
+        return super().get_query_string(new_params, remove)
+
+    @cached_property
+    def keyset_fields(self):
+        """(lookup, field, descending) for each ordering term, or None when paging by number"""
+        fields = []
+        for term in self.queryset.query.order_by:
+            if not isinstance(term, str):
+                return None
+            name = term.removeprefix('-')
+            try:
+                field = self.lookup_opts.pk if name == 'pk' else self.lookup_opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation or field.null:
+                return None
+            fields.append((name, field, term.startswith('-')))
+        return fields or None
+
+    def get_results(self, request):
+        encoded = request.GET.get(self.CURSOR_VAR)
+        if not encoded or not self.keyset_fields:
+            return super().get_results(request)
+        queryset = self.queryset
+        # Counts and the page are taken from the rows after the cursor
+        self.queryset = queryset.filter(self.after(self.decode_cursor(encoded)))
+        self.page_num = 1
+        try:
+            super().get_results(request)
+        finally:
+            self.queryset = queryset
+
+    def after(self, values):
+        """Rows that sort after ``values``, compared column by column"""
+        keyset = Q()
+        equal = {}
+        for (name, field, descending), value in zip(self.keyset_fields, values):
+            keyset |= Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': value})
+            equal[name] = value
+        return keyset
+
+    def decode_cursor(self, encoded):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(self.keyset_fields):
+                raise ValueError(encoded)
+            return [field.to_python(value) for (name, field, descending), value in zip(self.keyset_fields, values)]
+        except (TypeError, ValueError, UnicodeEncodeError, ValidationError) as exc:
+            raise IncorrectLookupParameters(exc) from exc
+
+    def encode_cursor(self, obj):
+        values = [field.value_to_string(obj) for name, field, descending in self.keyset_fields]
+        return base64.urlsafe_b64encode(
+            json.dumps(values, separators=(',', ':')).encode('ascii')
+        ).decode('ascii').rstrip('=')
+
+    @property
+    def is_after_cursor(self):
+        return bool(self.keyset_fields and self.params.get(self.CURSOR_VAR))
+
+    @property
+    def next_page_url(self):
+        if not self.keyset_fields or not self.multi_page or (self.show_all and self.can_show_all):
+            return None
+        rows = list(self.result_list)
+        if len(rows) < self.list_per_page:
+            return None
+        return self.get_query_string({self.CURSOR_VAR: self.encode_cursor(rows[-1])})
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string()
@@ -0,0 +1,285 @@
+"""
+Rate limiting shared by every worker process.
+
+Two algorithms, each keeping O(1) state per key:
+
+* ``sliding_window``: hits in the current fixed window plus the previous
+  window's hits weighted by how much of it the sliding window still covers;
+* ``token_bucket``: ``burst`` tokens refilled continuously at ``rate``.
+
+Counters live in Redis when ``RATE_LIMIT_REDIS_URL`` is set, where each hit
+is one atomic Lua script evaluated against the Redis clock. Otherwise, and
+whenever Redis is unreachable, they live in a local SQLite file shared by
+the workers of the host and updated under ``BEGIN IMMEDIATE``.
+
+Scopes are configured in ``settings.RATE_LIMITS``; ``hit(scope, identity)``
+records one request and returns a ``RateLimitResult``.
+"""
+import json
+import logging
+import math
+import random
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+import redis
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Share of SQLite updates that also purge expired rows
+PURGE_PROBABILITY = 0.01
+
+
+class RateLimitUnavailable(Exception):
+    """The counter store could not be reached"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # Seconds until the next request is allowed (blocked) or counters roll over
+    window: int
+
+
+def parse_rate(rate):
+    """'100/day' -> (100, 86400)"""
+    number, period = rate.split('/')
+    return int(number), PERIODS[period[0]]
+
+
+# Algorithms. The Lua scripts below implement the same steps.
+
+def sliding_window(state, limit, window, now):
+    """Record one hit against ``state`` (start, current, previous); returns (state, allowed)"""
+    start = math.floor(now / window) * window
+    current = previous = 0
+    if state is not None:
+        saved_start, saved_current, saved_previous = state
+        if saved_start == start:
+            current, previous = saved_current, saved_previous
+        elif saved_start == start - window:
+            previous = saved_current
+    allowed = previous * (1 - (now - start) / window) + current + 1 <= limit
+    if allowed:
+        current += 1
+    return (start, current, previous), allowed
+
+
+def sliding_window_result(allowed, current, previous, limit, window, now):
+    start = math.floor(now / window) * window
+    elapsed = now - start
+    used = previous * (1 - elapsed / window) + current
+    if allowed:
+        reset = window - elapsed
+    elif previous and previous * (1 - elapsed / window) >= used + 1 - limit:
+        # The previous window's share decays enough before this one ends
+        reset = window * (used + 1 - limit) / previous
+    else:
+        # Wait for the next window, then for this window's share to decay
+        reset = window - elapsed + window * (1 - (limit - 1) / current)
+    return RateLimitResult(allowed, limit, max(0, math.floor(limit - used)), max(1, math.ceil(reset)), window)
+
+
+def token_bucket(state, capacity, refill, now):
+    """Take one token from ``state`` (tokens, updated); returns (state, allowed)"""
+    tokens, updated = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - updated) * refill)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return (tokens, now), allowed
+
+
+def token_bucket_result(allowed, tokens, capacity, refill, window):
+    missing = (1 - tokens) if not allowed else (capacity - tokens)
+    return RateLimitResult(allowed, capacity, math.floor(tokens), max(1, math.ceil(missing / refill)), window)
+
+
+# Backends
+
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local start = math.floor(now / window) * window
+local state = redis.call('HMGET', KEYS[1], 'start', 'current', 'previous')
+local current, previous = 0, 0
+local saved = tonumber(state[1])
+if saved == start then
+  current = tonumber(state[2])
+  previous = tonumber(state[3])
+elseif saved == start - window then
+  previous = tonumber(state[2])
+end
+local allowed = 0
+if previous * (1 - (now - start) / window) + current + 1 <= limit then
+  allowed = 1
+  current = current + 1
+  redis.call('HSET', KEYS[1], 'start', start, 'current', current, 'previous', previous)
+  redis.call('EXPIRE', KEYS[1], window * 2)
+end
+return {allowed, current, previous, tostring(now)}
+"""
+
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+local allowed = 0
+if tokens >= 1 then
+  allowed = 1
+  tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Counters in Redis, one atomic script evaluation per hit"""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=settings.RATE_LIMIT_TIMEOUT, socket_connect_timeout=settings.RATE_LIMIT_TIMEOUT
+        )
+        self.sliding_window_script = self.client.register_script(SLIDING_WINDOW_LUA)
+        self.token_bucket_script = self.client.register_script(TOKEN_BUCKET_LUA)
+
+    def hit_sliding_window(self, key, limit, window):
+        try:
+            allowed, current, previous, now = self.sliding_window_script(keys=[key], args=[limit, window])
+        except redis.RedisError as exc:
+            raise RateLimitUnavailable(str(exc)) from exc
+        return sliding_window_result(bool(allowed), int(current), int(previous), limit, window, float(now))
+
+    def hit_token_bucket(self, key, capacity, refill, window):
+        try:
+            allowed, tokens = self.token_bucket_script(keys=[key], args=[capacity, refill])
+        except redis.RedisError as exc:
+            raise RateLimitUnavailable(str(exc)) from exc
+        return token_bucket_result(bool(allowed), float(tokens), capacity, refill, window)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Counters in a local SQLite file. Every worker process on the host opens
+    the same file, and each hit is a read-modify-write under BEGIN IMMEDIATE,
+    so concurrent hits on one key are serialized.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=settings.RATE_LIMIT_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits '
+                '(key TEXT PRIMARY KEY, state TEXT NOT NULL, expires REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def update(self, key, step, ttl):
+        """Apply ``step(state, now)`` to the stored state atomically; returns (state, allowed, now)"""
+        try:
+            connection = self.connection()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = connection.execute(
+                    'SELECT state FROM rate_limits WHERE key = ? AND expires > ?', (key, now)
+                ).fetchone()
+                state, allowed = step(tuple(json.loads(row[0])) if row else None, now)
+                connection.execute(
+                    'INSERT INTO rate_limits (key, state, expires) VALUES (?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET state = excluded.state, expires = excluded.expires',
+                    (key, json.dumps(state), now + ttl),
+                )
+                if random.random() < PURGE_PROBABILITY:
+                    connection.execute('DELETE FROM rate_limits WHERE expires <= ?', (now,))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as exc:
+            raise RateLimitUnavailable(str(exc)) from exc
+        return state, allowed, now
+
+    def hit_sliding_window(self, key, limit, window):
+        (_, current, previous), allowed, now = self.update(
+            key, lambda state, now: sliding_window(state, limit, window, now), window * 2
+        )
+        return sliding_window_result(allowed, current, previous, limit, window, now)
+
+    def hit_token_bucket(self, key, capacity, refill, window):
+        (tokens, _), allowed, _ = self.update(
+            key, lambda state, now: token_bucket(state, capacity, refill, now), math.ceil(capacity / refill) + 1
+        )
+        return token_bucket_result(allowed, tokens, capacity, refill, window)
+
+
+_backends = {}
+
+
+@receiver(setting_changed)
+def reset_rate_limit_backends(setting, **kwargs):
+    if setting.startswith('RATE_LIMIT_'):
+        _backends.clear()
+
+
+def get_local_backend():
+    if 'local' not in _backends:
+        _backends['local'] = SQLiteRateLimitBackend(settings.RATE_LIMIT_SQLITE_PATH)
+    return _backends['local']
+
+
+def get_rate_limit_backend():
+    """Process-wide backend: Redis when configured, else the local SQLite store"""
+    if not settings.RATE_LIMIT_REDIS_URL:
+        return get_local_backend()
+    if 'redis' not in _backends:
+        _backends['redis'] = RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return _backends['redis']
+
+
+def hit(scope, identity):
+    """Record one request by ``identity`` against ``settings.RATE_LIMITS[scope]``"""
+    config = settings.RATE_LIMITS[scope]
+    limit, window = parse_rate(config['rate'])
+    key = f'rl:{scope}:{identity}'
+    algorithm = config.get('algorithm', 'sliding_window')
+
+    def apply(backend):
+        if algorithm == 'token_bucket':
+            return backend.hit_token_bucket(key, config.get('burst', limit), limit / window, window)
+        return backend.hit_sliding_window(key, limit, window)
+
+    backend = get_rate_limit_backend()
+    try:
+        return apply(backend)
+    except RateLimitUnavailable as exc:
+        local = get_local_backend()
+        if backend is local:
+            raise
+        # Per-host limits until the shared store is back
+        logger.warning(f"Rate limit store unavailable ({exc}), using the local store")
+        return apply(local)
@@ -0,0 +1,161 @@
+"""
+Primary/replica database routing for read-only API requests.
+
+``ReplicaRoutingMixin`` decides once per request: safe requests to the
+actions a view lists in ``replica_actions`` read from one healthy replica
+(``DATABASE_REPLICAS``), unless the user wrote something within the last
+``REPLICA_PIN_SECONDS``, in which case they read from the primary so their
+own writes are visible. Everything else (writes, other actions, Celery
+tasks, management commands) uses ``default``.
+
+Replicas are probed at most every ``REPLICA_HEALTH_CHECK_INTERVAL`` seconds
+per process. One that fails the probe, lags more than ``REPLICA_MAX_LAG``
+seconds or errors during a request is ejected for ``REPLICA_EJECT_SECONDS``.
+"""
+import contextvars
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, InterfaceError, OperationalError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+PIN_KEY = 'dbpin:{}'
+
+# Replica alias serving the current request's reads, if any
+_replica = contextvars.ContextVar('replica', default=None)
+
+# Per-process health state: alias -> monotonic time
+_checked_at = {}
+_ejected_until = {}
+
+
+class ReplicaRouter:
+    """Sends reads to the replica chosen for the current request; all writes go to ``default``"""
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+
+def replication_lag(connection):
+    """Seconds the replica is behind the primary, or None where the backend cannot tell"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+            lag = cursor.fetchone()[0]
+            return float(lag) if lag is not None else None
+        cursor.execute('SELECT 1')
+    return None
+
+
+def eject_replica(alias, reason):
+    _ejected_until[alias] = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+    logger.warning(f"Replica {alias} ejected for {settings.REPLICA_EJECT_SECONDS}s: {reason}")
+
+
+def replica_is_healthy(alias):
+    now = time.monotonic()
+    if _ejected_until.get(alias, 0) > now:
+        return False
+    checked_at = _checked_at.get(alias)
+    if checked_at is not None and now - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        return True
+
+    _checked_at[alias] = now
+    try:
+        lag = replication_lag(connections[alias])
+    except DatabaseError as exc:
+        eject_replica(alias, exc)
+        return False
+    if lag is not None and lag > settings.REPLICA_MAX_LAG:
+        eject_replica(alias, f'{lag:.1f}s behind')
+        return False
+    return True
+
+
+def reset_replica_health():
+    _checked_at.clear()
+    _ejected_until.clear()
+
+
+def choose_replica():
+    """A random healthy replica, or None to read from the primary"""
+    healthy = [alias for alias in settings.DATABASE_REPLICAS if replica_is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+def pin_to_primary(user_id):
+    """Serve ``user_id``'s reads from the primary until replicas have caught up with their write"""
+    cache.set(PIN_KEY.format(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(PIN_KEY.format(user_id)) is not None
+
+
+class ReplicaRoutingMixin:
+    """Routes ``replica_actions`` reads to a replica and pins users to the primary after writes"""
+    replica_actions = ('list', 'retrieve')
+
+    def dispatch(self, request, *args, **kwargs):
+        self.replica_token = None
+        self.replica_failed = False
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except (OperationalError, InterfaceError) as exc:
+            alias = _replica.get()
+            if alias is None:
+                raise
+            eject_replica(alias, exc)
+            self.release_replica()
+            # Once more on the primary
+            self.replica_failed = True
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            self.release_replica()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            alias = choose_replica()
+            if alias is not None:
+                self.replica_token = _replica.set(alias)
+
+    def release_replica(self):
+        if self.replica_token is not None:
+            _replica.reset(self.replica_token)
+            self.replica_token = None
+
+    def reads_from_replica(self, request):
+        if not settings.DATABASE_REPLICAS or self.replica_failed:
+            return False
+        if request.method not in SAFE_METHODS or self.action not in self.replica_actions:
+            return False
+        user = request.user
+        return not (user and user.is_authenticated and is_pinned(user.pk))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user.pk)
+        return response
@@ -0,0 +1,3 @@
+from .backends import SearchUnavailable, get_database_search_backend, get_search_backend
+
+__all__ = ['SearchUnavailable', 'get_database_search_backend', 'get_search_backend']
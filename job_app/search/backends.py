@@ -0,0 +1,179 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'job_app_job_fts'
+
+
+def chunked(ids, size=500):
+    """Split ids into lists small enough for SQLite's bound-parameter limit"""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class SearchUnavailable(Exception):
+    """Raised by a backend whose engine cannot currently serve queries"""
+
+
+class BaseSearchBackend:
+    """
+    Interface for job full-text search engines.
+
+    ``search`` narrows a Job queryset to the matching rows, annotates each
+    with ``search_rank`` (higher is better) and orders by it, so the caller
+    can keep applying filters and slicing. ``update``/``remove`` keep the
+    index in step with Job writes.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def update(self, job_ids):
+        pass
+
+    def remove(self, job_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def terms(self, query):
+        return re.findall(r'\w+', query.lower())
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 virtual table keyed by job id, ranked with bm25"""
+    # bm25 column weights for (title, description, location, company_name)
+    weights = (10.0, 1.0, 3.0, 5.0)
+
+    def match_expression(self, query):
+        return ' '.join(f'"{term}"*' for term in self.terms(query))
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset.none()
+        weights = ', '.join(str(w) for w in self.weights)
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = job_app_job.id",
+            [expression],
+            output_field=FloatField(),
+        )
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+        return (
+            queryset.filter(pk__in=matches)
+            .annotate(search_rank=rank)
+            .order_by('-search_rank', '-created_at')
+        )
+
+    def update(self, job_ids):
+        for chunk in chunked(job_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, description, location, company_name) "
+                    f"SELECT j.id, j.title, j.description, j.location, c.name "
+                    f"FROM job_app_job j JOIN job_app_company c ON c.id = j.company_id "
+                    f"WHERE j.id IN ({placeholders})",
+                    chunk,
+                )
+
+    def remove(self, job_ids):
+        for chunk in chunked(job_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, location, company_name) "
+                f"SELECT j.id, j.title, j.description, j.location, c.name "
+                f"FROM job_app_job j JOIN job_app_company c ON c.id = j.company_id"
+            )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Weighted tsvector column on job_app_job with a GIN index, ranked with ts_rank"""
+    config = 'english'
+    vector_sql = (
+        "setweight(to_tsvector('{config}', coalesce(j.title, '')), 'A') || "
+        "setweight(to_tsvector('{config}', coalesce(c.name, '')), 'B') || "
+        "setweight(to_tsvector('{config}', coalesce(j.location, '')), 'B') || "
+        "setweight(to_tsvector('{config}', coalesce(j.description, '')), 'C')"
+    )
+
+    def search(self, queryset, query):
+        if not self.terms(query):
+            return queryset.none()
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        rank = RawSQL(
+            f"ts_rank(job_app_job.search_vector, {tsquery})", [query], output_field=FloatField()
+        )
+        matches = RawSQL(f"SELECT id FROM job_app_job WHERE search_vector @@ {tsquery}", [query])
+        return (
+            queryset.filter(pk__in=matches)
+            .annotate(search_rank=rank)
+            .order_by('-search_rank', '-created_at')
+        )
+
+    def update_sql(self):
+        return (
+            f"UPDATE job_app_job AS j SET search_vector = {self.vector_sql.format(config=self.config)} "
+            f"FROM job_app_company AS c WHERE c.id = j.company_id"
+        )
+
+    def update(self, job_ids):
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(self.update_sql() + " AND j.id = ANY(%s)", [job_ids])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(self.update_sql())
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Unindexed icontains fallback for databases without a native engine"""
+    fields = ('title', 'description', 'location', 'company__name')
+
+    def search(self, queryset, query):
+        terms = self.terms(query)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                reduce(or_, (Q(**{f'{field}__icontains': term}) for field in self.fields))
+            )
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_database_search_backend():
+    """Return the database's native engine; also the fallback for external engines"""
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
+
+
+def get_search_backend():
+    """Return the configured search backend, defaulting to the database's native engine"""
+    path = getattr(settings, 'JOB_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return get_database_search_backend()
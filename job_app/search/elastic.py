@@ -0,0 +1,250 @@
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import Case, FloatField, Value, When
+from django.dispatch import receiver
+from django.utils import timezone
+from elastic_transport import TransportError
+from elasticsearch import ApiError, Elasticsearch, NotFoundError
+
+from ..models import Job, SearchIndexState
+from .backends import BaseSearchBackend, SearchUnavailable
+
+logger = logging.getLogger(__name__)
+
+JOB_MAPPINGS = {
+    'properties': {
+        'id': {'type': 'long'},
+        'title': {'type': 'text', 'analyzer': 'english'},
+        'description': {'type': 'text', 'analyzer': 'english'},
+        'location': {'type': 'text', 'fields': {'raw': {'type': 'keyword'}}},
+        'job_type': {'type': 'keyword'},
+        'job_type_display': {'type': 'keyword'},
+        'salary': {'type': 'scaled_float', 'scaling_factor': 100},
+        'company_id': {'type': 'long'},
+        'company_name': {'type': 'text', 'fields': {'raw': {'type': 'keyword'}}},
+        'created_at': {'type': 'date'},
+        'updated_at': {'type': 'date'},
+    }
+}
+
+SEARCH_FIELDS = ['title^3', 'company_name^2', 'location^2', 'description']
+
+
+def job_document(job):
+    """Flatten a Job (with its company loaded) into an index document"""
+    return {
+        'id': job.pk,
+        'title': job.title,
+        'description': job.description,
+        'location': job.location,
+        'job_type': job.job_type,
+        'job_type_display': job.get_job_type_display(),
+        'salary': float(job.salary),
+        'company_id': job.company_id,
+        'company_name': job.company.name,
+        'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat(),
+    }
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class JobIndex:
+    """
+    Mirror of active jobs in Elasticsearch, written with _bulk requests.
+
+    ``name`` is an alias. A full reindex builds a fresh timestamped index
+    and then swaps the alias onto it in one request, so searches keep
+    hitting the old index until the new one is complete.
+    """
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def aliased_indices(self):
+        """Concrete indices currently behind the alias"""
+        if not self.client.indices.exists_alias(name=self.name):
+            return []
+        return list(self.client.indices.get_alias(name=self.name))
+
+    def create_index(self, alias=False):
+        index = f"{self.name}-{timezone.now():%Y%m%d%H%M%S%f}"
+        aliases = {self.name: {}} if alias else None
+        self.client.indices.create(index=index, mappings=JOB_MAPPINGS, aliases=aliases)
+        return index
+
+    def ensure_index(self):
+        if not self.client.indices.exists(index=self.name):
+            self.create_index(alias=True)
+
+    def swap_alias(self, index):
+        """Point the alias at ``index`` atomically and drop the indices it replaced"""
+        old = self.aliased_indices()
+        actions = [{'remove': {'index': name, 'alias': self.name}} for name in old]
+        if not old and self.client.indices.exists(index=self.name):
+            # An index created before the alias existed holds the name itself
+            actions.append({'remove_index': {'index': self.name}})
+        actions.append({'add': {'index': index, 'alias': self.name}})
+        self.client.indices.update_aliases(actions=actions)
+        for name in old:
+            self.client.indices.delete(index=name, ignore_unavailable=True)
+
+    def bulk(self, operations):
+        if not operations:
+            return
+        response = self.client.bulk(operations=operations)
+        if response.get('errors'):
+            failed = [
+                item for entry in response['items'] for item in entry.values()
+                if item.get('error') and not (item.get('status') == 404 and 'delete' in entry)
+            ]
+            if failed:
+                raise SearchUnavailable(f"{len(failed)} bulk operations failed, first: {failed[0]['error']}")
+
+    def bulk_index(self, jobs, index=None):
+        operations = []
+        for job in jobs:
+            operations.append({'index': {'_index': index or self.name, '_id': job.pk}})
+            operations.append(job_document(job))
+        self.bulk(operations)
+        return len(operations) // 2
+
+    def bulk_delete(self, job_ids):
+        operations = [{'delete': {'_index': self.name, '_id': job_id}} for job_id in job_ids]
+        self.bulk(operations)
+        return len(operations)
+
+    def write(self, jobs):
+        """Index the active jobs in ``jobs`` and delete the inactive ones"""
+        indexed = self.bulk_index(job for job in jobs if job.is_active)
+        deleted = self.bulk_delete(job.pk for job in jobs if not job.is_active)
+        return indexed, deleted
+
+    def reindex(self, batch_size=1000):
+        """
+        Rebuild into a new index, streaming active jobs in batches, then swap
+        the alias onto it. Changes made meanwhile go to the old index and are
+        picked up by the next sync, which starts from this run's start time.
+        """
+        started = timezone.now()
+        index = self.create_index()
+        jobs = Job.objects.filter(is_active=True).select_related('company').order_by('pk')
+        indexed = 0
+        try:
+            for batch in batched(jobs.iterator(chunk_size=batch_size), batch_size):
+                indexed += self.bulk_index(batch, index=index)
+        except Exception:
+            self.client.indices.delete(index=index, ignore_unavailable=True)
+            raise
+        self.swap_alias(index)
+        self.set_watermark(started)
+        return indexed, 0
+
+    def sync(self, batch_size=1000):
+        """Push jobs changed since the stored updated_at watermark"""
+        state = SearchIndexState.objects.filter(index_name=self.name).first()
+        if state is None or state.synced_until is None:
+            return self.reindex(batch_size=batch_size)
+
+        started = timezone.now()
+        since = state.synced_until - timedelta(seconds=settings.ELASTICSEARCH_SYNC_OVERLAP)
+        self.ensure_index()
+        jobs = (
+            Job.objects.filter(updated_at__gte=since)
+            .select_related('company')
+            .order_by('updated_at', 'pk')
+        )
+        indexed = deleted = 0
+        for batch in batched(jobs.iterator(chunk_size=batch_size), batch_size):
+            batch_indexed, batch_deleted = self.write(batch)
+            indexed += batch_indexed
+            deleted += batch_deleted
+        self.set_watermark(started)
+        return indexed, deleted
+
+    def set_watermark(self, value):
+        SearchIndexState.objects.update_or_create(
+            index_name=self.name, defaults={'synced_until': value}
+        )
+
+    def search(self, query, limit):
+        """Return [(job_id, score)] best match first"""
+        response = self.client.search(
+            index=self.name,
+            query={
+                'multi_match': {
+                    'query': query,
+                    'fields': SEARCH_FIELDS,
+                    'type': 'best_fields',
+                    'fuzziness': 'AUTO',
+                }
+            },
+            source=False,
+            size=limit,
+        )
+        return [(int(hit['_id']), hit['_score']) for hit in response['hits']['hits']]
+
+
+_job_index = None
+
+
+@receiver(setting_changed)
+def reset_job_index(setting, **kwargs):
+    global _job_index
+    if setting.startswith('ELASTICSEARCH_'):
+        _job_index = None
+
+
+def get_job_index():
+    """Process-wide JobIndex so the client's connection pool is reused"""
+    global _job_index
+    if not settings.ELASTICSEARCH_URL:
+        raise SearchUnavailable('ELASTICSEARCH_URL is not configured')
+    if _job_index is None:
+        client = Elasticsearch(settings.ELASTICSEARCH_URL, **settings.ELASTICSEARCH_CLIENT_OPTIONS)
+        _job_index = JobIndex(client, settings.ELASTICSEARCH_JOB_INDEX)
+    return _job_index
+
+
+class ElasticsearchSearchBackend(BaseSearchBackend):
+    """
+    Ranks jobs in Elasticsearch, then narrows the database queryset to the hits.
+
+    Writes are not pushed per save; the index is kept current by the
+    watermark sync (reindex_jobs --incremental / sync_job_search_index).
+    Deleted jobs leave no row for the sync to find, so their documents are
+    removed by remove_jobs_from_search_index, enqueued on delete.
+    """
+
+    def search(self, queryset, query):
+        if not self.terms(query):
+            return queryset.none()
+        try:
+            hits = get_job_index().search(query, settings.ELASTICSEARCH_MAX_RESULTS)
+        except NotFoundError:
+            raise SearchUnavailable(f"Index {settings.ELASTICSEARCH_JOB_INDEX} does not exist")
+        except (ApiError, TransportError) as exc:
+            logger.warning(f"Elasticsearch search failed: {exc}")
+            raise SearchUnavailable(str(exc)) from exc
+
+        if not hits:
+            return queryset.none()
+        rank = Case(
+            *(When(pk=job_id, then=Value(score)) for job_id, score in hits),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(pk__in=[job_id for job_id, _ in hits])
+            .annotate(search_rank=rank)
+            .order_by('-search_rank', '-created_at')
+        )
@@ -0,0 +1,262 @@
+"""
+Bulk seeding shared by the seed_* management commands.
+
+Rows are generated as plain dicts in batches. Each batch draws from its
+own RNG derived from ``--seed`` and the batch number, so output is the
+same whatever the number of workers. Generators only use the standard
+library and Faker (no ORM access), so they can run in worker processes
+while the parent inserts with ``bulk_create``.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from faker import Faker
+
+TECH_SKILLS = [
+    'Python', 'Django', 'JavaScript', 'React', 'AWS',
+    'Docker', 'PostgreSQL', 'Machine Learning', 'DevOps',
+]
+CANDIDATE_SKILLS = TECH_SKILLS + ['Flask', 'FastAPI', 'Vue.js', 'Angular', 'Node.js']
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Manufacturing", "Retail", "Education"]
+JOB_TYPES = ['FT', 'PT', 'INT', 'CON', 'REM']
+APPLICATION_STATUSES = ['APP', 'REV', 'INT', 'OFF', 'REJ']
+APPLICATION_STATUS_WEIGHTS = [40, 30, 15, 5, 10]
+
+# Faker text is the slow part of generation; each batch draws from a small pool
+TEXT_POOL_SIZE = 32
+
+# Jobs are posted over the days before the run, and applied to within a month of posting
+POSTED_WITHIN_DAYS = 90
+APPLIED_WITHIN_DAYS = 30
+
+_context = None
+
+
+def set_context(context):
+    global _context
+    _context = context
+
+
+def run_batch(generator, seed, number, start, size):
+    rng = random.Random(f'{seed}:{number}')
+    fake = Faker()
+    fake.seed_instance(f'{seed}:{number}')
+    return generator(rng, fake, start, size, _context)
+
+
+def company_rows(rng, fake, start, size, context):
+    rows = []
+    for index in range(start, start + size):
+        industry = rng.choice(INDUSTRIES)
+        rows.append({
+            'name': fake.unique.company(),
+            'description': (
+                f"{fake.catch_phrase()}. "
+                f"Specializing in {industry.lower()} solutions with offices in "
+                f"{fake.city()}, {fake.country()}. "
+                f"{fake.paragraph()}"
+            ),
+            'website': f"https://{fake.domain_name()}",
+            'logo': f"company_logos/logo_{index}.png" if rng.random() < 0.5 else None,
+        })
+    return rows
+
+
+def user_rows(rng, fake, start, size, context):
+    company_ids = context['company_ids']
+    paragraphs = [fake.paragraph() for _ in range(TEXT_POOL_SIZE)]
+    rows = []
+    for index in range(start, start + size):
+        first_name = fake.first_name()
+        last_name = fake.last_name()
+        email = f"{first_name.lower()}.{last_name.lower()}.{context['offset'] + index}@example.com"
+        row = {
+            'username': email,
+            'email': email,
+            'password': context['password'],
+            'first_name': first_name,
+            'last_name': last_name,
+            'user_type': context['user_type'],
+            'company_id': None,
+            'phone': '',
+        }
+        if context['user_type'] == 'employer':
+            row['company_id'] = company_ids[index % len(company_ids)]
+        else:
+            row['phone'] = fake.phone_number()[:15]
+            if rng.random() < context['resume_ratio']:
+                row['resume'] = (
+                    f"resumes/resume_{context['offset'] + index}.txt",
+                    f"{first_name} {last_name}\n{email} | {row['phone']}\n\n"
+                    f"SUMMARY\n{rng.choice(paragraphs)}\n\n"
+                    f"SKILLS\n{', '.join(rng.sample(CANDIDATE_SKILLS, rng.randint(3, 6)))}\n\n"
+                    f"EXPERIENCE\n{fake.job()} at {fake.company()}\n- {fake.sentence()}\n",
+                )
+        rows.append(row)
+    return rows
+
+
+def job_title(rng):
+    levels = ['Junior', 'Mid-level', 'Senior', 'Lead', 'Principal']
+    specialties = ['Backend', 'Frontend', 'Full Stack', 'DevOps', 'Data']
+    return f"{rng.choice(levels)} {rng.choice(specialties)} Developer"
+
+
+def job_base_salary(job_type, title):
+    """Return appropriate base salary based on role"""
+    level_multiplier = 1.0
+    if 'Junior' in title:
+        level_multiplier = 0.7
+    elif 'Senior' in title or 'Lead' in title or 'Principal' in title:
+        level_multiplier = 1.5
+
+    type_multiplier = {
+        'FT': 1.0,
+        'PT': 0.6,
+        'INT': 0.4,
+        'CON': 1.2,
+        'REM': 1.1
+    }.get(job_type, 1.0)
+
+    return 50000 * level_multiplier * type_multiplier
+
+
+def job_rows(rng, fake, start, size, context):
+    companies = context['companies']
+    employer_ids = context['employer_ids']
+    paragraphs = [fake.paragraph() for _ in range(TEXT_POOL_SIZE)]
+    cities = [fake.city() for _ in range(TEXT_POOL_SIZE)]
+    rows = []
+    for _ in range(size):
+        company_id, company_name = rng.choice(companies)
+        job_type = rng.choice(JOB_TYPES)
+        title = job_title(rng)
+        base_salary = job_base_salary(job_type, title)
+        requirements = "\n".join(
+            f"- {rng.choice(TECH_SKILLS)} experience" for _ in range(rng.randint(3, 6))
+        )
+        rows.append({
+            'title': title,
+            'job_type': job_type,
+            'description': (
+                f"## About the Role\n{rng.choice(paragraphs)}\n\n"
+                f"## Requirements\n{requirements}\n\n"
+                f"## Benefits\n{rng.choice(paragraphs)}"
+            ),
+            'location': "Remote" if job_type == 'REM' else f"{company_name.split()[0]} {rng.choice(cities)}",
+            'salary': Decimal(rng.randint(int(base_salary * 0.9), int(base_salary * 1.1))),
+            'company_id': company_id,
+            'posted_by_id': rng.choice(employer_ids),
+            'is_active': rng.random() < 0.8,
+            'created_at': context['now'] - timedelta(seconds=rng.uniform(0, POSTED_WITHIN_DAYS * 86400)),
+        })
+    return rows
+
+
+def application_rows(rng, fake, start, size, context):
+    jobs = context['jobs']
+    candidates = context['candidates']
+    paragraphs = [fake.paragraph() for _ in range(TEXT_POOL_SIZE)]
+    seen = set()
+    rows = []
+    # Bounded retries: duplicates and same-company pairs are skipped, not replaced forever
+    for _ in range(size * 2):
+        if len(rows) == size:
+            break
+        job_id, job_company_id, posted_at = rng.choice(jobs)
+        candidate_id, candidate_company_id = rng.choice(candidates)
+        if (job_id, candidate_id) in seen or job_company_id == candidate_company_id:
+            continue
+        seen.add((job_id, candidate_id))
+        rows.append({
+            'job_id': job_id,
+            'candidate_id': candidate_id,
+            'cover_letter': (
+                "Dear Hiring Manager,\n\n"
+                f"I'm excited to apply for this position.\n{rng.choice(paragraphs)}\n\n"
+                f"My skills in {rng.choice(['Python', 'Django', 'JavaScript', 'React'])} "
+                f"align well with your requirements.\n{rng.choice(paragraphs)}\n\nSincerely"
+            ),
+            'status': rng.choices(APPLICATION_STATUSES, weights=APPLICATION_STATUS_WEIGHTS)[0],
+            'applied_at': posted_at + timedelta(seconds=rng.uniform(
+                0, min(APPLIED_WITHIN_DAYS * 86400, (context['now'] - posted_at).total_seconds())
+            )),
+        })
+    return rows
+
+
+@contextmanager
+def generated_timestamps(model, names):
+    """Let bulk_create keep the generated values of ``auto_now_add`` fields ``names``"""
+    fields = [model._meta.get_field(name) for name in names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class SeedCommand(BaseCommand):
+    """Base for seed commands: --count/--seed/--batch-size/--workers and batched bulk inserts"""
+    default_count = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=self.default_count, help='Rows to create')
+        parser.add_argument('--seed', help='Seed for reproducible data (random when omitted)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT batch')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Processes generating rows in parallel with the inserts',
+        )
+
+    def generate(self, generator, count, options, context=None, attempt=0):
+        """Yield lists of row dicts, ``--batch-size`` rows at a time; each ``attempt`` draws different rows"""
+        seed = options['seed'] if options['seed'] is not None else random.SystemRandom().getrandbits(64)
+        if attempt:
+            seed = f'{seed}:{attempt}'
+        batch_size = max(options['batch_size'], 1)
+        batches = [
+            (generator, seed, number, start, min(batch_size, count - start))
+            for number, start in enumerate(range(0, count, batch_size))
+        ]
+        if options['workers'] <= 1 or len(batches) <= 1:
+            set_context(context)
+            for batch in batches:
+                yield run_batch(*batch)
+            return
+
+        # Worker processes must not inherit open database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=set_context, initargs=(context,)
+        ) as executor:
+            yield from executor.map(run_batch, *zip(*batches))
+
+    def insert(self, model, batches, ignore_conflicts=False, prepare=None, timestamps=()):
+        """bulk_create each batch in its own transaction, returning the number of rows sent
+
+        ``timestamps`` names ``auto_now_add`` fields whose generated values are kept.
+        """
+        total = 0
+        for rows in batches:
+            if prepare is not None:
+                rows = [prepare(row) for row in rows]
+            with transaction.atomic(), generated_timestamps(model, timestamps):
+                model.objects.bulk_create(
+                    [model(**row) for row in rows], ignore_conflicts=ignore_conflicts
+                )
+            total += len(rows)
+            if self.verbosity > 1:
+                self.stdout.write(f"{total} {model._meta.verbose_name_plural} inserted")
+        return total
+
+    def execute(self, *args, **options):
+        self.verbosity = options.get('verbosity', 1)
+        return super().execute(*args, **options)
@@ -1,5 +1,10 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import TOKEN_VERSION_CLAIM, add_token_claims
 from .models import User, Company, Job, Application
 
 # User Serializers
@@ -44,13 +49,47 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'first_name', 'last_name', 'phone', 'user_type']
         read_only_fields = ['id', 'email', 'user_type']
 
+# Token Serializers
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair carrying the authorization claims read by ClaimsJWTAuthentication"""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_token_claims(super().get_token(user), user)
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses revoked refresh tokens and re-stamps the claims from the current user row"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM), is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        if refresh.get(TOKEN_VERSION_CLAIM, user.token_version) != user.token_version:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        add_token_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
+
 # Company Serializers
 class CompanySerializer(serializers.ModelSerializer):
-    jobs_count = serializers.IntegerField(source='jobs.count', read_only=True)
+    # Annotated by Company.objects.with_stats()
+    jobs_count = serializers.IntegerField(read_only=True)
+    active_jobs_count = serializers.IntegerField(read_only=True)
+    open_applications_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Company
-        fields = ['id', 'name', 'description', 'website', 'logo', 'jobs_count']
+        fields = [
+            'id', 'name', 'description', 'website', 'logo',
+            'jobs_count', 'active_jobs_count', 'open_applications_count',
+        ]
         read_only_fields = ['id']
 
     def validate_name(self, value):
@@ -79,7 +118,7 @@ class JobListSerializer(serializers.ModelSerializer):
     company = CompanyDetailSerializer(read_only=True)
     posted_by = EmployerDetailSerializer(read_only=True)
     job_type_display = serializers.CharField(source='get_job_type_display', read_only=True)
-    applications_count = serializers.IntegerField(source='applications.count', read_only=True)
+    applications_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Job
@@ -98,6 +137,26 @@ class JobDetailSerializer(JobListSerializer):
         ]
         read_only_fields = JobListSerializer.Meta.read_only_fields + ['updated_at']
 
+class JobCompactSerializer(serializers.ModelSerializer):
+    """Flat job row; company and posted_by are ids into side-loaded maps"""
+    job_type_display = serializers.CharField(source='get_job_type_display', read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'title', 'job_type', 'job_type_display',
+            'location', 'salary', 'company', 'posted_by',
+            'applications_count', 'is_active', 'created_at'
+        ]
+        read_only_fields = fields
+
+class CompanyCompactSerializer(serializers.ModelSerializer):
+    """Company entry side-loaded alongside compact job lists"""
+    class Meta:
+        model = Company
+        fields = ['id', 'name', 'website', 'logo']
+        read_only_fields = fields
+
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating jobs (without nested objects)"""
     class Meta:
@@ -166,4 +225,40 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         instance = self.instance
         if instance and instance.status == 'REJ' and value != 'REJ':
             raise serializers.ValidationError("Cannot change status of rejected application.")
-        return value
\ No newline at end of file
+        return value
+
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """Target status plus either explicit application ids or a filter"""
+    FILTER_FIELDS = ('status', 'job', 'candidate')
+
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+        max_length=settings.BULK_STATUS_UPDATE_MAX,
+    )
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate_filter(self, value):
+        unknown = set(value) - set(self.FILTER_FIELDS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unsupported filter fields: {', '.join(sorted(unknown))}. Use {', '.join(self.FILTER_FIELDS)}."
+            )
+        fields = {
+            'status': serializers.ChoiceField(choices=Application.STATUS_CHOICES),
+            'job': serializers.IntegerField(min_value=1),
+            'candidate': serializers.IntegerField(min_value=1),
+        }
+        lookups = {}
+        for name, raw in value.items():
+            try:
+                parsed = fields[name].run_validation(raw)
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({name: exc.detail})
+            lookups[name if name == 'status' else f'{name}_id'] = parsed
+        return lookups
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide either 'ids' or 'filter'.")
+        return attrs
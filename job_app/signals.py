@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import outbox
+from .authentication import forget_token_version, revoke_tokens
+from .caching import invalidate_model
+from .models import Application, Company, Job, User
+from .search import get_database_search_backend
+
+
+@receiver(post_delete, sender=Application)
+def decrement_applications_count(sender, instance, origin=None, **kwargs):
+    """Keep Job.applications_count in step when applications are removed.
+
+    post_delete runs inside the deletion's transaction, for both
+    instance.delete() and queryset.delete(). Cascades from a job being
+    deleted are skipped since the counter row is going away too.
+    """
+    if isinstance(origin, Job) or (isinstance(origin, QuerySet) and origin.model is Job):
+        return
+    Job.objects.filter(pk=instance.job_id, applications_count__gt=0).update(
+        applications_count=F('applications_count') - 1
+    )
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    """Refresh the job's full-text search entry"""
+    get_database_search_backend().update([instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    get_database_search_backend().remove([instance.pk])
+    if settings.ELASTICSEARCH_URL:
+        from .tasks import remove_jobs_from_search_index
+
+        outbox.enqueue(remove_jobs_from_search_index, [instance.pk])
+
+
+@receiver(pre_save, sender=Company)
+def remember_company_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and 'name' not in update_fields):
+        return
+    instance._saved_name = Company.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, **kwargs):
+    """Company names are part of each job's search document; other edits leave it alone"""
+    saved_name = instance.__dict__.pop('_saved_name', None)
+    if saved_name is None or saved_name == instance.name:
+        return
+    job_ids = list(instance.jobs.values_list('pk', flat=True))
+    get_database_search_backend().update(job_ids)
+    # Brings the jobs past the Elasticsearch sync watermark
+    Job.objects.filter(pk__in=job_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate_model(sender.__name__)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_employer(sender, instance, update_fields=None, **kwargs):
+    """Employer names are nested in job listings; logins only touch last_login"""
+    if instance.user_type != 'employer' or update_fields == frozenset({'last_login'}):
+        return
+    invalidate_model('User')
+
+
+# User fields deciding whether and as whom a token authenticates (see add_token_claims)
+TOKEN_FIELDS = ('is_active', 'user_type', 'is_staff', 'company')
+
+
+@receiver(pre_save, sender=User)
+def remember_token_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and update_fields.isdisjoint(TOKEN_FIELDS)):
+        return
+    attnames = [User._meta.get_field(name).attname for name in TOKEN_FIELDS]
+    instance._saved_token_fields = User.objects.filter(pk=instance.pk).values(*attnames).first()
+
+
+@receiver(post_save, sender=User)
+def revoke_outdated_tokens(sender, instance, **kwargs):
+    """Deactivation, or a change to what the token claims, revokes the user's tokens"""
+    saved = instance.__dict__.pop('_saved_token_fields', None)
+    if saved is not None and any(getattr(instance, field) != value for field, value in saved.items()):
+        revoke_tokens(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user_tokens(sender, instance, **kwargs):
+    forget_token_version(instance.pk)
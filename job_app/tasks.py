@@ -1,9 +1,10 @@
-from celery import shared_task
+from celery import chain, chord, shared_task
 from django.core.mail import send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from .mail import batched_delivery, flush_queued_messages, send_message
 from .models import Application, Job
 import logging
 
@@ -12,6 +13,123 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+def build_application_confirmation_email(application):
+    """Confirmation email to the candidate after a successful application"""
+    candidate = application.candidate
+    job = application.job
+    company = job.company
+    
+    # Email subject
+    subject = f"Application Confirmation - {job.title} at {company.name}"
+    
+    # Email context
+    context = {
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
+        'job_title': job.title,
+        'company_name': company.name,
+        'company_website': company.website,
+        'job_location': job.location,
+        'job_type': job.get_job_type_display(),
+        'salary': job.salary,
+        'application_date': application.applied_at.strftime('%B %d, %Y'),
+        'application_status': application.get_status_display(),
+    }
+    
+    # Render HTML email
+    html_message = render_to_string('emails/application_confirmation.html', context)
+    plain_message = strip_tags(html_message)
+    
+    # Build email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=plain_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[candidate.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def build_application_status_update_email(application, old_status, new_status):
+    """Email to the candidate when their application status changes"""
+    candidate = application.candidate
+    job = application.job
+    company = job.company
+    
+    # Email subject based on status
+    status_subjects = {
+        'REV': f"Your application is under review - {job.title} at {company.name}",
+        'INT': f"Interview invitation - {job.title} at {company.name}",
+        'OFF': f"Job offer - {job.title} at {company.name}",
+        'REJ': f"Application update - {job.title} at {company.name}",
+    }
+    
+    subject = status_subjects.get(new_status, f"Application update - {job.title} at {company.name}")
+    
+    # Email context
+    context = {
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
+        'job_title': job.title,
+        'company_name': company.name,
+        'company_website': company.website,
+        'old_status': dict(Application.STATUS_CHOICES).get(old_status, old_status),
+        'new_status': dict(Application.STATUS_CHOICES).get(new_status, new_status),
+        'status_code': new_status,
+        'application_date': application.applied_at.strftime('%B %d, %Y'),
+    }
+    
+    # Render HTML email
+    html_message = render_to_string('emails/application_status_update.html', context)
+    plain_message = strip_tags(html_message)
+    
+    # Build email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=plain_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[candidate.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def build_new_application_notification_email(application):
+    """Email to the employer when a new application is received"""
+    employer = application.job.posted_by
+    candidate = application.candidate
+    job = application.job
+    company = job.company
+    
+    # Email subject
+    subject = f"New Application Received - {job.title}"
+    
+    # Email context
+    context = {
+        'employer_name': f"{employer.first_name} {employer.last_name}".strip() or employer.email,
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
+        'candidate_email': candidate.email,
+        'job_title': job.title,
+        'company_name': company.name,
+        'application_date': application.applied_at.strftime('%B %d, %Y at %I:%M %p'),
+        'cover_letter': application.cover_letter,
+        'candidate_phone': candidate.phone,
+    }
+    
+    # Render HTML email
+    html_message = render_to_string('emails/new_application_notification.html', context)
+    plain_message = strip_tags(html_message)
+    
+    # Build email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=plain_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[employer.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
 @shared_task(bind=True, max_retries=settings.EMAIL_TASK_MAX_RETRIES)
 def send_application_confirmation_email(self, application_id):
     """
@@ -24,37 +142,7 @@ def send_application_confirmation_email(self, application_id):
         
         candidate = application.candidate
         job = application.job
-        company = job.company
-        
-        # Email subject
-        subject = f"Application Confirmation - {job.title} at {company.name}"
-        
-        # Email context
-        context = {
-            'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
-            'job_title': job.title,
-            'company_name': company.name,
-            'company_website': company.website,
-            'job_location': job.location,
-            'job_type': job.get_job_type_display(),
-            'salary': job.salary,
-            'application_date': application.applied_at.strftime('%B %d, %Y'),
-            'application_status': application.get_status_display(),
-        }
-        
-        # Render HTML email
-        html_message = render_to_string('emails/application_confirmation.html', context)
-        plain_message = strip_tags(html_message)
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[candidate.email],
-        )
-        email.attach_alternative(html_message, "text/html")
-        email.send()
+        send_message(build_application_confirmation_email(application))
         
         logger.info(f"Application confirmation email sent to {candidate.email} for job {job.title}")
         return f"Email sent successfully to {candidate.email}"
@@ -82,44 +170,7 @@ def send_application_status_update_email(self, application_id, old_status, new_s
         ).get(id=application_id)
         
         candidate = application.candidate
-        job = application.job
-        company = job.company
-        
-        # Email subject based on status
-        status_subjects = {
-            'REV': f"Your application is under review - {job.title} at {company.name}",
-            'INT': f"Interview invitation - {job.title} at {company.name}",
-            'OFF': f"Job offer - {job.title} at {company.name}",
-            'REJ': f"Application update - {job.title} at {company.name}",
-        }
-        
-        subject = status_subjects.get(new_status, f"Application update - {job.title} at {company.name}")
-        
-        # Email context
-        context = {
-            'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
-            'job_title': job.title,
-            'company_name': company.name,
-            'company_website': company.website,
-            'old_status': dict(Application.STATUS_CHOICES).get(old_status, old_status),
-            'new_status': dict(Application.STATUS_CHOICES).get(new_status, new_status),
-            'status_code': new_status,
-            'application_date': application.applied_at.strftime('%B %d, %Y'),
-        }
-        
-        # Render HTML email
-        html_message = render_to_string('emails/application_status_update.html', context)
-        plain_message = strip_tags(html_message)
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[candidate.email],
-        )
-        email.attach_alternative(html_message, "text/html")
-        email.send()
+        send_message(build_application_status_update_email(application, old_status, new_status))
         
         logger.info(f"Status update email sent to {candidate.email} for application {application_id}")
         return f"Status update email sent successfully to {candidate.email}"
@@ -147,38 +198,7 @@ def send_new_application_notification_to_employer(self, application_id):
         ).get(id=application_id)
         
         employer = application.job.posted_by
-        candidate = application.candidate
-        job = application.job
-        company = job.company
-        
-        # Email subject
-        subject = f"New Application Received - {job.title}"
-        
-        # Email context
-        context = {
-            'employer_name': f"{employer.first_name} {employer.last_name}".strip() or employer.email,
-            'candidate_name': f"{candidate.first_name} {candidate.last_name}".strip() or candidate.email,
-            'candidate_email': candidate.email,
-            'job_title': job.title,
-            'company_name': company.name,
-            'application_date': application.applied_at.strftime('%B %d, %Y at %I:%M %p'),
-            'cover_letter': application.cover_letter,
-            'candidate_phone': candidate.phone,
-        }
-        
-        # Render HTML email
-        html_message = render_to_string('emails/new_application_notification.html', context)
-        plain_message = strip_tags(html_message)
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[employer.email],
-        )
-        email.attach_alternative(html_message, "text/html")
-        email.send()
+        send_message(build_new_application_notification_email(application))
         
         logger.info(f"New application notification sent to employer {employer.email}")
         return f"Employer notification sent successfully to {employer.email}"
@@ -195,37 +215,201 @@ def send_new_application_notification_to_employer(self, application_id):
         )
 
 
-@shared_task
-def send_bulk_email_notifications(application_ids, email_type='confirmation'):
+BULK_EMAIL_BUILDERS = {
+    'confirmation': build_application_confirmation_email,
+    'employer_notification': build_new_application_notification_email,
+}
+
+
+def send_email_chunk(application_ids, email_type):
     """
-    Send bulk email notifications for multiple applications
+    Load one chunk of applications in a single query, render each email and
+    deliver the chunk as one batch over the pooled connection. Returns an
+    outcome per id.
     """
+    build = BULK_EMAIL_BUILDERS[email_type]
+    applications = Application.objects.select_related(
+        'job__company', 'job__posted_by', 'candidate'
+    ).in_bulk(application_ids)
+
     results = []
-    
-    for app_id in application_ids:
-        try:
-            if email_type == 'confirmation':
-                result = send_application_confirmation_email.delay(app_id)
-            elif email_type == 'employer_notification':
-                result = send_new_application_notification_to_employer.delay(app_id)
-            else:
+    queued = {}
+    with batched_delivery() as batch:
+        for app_id in application_ids:
+            application = applications.get(app_id)
+            if application is None:
+                results.append({'application_id': app_id, 'status': 'missing'})
                 continue
-                
-            results.append({
-                'application_id': app_id,
-                'task_id': result.id,
-                'status': 'queued'
-            })
-        except Exception as e:
-            results.append({
-                'application_id': app_id,
-                'error': str(e),
-                'status': 'failed'
-            })
-    
+            try:
+                message = build(application)
+            except Exception as e:
+                logger.error(f"Bulk {email_type} email failed for application {app_id}: {str(e)}")
+                results.append({'application_id': app_id, 'error': str(e), 'status': 'failed'})
+                continue
+            send_message(message)
+            queued[app_id] = message
+            results.append({'application_id': app_id, 'status': 'sent'})
+        flush_queued_messages()  # Now, even inside an enclosing batch, so the outcomes are known
+
+    failures = batch.failed_messages()
+    for result in results:
+        message = queued.get(result['application_id'])
+        if message is not None and id(message) in failures:
+            result.update(status='failed', error=str(failures[id(message)]))
+    return results
+
+
+@shared_task(bind=True)
+def send_bulk_email_chunk(self, application_ids, email_type, attempt=0):
+    """
+    Send one chunk of a bulk email run. Ids whose email failed are sent
+    again by a follow-up task with exponential backoff, up to
+    EMAIL_TASK_MAX_RETRIES times; the rest are not resent.
+    """
+    results = send_email_chunk(application_ids, email_type)
+    failed = [result['application_id'] for result in results if result['status'] == 'failed']
+    if failed and attempt < settings.EMAIL_TASK_MAX_RETRIES:
+        countdown = settings.EMAIL_TASK_RETRY_DELAY * (2 ** attempt)
+        send_bulk_email_chunk.apply_async(
+            args=[failed, email_type], kwargs={'attempt': attempt + 1}, countdown=countdown
+        )
+        logger.warning(f"Retrying {len(failed)} {email_type} emails in {countdown}s")
+        for result in results:
+            if result['status'] == 'failed':
+                result['status'] = 'retrying'
     return results
 
 
+@shared_task
+def send_next_bulk_email_chunk(results, application_ids, email_type):
+    """Chain step: send the next chunk of a lane and add its outcomes to the lane's so far"""
+    return results + send_bulk_email_chunk(application_ids, email_type)
+
+
+@shared_task
+def collect_bulk_email_results(lane_results, email_type):
+    """Chord callback of a bulk run: one outcome per id (sent, missing, retrying or failed)"""
+    results = [result for lane in lane_results for result in lane]
+    sent = sum(result['status'] == 'sent' for result in results)
+    logger.info(f"Bulk {email_type} emails: {sent}/{len(results)} sent")
+    return results
+
+
+def bulk_email_workflow(application_ids, email_type, chunk_size=None, concurrency=None):
+    """
+    Chord sending ``application_ids`` in chunks of ``chunk_size``.
+
+    Chunks are dealt round robin into ``concurrency`` lanes. Each lane is a
+    chain of chunk subtasks run one after another, so at most ``concurrency``
+    chunks of the run are in flight, and the callback gathers the outcomes
+    of every lane.
+    """
+    chunk_size = chunk_size or settings.EMAIL_BULK_CHUNK_SIZE
+    concurrency = concurrency or settings.EMAIL_BULK_CONCURRENCY
+    chunks = [application_ids[i:i + chunk_size] for i in range(0, len(application_ids), chunk_size)]
+    lanes = [
+        chain(
+            send_bulk_email_chunk.si(lane_chunks[0], email_type),
+            *(send_next_bulk_email_chunk.s(chunk, email_type) for chunk in lane_chunks[1:]),
+        )
+        for lane_chunks in (chunks[lane::concurrency] for lane in range(min(concurrency, len(chunks))))
+    ]
+    return chord(lanes, collect_bulk_email_results.s(email_type)), len(chunks)
+
+
+@shared_task
+def send_bulk_email_notifications(application_ids, email_type='confirmation', chunk_size=None, concurrency=None):
+    """
+    Send bulk email notifications for multiple applications
+
+    Ids are split into chunks of ``chunk_size``, each sent by its own
+    subtask (one query and one batched delivery per chunk) under its own
+    time limit, with up to ``concurrency`` chunks in flight; failures are
+    retried per chunk. Returns the id of the collect_bulk_email_results
+    task, whose result holds one outcome per id.
+    """
+    if email_type not in BULK_EMAIL_BUILDERS:
+        logger.warning(f"Unknown bulk email type {email_type!r}")
+        return None
+    if not application_ids:
+        return None
+
+    workflow, chunk_count = bulk_email_workflow(application_ids, email_type, chunk_size, concurrency)
+    result = workflow.apply_async()
+    logger.info(f"Bulk {email_type} emails: {len(application_ids)} applications queued in {chunk_count} chunks")
+    return result.id
+
+
+@shared_task
+def sync_job_search_index(batch_size=1000):
+    """
+    Periodic task pushing jobs changed since the last watermark to Elasticsearch
+    """
+    from .search import SearchUnavailable
+    from .search.elastic import get_job_index
+
+    try:
+        indexed, deleted = get_job_index().sync(batch_size=batch_size)
+    except SearchUnavailable as exc:
+        logger.warning(f"Skipped job search index sync: {exc}")
+        return "Search index sync skipped"
+
+    logger.info(f"Synced job search index: {indexed} indexed, {deleted} removed")
+    return f"Indexed {indexed} jobs, removed {deleted}"
+
+
+@shared_task(bind=True, max_retries=settings.EMAIL_TASK_MAX_RETRIES)
+def remove_jobs_from_search_index(self, job_ids):
+    """
+    Delete the Elasticsearch documents of hard-deleted jobs, which the
+    watermark sync cannot see
+    """
+    from elastic_transport import TransportError
+    from elasticsearch import ApiError
+    from .search import SearchUnavailable
+    from .search.elastic import get_job_index
+
+    try:
+        removed = get_job_index().bulk_delete(job_ids)
+    except (SearchUnavailable, ApiError, TransportError) as exc:
+        logger.warning(f"Could not remove jobs {job_ids} from the search index: {exc}")
+        raise self.retry(exc=exc, countdown=settings.EMAIL_TASK_RETRY_DELAY * (2 ** self.request.retries))
+    return f"Removed {removed} jobs from the search index"
+
+
+@shared_task
+def notify_application_status_change(application_id):
+    """
+    Coalescing consumer of status transition events: turns the net change
+    since the last notification into one status update email
+    """
+    from .events import NotificationPending, collect_status_notification
+
+    try:
+        transition = collect_status_notification(application_id)
+    except NotificationPending as exc:
+        # Another event may also be due then; whichever runs second finds nothing left
+        notify_application_status_change.apply_async(args=[application_id], eta=exc.eta)
+        return f"Status notification rescheduled for {exc.eta.isoformat()}"
+    if transition is None:
+        return "No status notification needed"
+    old_status, new_status = transition
+    send_application_status_update_email.delay(application_id, old_status, new_status)
+    return f"Status update {old_status} -> {new_status} queued"
+
+
+@shared_task
+def dispatch_outbox_events(batch_size=None):
+    """
+    Periodic fallback publishing pending outbox events when no
+    dispatch_outbox process is running
+    """
+    from .outbox import dispatch_pending
+
+    dispatched = dispatch_pending(batch_size)
+    return f"Dispatched {dispatched} outbox events"
+
+
 @shared_task
 def cleanup_old_email_tasks():
     """
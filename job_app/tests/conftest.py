@@ -1,10 +1,37 @@
 import pytest
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from job_app.models import Company, Job, Application
 
 from uuid import uuid4
 
 
+def pytest_configure(config):
+    # A second, separately migrated SQLite database standing in for a read
+    # replica; routing tests opt in with settings.DATABASE_REPLICAS = ['replica']
+    default = settings.DATABASES['default']
+    settings.DATABASES['replica'] = {
+        **default,
+        'NAME': ':memory:',
+        'TEST': {**default.get('TEST', {}), 'NAME': None, 'MIRROR': None},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_store(settings, tmp_path):
+    """Fresh local rate limit counters for every test"""
+    settings.RATE_LIMIT_REDIS_URL = None
+    settings.RATE_LIMIT_SQLITE_PATH = str(tmp_path / 'ratelimit.sqlite3')
+
+
 @pytest.fixture
 def user_factory():
     def create_user(**kwargs):
@@ -74,3 +101,17 @@ def application_factory(user_factory, job_factory):
         defaults.update(kwargs)
         return Application.objects.create(**defaults)
     return create_application
+
+@pytest.fixture
+def email_templates(settings):
+    """In-memory stand-ins for the emails/*.html templates rendered by the tasks"""
+    templates = {
+        'emails/application_confirmation.html': '<p>{{ candidate_name }} applied to {{ job_title }}</p>',
+        'emails/application_status_update.html': '<p>{{ job_title }}: {{ old_status }} to {{ new_status }}</p>',
+        'emails/new_application_notification.html': '<p>{{ candidate_name }} applied to {{ job_title }}</p>',
+    }
+    settings.TEMPLATES = [{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {'loaders': [('django.template.loaders.locmem.Loader', templates)]},
+    }]
+    return templates
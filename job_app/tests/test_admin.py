@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from job_app import pagination
+from job_app.models import Job
+from job_app.admin import JobAdmin
+from job_app.pagination import EstimatedCountPaginator, KeysetChangeList
+
+
+@pytest.mark.django_db
+class TestChangelists:
+    def test_company_counts_are_annotated(self, admin_client, company_factory, job_factory):
+        def changelist_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get(reverse('admin:job_app_company_changelist'))
+            assert response.status_code == 200
+            return response, len(queries)
+
+        company = company_factory()
+        job_factory(company=company)
+        job_factory(company=company)
+        response, baseline = changelist_queries()
+        assert '2 jobs' in response.content.decode()
+
+        for _ in range(5):
+            job_factory()
+        assert changelist_queries()[1] == baseline
+
+    def test_job_changelist_filters_by_company_link(self, admin_client, job_factory):
+        job = job_factory(title='Linked role')
+        job_factory(title='Other role')
+        url = reverse('admin:job_app_job_changelist') + f'?company__id__exact={job.company_id}'
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert 'Linked role' in content and 'Other role' not in content
+
+    def test_application_changelist(self, admin_client, application_factory):
+        application_factory()
+        response = admin_client.get(reverse('admin:job_app_application_changelist'))
+        assert response.status_code == 200
+        assert response.context['cl'].full_result_count is None
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_filtered_count_is_capped(self, job_factory, settings):
+        settings.ADMIN_EXACT_COUNT_LIMIT = 3
+        for _ in range(5):
+            job_factory()
+        assert EstimatedCountPaginator(Job.objects.filter(is_active=True), 2).count == 3
+
+    def test_unfiltered_count_uses_estimate(self, job_factory, settings, monkeypatch):
+        settings.ADMIN_EXACT_COUNT_LIMIT = 3
+        monkeypatch.setattr(pagination, 'estimated_count', lambda queryset: 1_000_000)
+        job_factory()
+        assert EstimatedCountPaginator(Job.objects.all(), 2).count == 1_000_000
+        assert EstimatedCountPaginator(Job.objects.filter(is_active=True), 2).count == 1
+
+    def test_estimate_below_the_limit_is_counted(self, job_factory, settings, monkeypatch):
+        monkeypatch.setattr(pagination, 'estimated_count', lambda queryset: 5)
+        job_factory()
+        assert EstimatedCountPaginator(Job.objects.all(), 2).count == 1
+
+    def test_pages_keep_their_order(self, job_factory):
+        for _ in range(5):
+            job_factory()
+        jobs = Job.objects.order_by('-created_at', '-pk')
+        page = EstimatedCountPaginator(jobs, 2).page(2)
+        assert list(page) == list(jobs[2:4])
+        assert page.has_next() and page.has_previous()
+
+
+@pytest.mark.django_db
+class TestKeysetChangeList:
+    @pytest.fixture
+    def jobs(self, job_factory, settings, monkeypatch):
+        settings.ADMIN_EXACT_COUNT_LIMIT = 3
+        monkeypatch.setattr(JobAdmin, 'list_per_page', 2)
+        jobs = [job_factory() for _ in range(7)]
+        # Ties on created_at are broken by the primary key
+        Job.objects.filter(pk__in=[job.pk for job in jobs[2:5]]).update(created_at=jobs[2].created_at)
+        return list(Job.objects.order_by('-created_at', '-pk'))
+
+    def test_next_links_reach_rows_past_the_capped_count(self, admin_client, jobs):
+        url = reverse('admin:job_app_job_changelist')
+        response = admin_client.get(url + '?is_active__exact=1')
+        seen = []
+        while True:
+            cl = response.context['cl']
+            seen += list(cl.result_list)
+            if not cl.next_page_url:
+                break
+            assert 'is_active__exact=1' in cl.next_page_url
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get(url + cl.next_page_url)
+            assert response.status_code == 200
+            assert not any('OFFSET' in query['sql'] for query in queries)
+        assert seen == jobs
+        assert 'First page' in response.content.decode()
+
+    def test_links_from_a_later_page_start_over(self, admin_client, jobs):
+        url = reverse('admin:job_app_job_changelist')
+        cl = admin_client.get(url).context['cl']
+        cl = admin_client.get(url + cl.next_page_url).context['cl']
+        assert KeysetChangeList.CURSOR_VAR not in cl.get_query_string({'is_active__exact': 1})
+        assert KeysetChangeList.CURSOR_VAR not in cl.first_page_url
+
+    def test_sorting_by_a_related_column_pages_by_number(self, admin_client, jobs):
+        # Column 2 is company, a foreign key (column 0 is the action checkbox)
+        response = admin_client.get(reverse('admin:job_app_job_changelist') + '?o=2')
+        cl = response.context['cl']
+        assert cl.keyset_fields is None and cl.next_page_url is None
+        assert len(cl.result_list) == 2
+
+    def test_bad_cursor_is_an_error(self, admin_client, jobs):
+        url = reverse('admin:job_app_job_changelist')
+        response = admin_client.get(url + '?after=not-a-cursor')
+        assert response.status_code == 302
+        assert response.url.endswith('?e=1')
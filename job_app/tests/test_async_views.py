@@ -0,0 +1,127 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+from job_app.middleware import WhiteNoiseMiddleware
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def async_get(url, data=None):
+    return async_to_sync(AsyncClient().get)(url, data)
+
+
+@pytest.mark.django_db
+class TestAsyncJobViews:
+    def test_list_matches_the_anonymous_drf_list(self, api_client, job_factory):
+        job_factory(title='Active', location='Berlin', salary=70000)
+        job_factory(title='Closed', is_active=False)
+
+        response = async_get(reverse('async-job-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == api_client.get(reverse('job-list')).json()
+        assert [job['title'] for job in response.json()] == ['Active']
+
+    def test_filters(self, api_client, job_factory):
+        job_factory(location='Berlin', salary=70000)
+        job_factory(location='Paris', salary=40000)
+        params = {'location__icontains': 'ber', 'salary__gte': 50000}
+
+        response = async_get(reverse('async-job-list'), params)
+        assert response.json() == api_client.get(reverse('job-list'), params).json()
+        assert len(response.json()) == 1
+        assert async_get(reverse('async-job-list'), {'salary__gte': 'lots'}).status_code == 400
+
+    def test_cursor_pagination(self, job_factory):
+        for _ in range(5):
+            job_factory()
+        first = async_get(reverse('async-job-list'), {'page_size': 2}).json()
+        assert len(first['results']) == 2 and first['previous'] is None
+
+        second = async_get(first['next']).json()
+        assert len(second['results']) == 2
+        assert {job['id'] for job in first['results']}.isdisjoint(job['id'] for job in second['results'])
+        assert async_get(second['previous']).json()['results'] == first['results']
+        assert async_get(reverse('async-job-list'), {'cursor': 'bogus'}).status_code == 404
+
+    def test_detail(self, api_client, job_factory):
+        job = job_factory()
+        response = async_get(reverse('async-job-detail', args=[job.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == api_client.get(reverse('job-detail', args=[job.id])).json()
+
+        missing = async_get(reverse('async-job-detail', args=[job.id + 100]))
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+        assert missing.json() == {'detail': 'No Job matches the given query.'}
+
+    def test_search(self, api_client, job_factory):
+        job_factory(title='Python developer')
+        job_factory(title='Senior Python engineer', description='Python everywhere')
+        job_factory(title='Gardener')
+
+        response = async_get(reverse('async-job-search'), {'q': 'python'})
+        assert response.json() == api_client.get(reverse('job-search'), {'q': 'python'}).json()
+        assert len(response.json()) == 2
+        assert async_get(reverse('async-job-search')).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reads_only(self):
+        response = async_to_sync(AsyncClient().post)(reverse('async-job-list'))
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    def test_rate_limited(self, settings):
+        settings.RATE_LIMITS = {**settings.RATE_LIMITS, 'anon_list': {'rate': '1/hour', 'key': 'anon'}}
+        first = async_get(reverse('async-job-list'))
+        assert first['RateLimit-Remaining'] == '0'
+
+        blocked = async_get(reverse('async-job-list'))
+        assert blocked.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(blocked['Retry-After']) == int(blocked['RateLimit-Reset']) > 0
+
+
+@pytest.mark.django_db
+class TestAsyncCompanyViews:
+    def test_list_and_detail_match_drf(self, api_client, company_factory, job_factory):
+        company = company_factory(name='Acme')
+        job_factory(company=company)
+        job_factory(company=company, is_active=False)
+        company_factory(name='Empty')
+
+        response = async_get(reverse('async-company-list'))
+        assert response.json() == api_client.get(reverse('company-list')).json()
+        assert response.json()['count'] == 2
+        assert [c['jobs_count'] for c in response.json()['results']] == [2, 0]
+        assert async_get(reverse('async-company-list'), {'name': 'Empty'}).json()['results'][0]['jobs_count'] == 0
+
+        detail = async_get(reverse('async-company-detail', args=[company.id]))
+        assert detail.json() == api_client.get(reverse('company-detail', args=[company.id])).json()
+        assert async_get(reverse('async-company-detail', args=[company.id + 100])).status_code == 404
+
+    def test_list_pages(self, api_client, company_factory, monkeypatch):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 2)
+        for number in range(3):
+            company_factory(name=f'Company {number}')
+        url = reverse('async-company-list')
+
+        second = async_get(url, {'page': 2}).json()
+        assert second['results'] == api_client.get(reverse('company-list'), {'page': 2}).json()['results']
+        assert second['count'] == 3 and len(second['results']) == 1
+        assert second['next'] is None and second['previous'] == f'http://testserver{url}'
+        assert async_get(url, {'page': 5}).status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestAsyncMiddleware:
+    def test_whitenoise_stays_async_in_an_async_chain(self):
+        async def view(request):
+            pass
+
+        def sync_view(request):
+            pass
+
+        assert iscoroutinefunction(WhiteNoiseMiddleware(view))
+        assert not iscoroutinefunction(WhiteNoiseMiddleware(sync_view))
@@ -0,0 +1,232 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from job_app.authentication import revoke_tokens
+from job_app.checks import check_token_version_cache
+from job_app.serializers import CustomTokenObtainPairSerializer
+
+USERS_TABLE = '"job_app_user"."password"'
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def bearer(client, user):
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+def user_loads(queries):
+    """Queries that read full user rows, as JWTAuthentication.get_user does"""
+    return [query['sql'] for query in queries if USERS_TABLE in query['sql']]
+
+
+@pytest.mark.django_db
+class TestTokenClaims:
+    def test_obtain_pair_embeds_claims(self, api_client, employer_factory):
+        employer = employer_factory(username='boss')
+        response = api_client.post(reverse('token_obtain_pair'), {'username': 'boss', 'password': 'testpassword'})
+        assert response.status_code == status.HTTP_200_OK
+
+        access = AccessToken(response.data['access'])
+        assert access['user_type'] == 'employer'
+        assert access['company_id'] == employer.company_id
+        assert access['is_staff'] is False
+        assert access['ver'] == employer.token_version
+
+    def test_refresh_restamps_claims(self, api_client, employer_factory):
+        employer = employer_factory()
+        refresh = CustomTokenObtainPairSerializer.get_token(employer)
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_200_OK
+        assert AccessToken(response.data['access'])['company_id'] == employer.company_id
+
+    def test_claim_change_refuses_old_refresh_token(self, api_client, employer_factory, company_factory):
+        employer = employer_factory()
+        refresh = CustomTokenObtainPairSerializer.get_token(employer)
+        employer.company = company_factory()
+        employer.save()
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        fresh = CustomTokenObtainPairSerializer.get_token(employer).access_token
+        assert fresh['company_id'] == employer.company_id
+
+    def test_refresh_rejects_revoked_token(self, api_client, user_factory):
+        user = user_factory()
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        revoke_tokens(user)
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestStatelessReads:
+    def test_employer_application_list_skips_user_load(self, api_client, employer_factory, job_factory,
+                                                       application_factory):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer, company=employer.company)
+        application_factory(job=job)
+        application_factory()  # Someone else's job
+        bearer(api_client, employer)
+        url = reverse('application-list')
+        api_client.get(url)  # Caches the token version
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        assert user_loads(queries) == []
+
+    def test_candidate_lists_skip_user_load(self, api_client, user_factory, application_factory):
+        candidate = user_factory()
+        application_factory(candidate=candidate)
+        bearer(api_client, candidate)
+        url = reverse('application-my-applications')
+        api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+        assert len(queries) == 1
+        assert user_loads(queries) == []
+
+    def test_my_jobs_uses_claims(self, api_client, employer_factory, job_factory):
+        employer = employer_factory()
+        job_factory(posted_by=employer, company=employer.company, is_active=False)
+        job_factory()
+        bearer(api_client, employer)
+
+        response = api_client.get(reverse('job-my-jobs'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_claims_are_authorization(self, api_client, employer_factory):
+        bearer(api_client, employer_factory())
+        response = api_client.get(reverse('application-my-applications'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_writes_load_the_user(self, api_client, user_factory, job_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse('application-list'), {'job': job_factory().id})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert user_loads(queries)
+
+    def test_tokens_without_claims_still_work(self, api_client, user_factory, application_factory):
+        candidate = user_factory()
+        application_factory(candidate=candidate)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(candidate).access_token}')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse('application-my-applications'))
+        assert response.status_code == status.HTTP_200_OK
+        assert user_loads(queries)
+
+    def test_disabled_by_setting(self, api_client, user_factory, settings):
+        settings.JWT_STATELESS_READS = False
+        bearer(api_client, user_factory())
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(reverse('application-list'))
+        assert user_loads(queries)
+
+
+@pytest.mark.django_db
+class TestRevocation:
+    def test_revoked_token_is_refused_on_reads(self, api_client, user_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+        url = reverse('application-list')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        revoke_tokens(candidate)
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+        bearer(api_client, candidate)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_revoked_token_is_refused_on_writes(self, api_client, user_factory, job_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+        revoke_tokens(candidate)
+
+        response = api_client.post(reverse('application-list'), {'job': job_factory().id})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivation_revokes_tokens(self, api_client, user_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+        url = reverse('application-list')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        candidate.delete()
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_saving_a_deactivation_revokes_tokens(self, api_client, user_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+        url = reverse('application-list')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        candidate.is_active = False
+        candidate.save()
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_admin_deactivation_revokes_tokens(self, admin_client, api_client, user_factory):
+        candidate = user_factory()
+        bearer(api_client, candidate)
+        url = reverse('application-list')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        response = admin_client.post(reverse('admin:job_app_user_change', args=[candidate.pk]), {
+            'username': candidate.username,
+            'email': candidate.email,
+            'user_type': candidate.user_type,
+            'date_joined_0': candidate.date_joined.strftime('%Y-%m-%d'),
+            'date_joined_1': candidate.date_joined.strftime('%H:%M:%S'),
+        })
+        assert response.status_code == 302
+        candidate.refresh_from_db()
+        assert not candidate.is_active
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_claim_changes_revoke_tokens(self, user_factory, company_factory):
+        employer = user_factory(user_type='employer')
+        version = employer.token_version
+
+        employer.company = company_factory()
+        employer.save()
+        assert employer.token_version == version + 1
+
+        employer.phone = '555'
+        employer.save()
+        employer.save(update_fields=['last_login'])
+        assert employer.token_version == version + 1
+
+
+class TestTokenVersionCacheCheck:
+    def test_per_process_cache_is_rejected(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        assert [error.id for error in check_token_version_cache(None)] == ['job_app.E001']
+
+    def test_shared_cache_passes(self, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379/0',
+        }}
+        assert check_token_version_cache(None) == []
+
+    def test_stateless_reads_off_passes(self, settings):
+        settings.JWT_STATELESS_READS = False
+        assert check_token_version_cache(None) == []
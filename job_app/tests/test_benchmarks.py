@@ -0,0 +1,92 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from job_app.management.commands.audit_queries import suggest_index
+from job_app.management.commands.benchmark_asgi import Command as AsgiCommand
+from job_app.management.commands.benchmark_endpoints import Command, percentile
+
+
+@pytest.mark.django_db
+class TestEndpointBenchmark:
+    def test_measure_reports_every_endpoint(self, application_factory):
+        application_factory()
+        report = Command().measure(requests=2, warmup=0)
+
+        assert set(report['endpoints']) == {
+            'jobs-list', 'jobs-detail', 'applications-list', 'my_jobs',
+            'my_applications', 'companies-list', 'registration',
+        }
+        for result in report['endpoints'].values():
+            assert result['status'] < 400
+            assert result['queries'] > 0
+            assert 0 < result['p50_ms'] <= result['p95_ms']
+            assert result['peak_memory_kb'] > 0
+        assert report['dataset']['applications'] == 1
+
+    def test_compare_flags_regressions(self):
+        baseline = {'endpoints': {
+            'jobs-list': {'queries': 1, 'p95_ms': 10.0, 'peak_memory_kb': 100.0},
+            'my_jobs': {'queries': 2, 'p95_ms': 10.0, 'peak_memory_kb': 100.0},
+        }}
+        report = {'endpoints': {
+            'jobs-list': {'queries': 2, 'p95_ms': 12.0, 'peak_memory_kb': 100.0},
+            'my_jobs': {'queries': 2, 'p95_ms': 20.0, 'peak_memory_kb': 90.0},
+        }}
+
+        regressions = Command().compare(report, baseline, tolerance=0.25)
+        assert regressions == [
+            'jobs-list: 2 queries (baseline 1)',
+            'my_jobs: p95_ms 20.0 exceeds baseline 10.0 by more than 25%',
+        ]
+
+    def test_percentile(self):
+        assert percentile(range(1, 101), 95) == 95
+        assert percentile([3.0], 95) == 3.0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiBenchmark:
+    def test_measure_compares_both_servers(self, job_factory):
+        job_factory(title='Python developer')
+        report = AsgiCommand().measure(requests=4, clients=2, threads=1, delay=0.01)
+
+        assert set(report['endpoints']) == {
+            'jobs-list', 'jobs-detail', 'jobs-search', 'companies-list', 'companies-detail',
+        }
+        for servers in report['endpoints'].values():
+            for result in servers.values():
+                assert result['errors'] == 0
+                assert result['throughput_rps'] > 0
+                assert 0 < result['p50_ms'] <= result['p95_ms']
+
+
+@pytest.mark.django_db
+class TestQueryAudit:
+    def test_flags_scans_and_sorts_and_suggests_a_migration(self, application_factory):
+        application_factory()
+        out = StringIO()
+        with pytest.raises(CommandError, match='missing index'):
+            call_command('audit_queries', check=True, stdout=out)
+
+        output = out.getvalue()
+        assert 'SCAN job_app_job' in output and 'USE TEMP B-TREE FOR ORDER BY' in output
+        assert "migrations.AddIndex(\n            model_name='job'" in output
+        assert "fields=['is_active', '-created_at', 'id']" in output
+        assert "fields=['candidate', '-applied_at']" in output
+
+    def test_nothing_to_audit(self):
+        with pytest.raises(CommandError, match='Nothing to audit'):
+            call_command('audit_queries', stdout=StringIO())
+
+    def test_suggest_index(self):
+        sql = (
+            'SELECT "job_app_job"."id", (SELECT 1 FROM "job_app_company" WHERE "job_app_company"."id" = 1) '
+            'FROM "job_app_job" WHERE ("job_app_job"."posted_by_id" = 1 AND "job_app_job"."is_active") '
+            'ORDER BY "job_app_job"."created_at" DESC LIMIT 20'
+        )
+        assert suggest_index(sql, 'job_app_job') == ('posted_by_id', 'is_active', '-created_at')
+        assert suggest_index(sql.replace(' AND ', ' OR '), 'job_app_job') is None
+        ranked = sql.replace('ORDER BY', 'ORDER BY 2 DESC,')
+        assert suggest_index(ranked, 'job_app_job') == ('posted_by_id', 'is_active')
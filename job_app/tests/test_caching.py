@@ -0,0 +1,214 @@
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from job_app.admin import make_jobs_inactive
+from job_app.models import Application, Job
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_anonymous_list_is_served_from_cache(self, api_client, job_factory, django_assert_num_queries):
+        job_factory()
+        url = reverse('job-list')
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second.data == first.data
+        assert second['ETag'] == first['ETag']
+
+    def test_query_parameter_order_is_normalized(self, api_client, job_factory, django_assert_num_queries):
+        job_factory()
+        url = reverse('job-list')
+        api_client.get(url + '?job_type=FT&is_active=true')
+        with django_assert_num_queries(0):
+            api_client.get(url + '?is_active=true&job_type=FT')
+
+    def test_writes_invalidate(self, api_client, job_factory):
+        job = job_factory(title='Before')
+        url = reverse('job-detail', args=[job.id])
+        assert api_client.get(url).data['title'] == 'Before'
+
+        job.title = 'After'
+        job.save()
+        assert api_client.get(url).data['title'] == 'After'
+
+    def test_company_rename_invalidates_job_list(self, api_client, job_factory):
+        job = job_factory()
+        url = reverse('job-list')
+        api_client.get(url)
+
+        job.company.name = 'Renamed Ltd'
+        job.company.save()
+        assert api_client.get(url).data[0]['company']['name'] == 'Renamed Ltd'
+
+    def test_application_status_invalidates_company_stats(self, api_client, application_factory):
+        application = application_factory()
+        url = reverse('company-detail', args=[application.job.company_id])
+        assert api_client.get(url).data['open_applications_count'] == 1
+
+        application.status = 'REJ'
+        application.save()
+        assert api_client.get(url).data['open_applications_count'] == 0
+
+    def test_admin_bulk_action_invalidates(self, api_client, job_factory):
+        job_factory()
+        url = reverse('job-list')
+        assert len(api_client.get(url).data) == 1
+
+        make_jobs_inactive(None, None, Job.objects.all())
+        assert len(api_client.get(url).data) == 0
+
+    def test_if_none_match_returns_304(self, api_client, job_factory):
+        job_factory()
+        url = reverse('company-list')
+        etag = api_client.get(url)['ETag']
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_authenticated_requests_bypass_cache(self, api_client, employer_factory, job_factory):
+        employer = employer_factory()
+        job_factory(posted_by=employer, is_active=False)
+        url = reverse('job-list')
+        assert len(api_client.get(url).data) == 0
+
+        api_client.force_authenticate(user=employer)
+        response = api_client.get(url)
+        assert len(response.data) == 1
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_list_not_modified_for_authenticated_clients(
+        self, api_client, employer_factory, job_factory, django_assert_num_queries
+    ):
+        employer = employer_factory()
+        job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-list')
+        etag = api_client.get(url)['ETag']
+
+        # A single aggregate query, no page load or serialization
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    @pytest.fixture
+    def later(self, monkeypatch):
+        """Move the clock on so the writes so far lie in a past second"""
+        def advance(seconds=2):
+            now = time.time() + seconds
+            monkeypatch.setattr(time, 'time', lambda: now)
+        return advance
+
+    def test_detail_validators_change_on_update(self, api_client, employer_factory, job_factory, later):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-detail', args=[job.id])
+        later()
+        first = api_client.get(url)
+        assert 'Last-Modified' in first
+
+        job.title = 'Changed'
+        job.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != first['ETag']
+
+    def test_if_modified_since(self, api_client, employer_factory, job_factory, later):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-detail', args=[job.id])
+        later()
+        last_modified = api_client.get(url)['Last-Modified']
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_no_last_modified_within_the_changing_second(self, api_client, employer_factory, job_factory):
+        employer = employer_factory()
+        job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        response = api_client.get(reverse('job-list'))
+        assert 'Last-Modified' not in response and 'ETag' in response
+
+    def test_company_rename_is_modified_since(self, api_client, employer_factory, job_factory, later):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-list')
+        later()
+        last_modified = api_client.get(url)['Last-Modified']
+        assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == status.HTTP_304_NOT_MODIFIED
+
+        later(4)
+        job.company.name = 'Renamed'
+        job.company.save()
+        later(6)
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['company']['name'] == 'Renamed'
+
+    def test_deleting_the_newest_job_is_modified_since(self, api_client, employer_factory, job_factory, later):
+        employer = employer_factory()
+        job_factory(posted_by=employer)
+        newest = job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-list')
+        later()
+        last_modified = api_client.get(url)['Last-Modified']
+
+        later(4)
+        newest.delete()
+        later(6)
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_new_application_changes_list_etag(self, api_client, employer_factory, job_factory, user_factory):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-list')
+        etag = api_client.get(url)['ETag']
+
+        Application.objects.create(job=job, candidate=user_factory())
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['applications_count'] == 1
+
+    def test_missing_job_is_404(self, api_client, employer_factory):
+        api_client.force_authenticate(user=employer_factory())
+        response = api_client.get(reverse('job-detail', args=[999]), HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_malformed_job_id_is_404(self, api_client, employer_factory):
+        api_client.force_authenticate(user=employer_factory())
+        response = api_client.get('/api/v1/jobs/abc/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_pages_have_their_own_etag(self, api_client, employer_factory, job_factory):
+        employer = employer_factory()
+        job_factory(posted_by=employer)
+        job_factory(posted_by=employer)
+        api_client.force_authenticate(user=employer)
+        url = reverse('job-list')
+        first = api_client.get(url, {'page_size': 1})
+        assert first.data['next']
+
+        response = api_client.get(first.data['next'], HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != first['ETag']
+        assert response.data['results'] != first.data['results']
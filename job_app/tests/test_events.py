@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin.sites import site
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from job_app.admin import mark_applications_reviewed
+from job_app.models import Application, ApplicationStatusChange, OutboxEvent
+from job_app.tasks import notify_application_status_change, send_application_status_update_email
+
+
+@pytest.fixture
+def sent_updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(send_application_status_update_email, 'delay', lambda *args: calls.append(args))
+    return calls
+
+
+@pytest.fixture
+def rescheduled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        notify_application_status_change, 'apply_async', lambda args, eta: calls.append((args, eta))
+    )
+    return calls
+
+
+@pytest.mark.django_db
+class TestStatusHistory:
+    def test_update_status_logs_transition_and_emits_event(self, application_factory):
+        application = application_factory()
+        employer = application.job.posted_by
+        client = APIClient()
+        client.force_authenticate(user=employer)
+
+        response = client.post(reverse('application-update-status', args=[application.id]), {'status': 'INT'})
+        assert response.status_code == 200
+
+        change = ApplicationStatusChange.objects.get()
+        assert (change.old_status, change.new_status, change.changed_by) == ('APP', 'INT', employer)
+        event = OutboxEvent.objects.get()
+        assert event.task == notify_application_status_change.name
+        assert event.args == [application.id]
+        assert event.eta > timezone.now()
+
+    def test_unchanged_status_is_not_logged(self, application_factory):
+        application = application_factory()
+        client = APIClient()
+        client.force_authenticate(user=application.job.posted_by)
+        client.post(reverse('application-update-status', args=[application.id]), {'status': 'APP'})
+        assert not ApplicationStatusChange.objects.exists()
+        assert not OutboxEvent.objects.exists()
+
+    def test_admin_bulk_action_logs_in_bulk(self, application_factory, user_factory, django_assert_num_queries):
+        applications = [application_factory() for _ in range(4)]
+        Application.objects.filter(pk=applications[0].pk).update(status='REV')
+        request = RequestFactory().post('/admin/')
+        request.user = user_factory(is_staff=True)
+
+        queryset = Application.objects.filter(pk__in=[app.pk for app in applications])
+        # select, update, history insert, outbox insert, plus two savepoint pairs
+        with django_assert_num_queries(8):
+            mark_applications_reviewed(site._registry[Application], request, queryset)
+
+        assert set(Application.objects.values_list('status', flat=True)) == {'REV'}
+        logged = ApplicationStatusChange.objects.values_list('application_id', 'old_status', 'new_status')
+        assert sorted(logged) == [(app.pk, 'APP', 'REV') for app in applications[1:]]
+        assert OutboxEvent.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestStatusNotifications:
+    def log(self, application, *statuses, age=0):
+        changed_at = timezone.now() - timedelta(seconds=age)
+        for old_status, new_status in zip(statuses, statuses[1:]):
+            change = ApplicationStatusChange.objects.create(
+                application=application, old_status=old_status, new_status=new_status
+            )
+            ApplicationStatusChange.objects.filter(pk=change.pk).update(changed_at=changed_at)
+
+    def test_rapid_transitions_produce_one_email(self, settings, application_factory, sent_updates):
+        settings.APPLICATION_STATUS_NOTIFY_DELAY = 60
+        application = application_factory()
+        self.log(application, 'APP', 'REV', 'INT', age=120)
+
+        # One event per transition; only the first run finds anything to send
+        notify_application_status_change(application.id)
+        notify_application_status_change(application.id)
+        assert sent_updates == [(application.id, 'APP', 'INT')]
+        assert not ApplicationStatusChange.objects.filter(notified_at__isnull=True).exists()
+
+    def test_waits_for_the_quiet_period(self, settings, application_factory, sent_updates, rescheduled):
+        settings.APPLICATION_STATUS_NOTIFY_DELAY = 60
+        application = application_factory()
+        self.log(application, 'APP', 'REV', age=120)
+        self.log(application, 'REV', 'INT', age=5)
+
+        notify_application_status_change(application.id)
+        assert sent_updates == []
+        assert ApplicationStatusChange.objects.filter(notified_at__isnull=True).count() == 2
+
+    def test_early_run_is_rescheduled(self, settings, application_factory, sent_updates, rescheduled):
+        settings.APPLICATION_STATUS_NOTIFY_DELAY = 60
+        application = application_factory()
+        self.log(application, 'APP', 'REV', age=50)
+        latest = ApplicationStatusChange.objects.get()
+
+        # The only event for this transition fires ten seconds early
+        notify_application_status_change(application.id)
+        assert sent_updates == []
+        assert rescheduled == [([application.id], latest.changed_at + timedelta(seconds=60))]
+
+        ApplicationStatusChange.objects.update(changed_at=latest.changed_at - timedelta(seconds=10))
+        notify_application_status_change(*rescheduled[0][0])
+        assert sent_updates == [(application.id, 'APP', 'REV')]
+
+    def test_transitions_that_cancel_out_send_nothing(self, settings, application_factory, sent_updates):
+        settings.APPLICATION_STATUS_NOTIFY_DELAY = 0
+        application = application_factory()
+        self.log(application, 'APP', 'REV', 'APP')
+
+        notify_application_status_change(application.id)
+        assert sent_updates == []
+        assert not ApplicationStatusChange.objects.filter(notified_at__isnull=True).exists()
@@ -0,0 +1,230 @@
+import smtplib
+import socketserver
+import threading
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from job_app.mail import PooledMailConnection, batched_delivery, close_pooled_connection, send_message
+from job_app import tasks
+from job_app.models import Application
+from job_app.tasks import (
+    bulk_email_workflow, send_application_confirmation_email, send_bulk_email_chunk, send_bulk_email_notifications,
+)
+from job_board.celery import app
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server counting sessions and delivered messages"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.sessions = 0
+        self.messages = 0
+        self.noops = 0
+        self.drop_after = None  # close the session after this many messages
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        server.sessions += 1
+        delivered = 0
+        self.reply('220 sink ready')
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250 sink')
+            elif command == 'DATA':
+                self.reply('354 go ahead')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                server.messages += 1
+                delivered += 1
+                self.reply('250 queued')
+                if server.drop_after is not None and delivered >= server.drop_after:
+                    return
+            elif command == 'NOOP':
+                server.noops += 1
+                self.reply('250 ok')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+@pytest.fixture
+def smtp_sink(settings):
+    sink = SMTPSink()
+    thread = threading.Thread(target=sink.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST, settings.EMAIL_PORT = sink.server_address
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ''
+    yield sink
+    close_pooled_connection()
+    sink.shutdown()
+    sink.server_close()
+
+
+def message(number=0):
+    return EmailMessage(f'Subject {number}', 'Body', 'noreply@jobboard.com', ['someone@example.com'])
+
+
+class TestPooledMail:
+    def test_messages_share_one_session(self, smtp_sink):
+        for number in range(5):
+            send_message(message(number))
+        assert smtp_sink.messages == 5
+        assert smtp_sink.sessions == 1
+
+    def test_reconnects_when_server_drops_session(self, smtp_sink):
+        smtp_sink.drop_after = 2
+        for number in range(5):
+            send_message(message(number))
+        assert smtp_sink.messages == 5
+        assert smtp_sink.sessions == 3
+
+    def test_idle_connection_is_probed(self, smtp_sink, settings):
+        settings.MAIL_KEEPALIVE = 0
+        send_message(message())
+        send_message(message())
+        assert smtp_sink.noops == 1
+        assert smtp_sink.sessions == 1
+
+    def test_batched_delivery_flushes_on_exit(self, smtp_sink):
+        with batched_delivery():
+            for number in range(3):
+                send_message(message(number))
+            assert smtp_sink.messages == 0
+        assert smtp_sink.messages == 3
+        assert smtp_sink.sessions == 1
+
+    def test_failed_message_does_not_drop_the_rest(self, smtp_sink, monkeypatch):
+        deliver = PooledMailConnection.send_messages
+
+        def send_messages(connection, messages):
+            if messages[0].subject == 'Subject 1':
+                raise smtplib.SMTPRecipientsRefused({})
+            return deliver(connection, messages)
+
+        monkeypatch.setattr(PooledMailConnection, 'send_messages', send_messages)
+        with batched_delivery() as batch:
+            for number in range(3):
+                send_message(message(number))
+        assert smtp_sink.messages == 2
+        assert batch.sent == 2
+        assert [failed.subject for failed, _ in batch.failed] == ['Subject 1']
+
+    def test_benchmark_command(self, smtp_sink, capsys):
+        host, port = smtp_sink.server_address
+        call_command('benchmark_mail', host=host, port=port, messages=5)
+        out = capsys.readouterr().out
+        assert 'pooled' in out and 'batched' in out
+        # 5 sessions per message, then one each for pooled and batched
+        assert smtp_sink.sessions == 7
+        assert smtp_sink.messages == 15
+
+
+@pytest.mark.django_db
+def test_task_sends_through_pooled_connection(application_factory, email_templates):
+    application = application_factory()
+    send_application_confirmation_email.apply(args=[application.id])
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [application.candidate.email]
+
+
+@pytest.fixture
+def eager_tasks():
+    """Run subtasks queued with apply_async in process"""
+    app.conf.task_always_eager = True
+    yield
+    app.conf.task_always_eager = False
+
+
+@pytest.fixture
+def retried(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        send_bulk_email_chunk, 'apply_async',
+        lambda args, kwargs, countdown: calls.append((args, kwargs, countdown)),
+    )
+    return calls
+
+
+@pytest.mark.django_db
+class TestBulkEmail:
+    def test_chunks_load_applications_in_one_query_each(
+        self, application_factory, email_templates, eager_tasks, django_assert_num_queries
+    ):
+        ids = [application_factory().id for _ in range(5)] + [999999]
+        with django_assert_num_queries(3):
+            result = send_bulk_email_notifications.apply(args=[ids], kwargs={'chunk_size': 2}).get()
+
+        assert result
+        assert len(mail.outbox) == 5
+
+    def test_lanes_cap_chunks_in_flight_and_gather_outcomes(self, application_factory, email_templates, eager_tasks):
+        ids = [application_factory().id for _ in range(5)] + [999999]
+        workflow, chunk_count = bulk_email_workflow(ids, 'confirmation', chunk_size=1, concurrency=2)
+        assert chunk_count == 6
+        assert len(workflow.tasks) == 2
+
+        results = workflow.apply().get()
+        assert sorted(result['application_id'] for result in results) == sorted(ids)
+        assert {result['application_id']: result['status'] for result in results}[999999] == 'missing'
+        assert sum(result['status'] == 'sent' for result in results) == 5
+
+    def test_chunk_reports_outcomes_per_id(self, application_factory, email_templates):
+        ids = [application_factory().id for _ in range(2)] + [999999]
+        results = send_bulk_email_chunk(ids, 'confirmation')
+        assert [result['status'] for result in results] == ['sent', 'sent', 'missing']
+        assert [result['application_id'] for result in results] == ids
+
+    def test_failed_ids_are_retried_with_backoff(
+        self, application_factory, email_templates, monkeypatch, retried, settings
+    ):
+        ids = [application_factory().id for _ in range(3)]
+        original = tasks.build_new_application_notification_email
+
+        def build(application):
+            if application.id == ids[1]:
+                raise ValueError('render failed')
+            return original(application)
+
+        monkeypatch.setitem(tasks.BULK_EMAIL_BUILDERS, 'employer_notification', build)
+        results = send_bulk_email_chunk(ids, 'employer_notification', attempt=1)
+        assert [result['status'] for result in results] == ['sent', 'retrying', 'sent']
+        assert results[1]['error'] == 'render failed'
+        assert retried == [
+            ([[ids[1]], 'employer_notification'], {'attempt': 2}, settings.EMAIL_TASK_RETRY_DELAY * 2)
+        ]
+
+    def test_delivery_failures_give_up_after_max_retries(
+        self, application_factory, email_templates, monkeypatch, retried, settings
+    ):
+        ids = [application_factory().id for _ in range(3)]
+        failing = Application.objects.get(pk=ids[1]).candidate.email
+        deliver = PooledMailConnection.send_messages
+
+        def send_messages(connection, messages):
+            if messages[0].to == [failing]:
+                raise smtplib.SMTPRecipientsRefused({failing: (550, b'No such user')})
+            return deliver(connection, messages)
+
+        monkeypatch.setattr(PooledMailConnection, 'send_messages', send_messages)
+        results = send_bulk_email_chunk(ids, 'confirmation', attempt=settings.EMAIL_TASK_MAX_RETRIES)
+        assert [result['status'] for result in results] == ['sent', 'failed', 'sent']
+        assert retried == []
+        assert len(mail.outbox) == 2
+
+    def test_unknown_type_is_skipped(self, retried):
+        assert send_bulk_email_notifications([1], 'newsletter') is None
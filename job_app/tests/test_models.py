@@ -1,5 +1,6 @@
 import pytest
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.utils import timezone
 from job_app.models import User, Company, Job, Application
 
@@ -65,3 +66,27 @@ class TestApplicationModel:
         app1 = application_factory()
         app2 = application_factory()
         assert list(Application.objects.all()) == [app2, app1]
+
+    def test_applications_count_tracks_creates_and_deletes(self, application_factory, job_factory):
+        job = job_factory()
+        first = application_factory(job=job)
+        application_factory(job=job)
+        job.refresh_from_db()
+        assert job.applications_count == 2
+
+        first.delete()
+        job.refresh_from_db()
+        assert job.applications_count == 1
+
+        Application.objects.filter(job=job).delete()
+        job.refresh_from_db()
+        assert job.applications_count == 0
+
+    def test_recount_applications_repairs_drift(self, application_factory, job_factory):
+        job = job_factory()
+        application_factory(job=job)
+        Job.objects.filter(pk=job.pk).update(applications_count=7)
+
+        call_command('recount_applications')
+        job.refresh_from_db()
+        assert job.applications_count == 1
@@ -0,0 +1,111 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from job_app import outbox
+from job_app.models import Application, OutboxEvent
+from job_app.tasks import send_application_confirmation_email, send_new_application_notification_to_employer
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Record apply_async calls instead of talking to the broker"""
+    calls = []
+
+    def record(task):
+        def apply_async(args=None, kwargs=None, **options):
+            calls.append((task.name, args, kwargs))
+        return apply_async
+
+    for task in (send_application_confirmation_email, send_new_application_notification_to_employer):
+        monkeypatch.setattr(task, 'apply_async', record(task))
+    return calls
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_apply_writes_events_without_touching_the_broker(self, user_factory, job_factory, published):
+        candidate = user_factory(user_type='candidate')
+        client = APIClient()
+        client.force_authenticate(user=candidate)
+
+        response = client.post(reverse('application-list'), {'job': job_factory().id})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert published == []
+
+        application = Application.objects.get()
+        events = list(OutboxEvent.objects.values_list('task', 'args', 'dispatched_at'))
+        assert events == [
+            (send_application_confirmation_email.name, [application.id], None),
+            (send_new_application_notification_to_employer.name, [application.id], None),
+        ]
+
+    def test_rollback_discards_events(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                outbox.enqueue(send_application_confirmation_email, 1)
+                raise RuntimeError
+        assert not OutboxEvent.objects.exists()
+
+    def test_dispatch_publishes_in_order_and_marks_events(self, published):
+        for app_id in range(1, 6):
+            outbox.enqueue(send_application_confirmation_email, app_id)
+
+        assert outbox.dispatch_pending(batch_size=3) == 3
+        assert outbox.dispatch_pending(batch_size=3) == 2
+        assert outbox.dispatch_pending(batch_size=3) == 0
+        assert [args for _, args, _ in published] == [[1], [2], [3], [4], [5]]
+        assert not OutboxEvent.objects.filter(dispatched_at__isnull=True).exists()
+
+    def test_broker_failure_keeps_events_pending(self, monkeypatch):
+        outbox.enqueue(send_application_confirmation_email, 1)
+        outbox.enqueue(send_application_confirmation_email, 2)
+
+        def broker_down(*args, **kwargs):
+            raise ConnectionError('broker unavailable')
+
+        monkeypatch.setattr(send_application_confirmation_email, 'apply_async', broker_down)
+        assert outbox.dispatch_pending() == 0
+
+        first, second = OutboxEvent.objects.all()
+        assert first.dispatched_at is None and first.attempts == 1
+        assert first.last_error == 'broker unavailable'
+        assert second.attempts == 0
+
+    def test_failing_event_does_not_block_the_batch(self, published, settings):
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        broken = OutboxEvent.objects.create(task='job_app.tasks.renamed_task', args=[1])
+        outbox.enqueue(send_application_confirmation_email, 2)
+
+        assert outbox.dispatch_pending() == 1
+        assert published == [(send_application_confirmation_email.name, [2], {})]
+        broken.refresh_from_db()
+        assert broken.attempts == 1 and broken.failed_at is None
+
+        outbox.enqueue(send_application_confirmation_email, 3)
+        assert outbox.dispatch_pending() == 1
+        broken.refresh_from_db()
+        assert broken.attempts == 2 and broken.failed_at is not None
+        assert broken.dispatched_at is None and 'renamed_task' in broken.last_error
+
+        # Parked: no longer claimed
+        assert outbox.dispatch_pending() == 0
+        assert OutboxEvent.objects.filter(pk=broken.pk, attempts=2).exists()
+
+    def test_admin_retries_parked_events(self, admin_client, published):
+        event = outbox.enqueue(send_application_confirmation_email, 1)
+        OutboxEvent.objects.filter(pk=event.pk).update(failed_at=timezone.now(), attempts=10)
+        response = admin_client.post(reverse('admin:job_app_outboxevent_changelist'), {
+            'action': 'retry_outbox_events', '_selected_action': [event.pk],
+        })
+        assert response.status_code == 302
+        assert outbox.dispatch_pending() == 1
+
+    def test_dispatch_command_drains_pending_events(self, published):
+        for app_id in range(4):
+            outbox.enqueue(send_new_application_notification_to_employer, app_id)
+        call_command('dispatch_outbox', once=True, batch_size=2)
+        assert len(published) == 4
@@ -0,0 +1,163 @@
+import threading
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from job_app import ratelimit
+from job_app.ratelimit import (
+    RateLimitUnavailable,
+    SQLiteRateLimitBackend,
+    parse_rate,
+    sliding_window,
+    sliding_window_result,
+    token_bucket,
+)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def registration(number):
+    return {
+        'email': f'limited.{number}@example.com',
+        'password': 'limited-pass-123',
+        'user_type': 'candidate',
+        'first_name': 'Rate',
+        'last_name': 'Limited',
+    }
+
+
+class TestAlgorithms:
+    def test_parse_rate(self):
+        assert parse_rate('100/day') == (100, 86400)
+        assert parse_rate('5/m') == (5, 60)
+
+    def test_sliding_window_blocks_at_the_limit(self):
+        state = None
+        outcomes = []
+        for offset in range(4):
+            state, allowed = sliding_window(state, 3, 60, 600 + offset)
+            outcomes.append(allowed)
+        assert outcomes == [True, True, True, False]
+
+    def test_sliding_window_weights_the_previous_window(self):
+        state = (600, 10, 0)
+        # A quarter into the next window, 75% of the previous 10 hits still count
+        state, allowed = sliding_window(state, 10, 60, 675)
+        assert allowed and state == (660, 1, 10)
+        assert sliding_window(state, 10, 60, 675)[1]
+        assert not sliding_window((660, 3, 10), 10, 60, 675)[1]
+
+    def test_sliding_window_reset(self):
+        # Blocked by decaying previous hits: allowed again once enough of them fall out
+        result = sliding_window_result(False, 3, 10, 10, 60, 675)
+        assert (result.remaining, result.reset) == (0, 9)
+        assert sliding_window((660, 3, 10), 10, 60, 675 + result.reset)[1]
+
+    def test_token_bucket_refills(self):
+        state = None
+        for _ in range(5):
+            state, allowed = token_bucket(state, 5, 1.0, 100.0)
+            assert allowed
+        state, allowed = token_bucket(state, 5, 1.0, 100.0)
+        assert not allowed
+        state, allowed = token_bucket(state, 5, 1.0, 101.5)
+        assert allowed and state[0] == pytest.approx(0.5)
+
+
+class TestSQLiteBackend:
+    def test_counters_are_shared_between_processes(self, settings, tmp_path):
+        path = str(tmp_path / 'shared.sqlite3')
+        first, second = SQLiteRateLimitBackend(path), SQLiteRateLimitBackend(path)
+        assert first.hit_sliding_window('k', 3, 60).remaining == 2
+        assert second.hit_sliding_window('k', 3, 60).remaining == 1
+        assert first.hit_sliding_window('k', 3, 60).allowed
+        result = second.hit_sliding_window('k', 3, 60)
+        assert not result.allowed and result.remaining == 0
+
+    def test_concurrent_hits_are_atomic(self, tmp_path):
+        backend = SQLiteRateLimitBackend(str(tmp_path / 'shared.sqlite3'))
+        allowed = []
+
+        def worker():
+            for _ in range(25):
+                allowed.append(backend.hit_token_bucket('k', 50, 0.001, 3600).allowed)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert allowed.count(True) == 50
+
+    def test_unreachable_store(self, tmp_path):
+        backend = SQLiteRateLimitBackend(str(tmp_path / 'missing' / 'ratelimit.sqlite3'))
+        with pytest.raises(RateLimitUnavailable):
+            backend.hit_sliding_window('k', 3, 60)
+
+    def test_redis_outage_falls_back_to_local_store(self, settings):
+        settings.RATE_LIMIT_REDIS_URL = 'redis://127.0.0.1:1/0'
+        settings.RATE_LIMITS = {'test': {'algorithm': 'sliding_window', 'rate': '2/minute'}}
+        assert ratelimit.hit('test', 'someone').remaining == 1
+        assert ratelimit.hit('test', 'someone').remaining == 0
+        assert not ratelimit.hit('test', 'someone').allowed
+
+
+@pytest.mark.django_db
+class TestScopedThrottle:
+    def test_registration_is_limited_per_ip(self, api_client, settings):
+        settings.RATE_LIMITS = {**settings.RATE_LIMITS, 'register': {'rate': '2/hour', 'key': 'ip'}}
+        url = reverse('user-list')
+        first = api_client.post(url, registration(1))
+        assert first.status_code == status.HTTP_201_CREATED
+        assert first['RateLimit-Limit'] == '2'
+        assert first['RateLimit-Remaining'] == '1'
+        assert first['RateLimit-Policy'] == '2;w=3600'
+        assert api_client.post(url, registration(2)).status_code == status.HTTP_201_CREATED
+
+        blocked = api_client.post(url, registration(3))
+        assert blocked.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert blocked['RateLimit-Remaining'] == '0'
+        assert int(blocked['Retry-After']) == int(blocked['RateLimit-Reset']) > 0
+
+    def test_other_user_actions_are_not_limited(self, api_client, user_factory, settings):
+        settings.RATE_LIMITS = {**settings.RATE_LIMITS, 'delete': {'rate': '1/day', 'key': 'user'}}
+        user = user_factory()
+        api_client.force_authenticate(user=user)
+        for _ in range(3):
+            response = api_client.get(reverse('user-me'))
+            assert response.status_code == status.HTTP_200_OK
+            assert 'RateLimit-Limit' not in response
+
+    def test_applications_use_token_bucket_per_user(self, api_client, user_factory, job_factory, settings):
+        settings.RATE_LIMITS = {
+            **settings.RATE_LIMITS,
+            'apply': {'algorithm': 'token_bucket', 'rate': '10/hour', 'burst': 2, 'key': 'user'},
+        }
+        candidate = user_factory()
+        api_client.force_authenticate(user=candidate)
+        url = reverse('application-list')
+        responses = [api_client.post(url, {'job': job_factory().id}) for _ in range(3)]
+        assert [r.status_code for r in responses] == [201, 201, 429]
+        assert responses[0]['RateLimit-Limit'] == '2'
+
+        api_client.force_authenticate(user=user_factory())
+        assert api_client.post(url, {'job': job_factory().id}).status_code == status.HTTP_201_CREATED
+
+    def test_anon_list_scope_skips_authenticated_users(self, api_client, user_factory, settings):
+        settings.RATE_LIMITS = {**settings.RATE_LIMITS, 'anon_list': {'rate': '1/hour', 'key': 'anon'}}
+        url = reverse('job-list')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        assert api_client.get(url).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        api_client.force_authenticate(user=user_factory())
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_disabled(self, api_client, settings):
+        settings.RATE_LIMIT_ENABLED = False
+        settings.RATE_LIMITS = {**settings.RATE_LIMITS, 'anon_list': {'rate': '1/hour', 'key': 'anon'}}
+        for _ in range(3):
+            assert api_client.get(reverse('job-list')).status_code == status.HTTP_200_OK
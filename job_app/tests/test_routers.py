@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from django.db import OperationalError
+from django.db.models import Manager
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from job_app import routers
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    routers.reset_replica_health()
+    yield 'replica'
+    routers.reset_replica_health()
+
+
+# The replica alias is a separately migrated empty database (see conftest), so
+# rows created through the ORM exist only on the primary
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestReplicaRouting:
+    def test_reads_go_to_the_replica(self, api_client, replica, user_factory, job_factory):
+        job_factory()
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.get(reverse('job-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+    def test_without_replicas_reads_use_the_primary(self, api_client, user_factory, job_factory):
+        job_factory()
+        api_client.force_authenticate(user=user_factory())
+        assert len(api_client.get(reverse('job-list')).data) == 1
+
+    def test_unlisted_actions_use_the_primary(self, api_client, replica, employer_factory, job_factory):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer, company=employer.company)
+        api_client.force_authenticate(user=employer)
+        response = api_client.get(reverse('job-applications', args=[job.id]))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_writes_pin_the_user_to_the_primary(self, api_client, replica, employer_factory, user_factory):
+        employer = employer_factory()
+        api_client.force_authenticate(user=employer)
+        response = api_client.post(reverse('job-list'), {
+            'title': 'Pinned', 'job_type': 'FT', 'description': 'Read your writes',
+            'location': 'Here', 'salary': 50000, 'company': employer.company_id,
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+
+        # The writer sees their job straight away...
+        assert len(api_client.get(reverse('job-my-jobs')).data) == 1
+        # ...other users keep reading from the replica
+        api_client.force_authenticate(user=user_factory())
+        assert len(api_client.get(reverse('job-list')).data) == 0
+
+    def test_pin_expires(self, api_client, replica, settings, user_factory, job_factory):
+        settings.REPLICA_PIN_SECONDS = 0.01
+        user = user_factory()
+        job_factory()
+        routers.pin_to_primary(user.pk)
+        api_client.force_authenticate(user=user)
+        assert len(api_client.get(reverse('job-list')).data) == 1
+
+        time.sleep(0.05)
+        assert len(api_client.get(reverse('job-list')).data) == 0
+
+    def test_unhealthy_replica_is_ejected(self, api_client, replica, monkeypatch, user_factory, job_factory):
+        def unreachable(connection):
+            raise OperationalError('connection refused')
+
+        monkeypatch.setattr(routers, 'replication_lag', unreachable)
+        job_factory()
+        api_client.force_authenticate(user=user_factory())
+        assert len(api_client.get(reverse('job-list')).data) == 1
+        assert not routers.replica_is_healthy('replica')
+
+    def test_lagging_replica_is_ejected(self, replica, settings, monkeypatch):
+        monkeypatch.setattr(routers, 'replication_lag', lambda connection: settings.REPLICA_MAX_LAG + 1)
+        assert routers.choose_replica() is None
+
+    def test_health_is_probed_once_per_interval(self, replica, monkeypatch):
+        probes = []
+        monkeypatch.setattr(routers, 'replication_lag', lambda connection: probes.append(connection.alias))
+        for _ in range(3):
+            assert routers.choose_replica() == 'replica'
+        assert probes == ['replica']
+
+    def test_errors_on_the_replica_retry_on_the_primary(self, api_client, replica, monkeypatch, user_factory, job_factory):
+        job_factory()
+        api_client.force_authenticate(user=user_factory())
+        original = Manager.get_queryset
+
+        def flaky(self):
+            if routers._replica.get() == 'replica':
+                raise OperationalError('replica went away')
+            return original(self)
+
+        monkeypatch.setattr(Manager, 'get_queryset', flaky)
+        assert len(api_client.get(reverse('job-list')).data) == 1
+        assert routers.choose_replica() is None
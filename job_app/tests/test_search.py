@@ -0,0 +1,279 @@
+import json
+import re
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from elastic_transport import ApiResponseMeta, BaseNode, ConnectionError, HttpHeaders
+from elastic_transport._node import NodeApiResponse
+from job_app.models import Job, OutboxEvent, SearchIndexState
+from job_app.tasks import remove_jobs_from_search_index
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.mark.django_db
+class TestJobSearch:
+    def search(self, api_client, **params):
+        return api_client.get(reverse('job-search'), params)
+
+    def test_ranks_title_matches_first(self, api_client, job_factory):
+        in_description = job_factory(title='Accountant', description='Some Django exposure helps')
+        in_title = job_factory(title='Senior Django Developer')
+        job_factory(title='Nurse', description='Night shifts')
+
+        response = self.search(api_client, q='django')
+        assert response.status_code == status.HTTP_200_OK
+        assert [j['id'] for j in response.data] == [in_title.id, in_description.id]
+
+    def test_matches_company_name_and_prefixes(self, api_client, company_factory, job_factory):
+        job = job_factory(company=company_factory(name='Initech'))
+        job_factory(title='Developer')
+
+        response = self.search(api_client, q='inite')
+        assert [j['id'] for j in response.data] == [job.id]
+
+    def test_excludes_inactive_and_applies_filters(self, api_client, job_factory):
+        job_factory(title='Python Developer', is_active=False)
+        job_factory(title='Python Developer', job_type='PT')
+        full_time = job_factory(title='Python Developer', job_type='FT')
+
+        response = self.search(api_client, q='python', job_type='FT')
+        assert [j['id'] for j in response.data] == [full_time.id]
+
+    def test_index_follows_updates_and_deletes(self, api_client, job_factory):
+        job = job_factory(title='Plumber')
+        job.title = 'Electrician'
+        job.save()
+        assert self.search(api_client, q='plumber').data == []
+        assert [j['id'] for j in self.search(api_client, q='electrician').data] == [job.id]
+
+        job.company.name = 'Globex'
+        job.company.save()
+        assert [j['id'] for j in self.search(api_client, q='globex').data] == [job.id]
+
+        job.delete()
+        assert self.search(api_client, q='electrician').data == []
+
+    def test_company_edits_other_than_name_leave_jobs_alone(self, job_factory):
+        job = job_factory()
+        Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        updated_at = Job.objects.get(pk=job.pk).updated_at
+
+        company = job.company
+        company.website = 'https://example.org'
+        company.save()
+        company.description = 'Changed'
+        company.save(update_fields=['description'])
+        assert Job.objects.get(pk=job.pk).updated_at == updated_at
+
+        company.name = 'Renamed'
+        company.save()
+        assert Job.objects.get(pk=job.pk).updated_at > updated_at
+
+    def test_query_syntax_is_escaped(self, api_client, job_factory):
+        job_factory(title='C++ Engineer')
+        response = self.search(api_client, q='"c++" OR (')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_requires_query(self, api_client):
+        response = self.search(api_client)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rebuild_search_index(self, api_client, job_factory):
+        job = job_factory(title='Welder')
+        Job.objects.filter(pk=job.pk).update(title='Carpenter')
+
+        call_command('rebuild_search_index')
+        assert [j['id'] for j in self.search(api_client, q='carpenter').data] == [job.id]
+
+
+class FakeElasticsearchNode(BaseNode):
+    """In-process stand-in for a single Elasticsearch node"""
+    indices = {}
+    aliases = {}
+    available = True
+    bulk_requests = 0
+
+    @classmethod
+    def resolve(cls, name):
+        return cls.aliases.get(name, name)
+
+    @classmethod
+    def documents(cls, name):
+        return cls.indices[cls.resolve(name)]
+
+    def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+        if not FakeElasticsearchNode.available:
+            raise ConnectionError('fake cluster is down')
+        parts = [part for part in target.partition('?')[0].split('/') if part]
+        status_code, data = self.handle(method, parts, body)
+        meta = ApiResponseMeta(
+            status=status_code,
+            http_version='1.1',
+            headers=HttpHeaders({'content-type': 'application/json', 'x-elastic-product': 'Elasticsearch'}),
+            duration=0.0,
+            node=self.config,
+        )
+        return NodeApiResponse(meta, json.dumps(data).encode())
+
+    def handle(self, method, parts, body):
+        indices = FakeElasticsearchNode.indices
+        aliases = FakeElasticsearchNode.aliases
+        if parts[0] == '_alias':
+            if parts[1] not in aliases:
+                return 404, {'error': 'alias missing', 'status': 404}
+            return 200, {aliases[parts[1]]: {'aliases': {parts[1]: {}}}}
+        if parts[0] == '_aliases':
+            for action in json.loads(body)['actions']:
+                (kind, args), = action.items()
+                if kind == 'add':
+                    aliases[args['alias']] = args['index']
+                elif kind == 'remove':
+                    aliases.pop(args['alias'], None)
+                else:
+                    indices.pop(args['index'], None)
+            return 200, {'acknowledged': True}
+        name = FakeElasticsearchNode.resolve(parts[0])
+        if parts[-1] == '_bulk':
+            FakeElasticsearchNode.bulk_requests += 1
+            lines = [json.loads(line) for line in body.decode().splitlines() if line]
+            items = []
+            while lines:
+                action, meta = lines.pop(0).popitem()
+                docs = indices.setdefault(FakeElasticsearchNode.resolve(meta['_index']), {})
+                if action == 'index':
+                    docs[str(meta['_id'])] = lines.pop(0)
+                    items.append({'index': {'_id': meta['_id'], 'status': 201}})
+                else:
+                    found = docs.pop(str(meta['_id']), None) is not None
+                    items.append({'delete': {'_id': meta['_id'], 'status': 200 if found else 404}})
+            return 200, {'errors': False, 'items': items}
+        if parts[-1] == '_search':
+            if name not in indices:
+                return 404, {'error': {'type': 'index_not_found_exception'}, 'status': 404}
+            query = json.loads(body)
+            terms = re.findall(r'\w+', query['query']['multi_match']['query'].lower())
+            hits = []
+            for doc_id, doc in indices[name].items():
+                text = ' '.join(str(doc[field]) for field in ('title', 'description', 'location', 'company_name')).lower()
+                score = float(sum(text.count(term) for term in terms))
+                if score:
+                    hits.append({'_id': str(doc_id), '_score': score})
+            hits.sort(key=lambda hit: -hit['_score'])
+            return 200, {'hits': {'hits': hits[:query['size']]}}
+        if method == 'HEAD':
+            return (200 if name in indices else 404), {}
+        if method == 'PUT':
+            indices[name] = {}
+            for alias in json.loads(body or '{}').get('aliases', {}):
+                aliases[alias] = name
+            return 200, {'acknowledged': True}
+        if method == 'DELETE':
+            indices.pop(name, None)
+            return 200, {'acknowledged': True}
+        return 400, {'error': f'unsupported {method} {parts}'}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def elasticsearch(settings):
+    FakeElasticsearchNode.indices = {}
+    FakeElasticsearchNode.aliases = {}
+    FakeElasticsearchNode.available = True
+    FakeElasticsearchNode.bulk_requests = 0
+    settings.ELASTICSEARCH_URL = 'http://es.test:9200'
+    settings.ELASTICSEARCH_CLIENT_OPTIONS = {'node_class': FakeElasticsearchNode, 'max_retries': 0}
+    settings.JOB_SEARCH_BACKEND = 'job_app.search.elastic.ElasticsearchSearchBackend'
+    return FakeElasticsearchNode
+
+
+@pytest.mark.django_db
+class TestElasticsearchIndexing:
+    def test_reindex_streams_active_jobs_in_bulk_batches(self, elasticsearch, job_factory):
+        jobs = [job_factory(title=f'Job {i}') for i in range(5)]
+        job_factory(is_active=False)
+
+        call_command('reindex_jobs', batch_size=2)
+
+        docs = elasticsearch.documents('jobs')
+        assert sorted(int(doc_id) for doc_id in docs) == sorted(job.id for job in jobs)
+        assert elasticsearch.bulk_requests == 3
+        assert docs[str(jobs[0].id)]['job_type_display'] == 'Full-time'
+        assert docs[str(jobs[0].id)]['company_name'] == jobs[0].company.name
+        assert SearchIndexState.objects.get(index_name='jobs').synced_until is not None
+
+    def test_incremental_sync_uses_watermark(self, elasticsearch, job_factory):
+        untouched = job_factory(title='Untouched')
+        closed = job_factory(title='Closed')
+        call_command('reindex_jobs')
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        # Dropping the doc out of band shows unchanged jobs are not re-sent
+        del elasticsearch.documents('jobs')[str(untouched.id)]
+
+        closed.is_active = False
+        closed.save()
+        new = job_factory(title='New')
+
+        call_command('reindex_jobs', incremental=True)
+        assert list(elasticsearch.documents('jobs')) == [str(new.id)]
+
+    def test_reindex_swaps_the_alias_onto_a_new_index(self, elasticsearch, job_factory):
+        job = job_factory(title='Welder')
+        elasticsearch.indices['jobs'] = {'stale': {}}  # Built before indices were aliased
+
+        call_command('reindex_jobs')
+        first = elasticsearch.resolve('jobs')
+        assert first != 'jobs' and list(elasticsearch.indices) == [first]
+
+        call_command('reindex_jobs')
+        second = elasticsearch.resolve('jobs')
+        assert second != first and list(elasticsearch.indices) == [second]
+        assert list(elasticsearch.documents('jobs')) == [str(job.id)]
+
+    def test_company_rename_reaches_the_index(self, elasticsearch, job_factory):
+        job = job_factory(title='Welder')
+        call_command('reindex_jobs')
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        SearchIndexState.objects.update(synced_until=timezone.now() - timedelta(minutes=30))
+
+        job.company.name = 'Renamed Ltd'
+        job.company.save()
+        call_command('reindex_jobs', incremental=True)
+        assert elasticsearch.documents('jobs')[str(job.id)]['company_name'] == 'Renamed Ltd'
+
+    def test_deleted_jobs_leave_the_index(self, elasticsearch, job_factory):
+        kept, deleted = job_factory(title='Kept'), job_factory(title='Deleted')
+        call_command('reindex_jobs')
+
+        deleted_id = deleted.id
+        deleted.delete()
+        event = OutboxEvent.objects.get(task=remove_jobs_from_search_index.name)
+        remove_jobs_from_search_index(*event.args)
+        assert list(elasticsearch.documents('jobs')) == [str(kept.id)]
+        assert event.args == [[deleted_id]]
+
+    def test_search_endpoint_uses_index(self, api_client, elasticsearch, job_factory):
+        job = job_factory(title='Kotlin Developer')
+        job_factory(title='Barista')
+        call_command('reindex_jobs')
+
+        response = api_client.get(reverse('job-search'), {'q': 'kotlin'})
+        assert [j['id'] for j in response.data] == [job.id]
+
+    def test_search_falls_back_to_database(self, api_client, elasticsearch, job_factory):
+        job = job_factory(title='Kotlin Developer')
+        elasticsearch.available = False
+
+        response = api_client.get(reverse('job-search'), {'q': 'kotlin'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [j['id'] for j in response.data] == [job.id]
@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+from job_app.models import Application, Company, Job, User
+from job_app.search import get_database_search_backend
+from job_app.seeding import job_rows, run_batch, set_context
+
+
+@pytest.mark.django_db
+class TestSeedCommands:
+    def seed(self, **options):
+        call_command('seed_companies', count=5, seed='s', **options)
+        call_command('seed_users', count=10, seed='s', resume_ratio=0, **options)
+        call_command('seed_jobs', count=40, seed='s', **options)
+        call_command('seed_applications', count=60, seed='s', **options)
+
+    def test_bulk_seed_is_consistent(self):
+        self.seed(batch_size=7)
+
+        assert Company.objects.count() == 5
+        assert User.objects.filter(user_type='employer').count() == 10
+        assert User.objects.filter(user_type='candidate').count() == 10
+        assert Job.objects.count() == 40
+        # Pairs skipped as duplicates are topped up
+        assert Application.objects.count() == 60
+        # Timestamps are spread out, and nobody applies before the job was posted
+        assert Job.objects.values('created_at').distinct().count() == 40
+        assert Application.objects.values('applied_at').distinct().count() == 60
+        assert not Application.objects.filter(applied_at__lt=F('job__created_at')).exists()
+        # Counters and the search index are rebuilt after the bulk inserts
+        for job in Job.objects.all():
+            assert job.applications_count == job.applications.count()
+        job = Job.objects.first()
+        assert job in get_database_search_backend().search(Job.objects.all(), job.title)
+
+    def test_generation_is_deterministic_per_batch(self):
+        set_context({'companies': [(1, 'Acme Corp')], 'employer_ids': [1, 2, 3], 'now': timezone.now()})
+        first = run_batch(job_rows, 'seed', 3, 300, 25)
+        again = run_batch(job_rows, 'seed', 3, 300, 25)
+        other = run_batch(job_rows, 'seed', 4, 325, 25)
+        assert first == again
+        assert first != other
+
+    def test_default_count_is_per_candidate(self):
+        call_command('seed_companies', count=2, seed='s')
+        call_command('seed_users', count=4, seed='s', resume_ratio=0)
+        call_command('seed_jobs', count=30, seed='s')
+        call_command('seed_applications', seed='s')
+        assert 3 * 4 <= Application.objects.count() <= 10 * 4
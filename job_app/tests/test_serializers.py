@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from job_app.fast_serializers import compile_serializer
+from job_app.models import Application, Job
+from job_app.serializers import ApplicationListSerializer, JobListSerializer
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestCompiledSerializers:
+    @pytest.fixture
+    def context(self):
+        return {'request': Request(RequestFactory().get('/api/v1/'))}
+
+    def test_job_list_output_is_byte_identical(self, context, company_factory, job_factory):
+        job_factory(company=company_factory(logo='company_logos/logo.png'), salary='1234.5', job_type='INT')
+        job_factory()
+        queryset = Job.objects.select_related('company', 'posted_by')
+
+        compiled = compile_serializer(JobListSerializer)
+        fast = compiled.serialize(queryset.values(*compiled.paths), context)
+        assert render(fast) == render(JobListSerializer(queryset, many=True, context=context).data)
+
+    def test_application_list_output_is_byte_identical(self, context, application_factory):
+        application_factory(status='INT')
+        application_factory()
+        queryset = Application.objects.select_related('job__company', 'job__posted_by', 'candidate')
+
+        compiled = compile_serializer(ApplicationListSerializer)
+        fast = compiled.serialize(queryset.values(*compiled.paths), context)
+        assert render(fast) == render(ApplicationListSerializer(queryset, many=True, context=context).data)
+
+    def test_endpoints_match_with_fast_path_enabled(self, settings, application_factory):
+        application = application_factory()
+        client = APIClient()
+        client.force_authenticate(user=application.candidate)
+        urls = [reverse('job-list'), reverse('job-list') + '?page_size=1', reverse('application-my-applications')]
+
+        settings.FAST_LIST_SERIALIZERS = False
+        expected = [client.get(url).content for url in urls]
+        settings.FAST_LIST_SERIALIZERS = True
+        assert [client.get(url).content for url in urls] == expected
+
+    def test_benchmark_command(self, application_factory, capsys):
+        application_factory()
+        call_command('benchmark_serializers', rows=10, repeat=1)
+        out = capsys.readouterr().out
+        assert 'jobs: 1 rows, identical JSON' in out
+        assert 'applications: 1 rows, identical JSON' in out
@@ -1,8 +1,13 @@
+import csv
+import io
+import json
 import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from job_app.models import User, Job, Application
+from job_app.fast_serializers import compile_serializer
+from job_app.models import User, Job, Application, ApplicationStatusChange
+from job_app.serializers import JobListSerializer
 
 @pytest.fixture
 def api_client():
@@ -68,3 +73,311 @@ class TestApplicationViews:
         url = reverse('application-list')
         response = api_client.post(url, {'job': app.job.id})
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+class TestJobPagination:
+    def test_unpaginated_by_default(self, api_client, job_factory):
+        for _ in range(3):
+            job_factory()
+        response = api_client.get(reverse('job-list'))
+        assert isinstance(response.data, list)
+
+    def test_walks_pages_forward_and_back(self, api_client, job_factory):
+        jobs = [job_factory() for _ in range(5)]
+        url = reverse('job-list')
+
+        first = api_client.get(url, {'page_size': 2})
+        assert [j['id'] for j in first.data['results']] == [jobs[4].id, jobs[3].id]
+        assert first.data['previous'] is None
+
+        second = api_client.get(first.data['next'])
+        assert [j['id'] for j in second.data['results']] == [jobs[2].id, jobs[1].id]
+
+        third = api_client.get(second.data['next'])
+        assert [j['id'] for j in third.data['results']] == [jobs[0].id]
+        assert third.data['next'] is None
+
+        back = api_client.get(third.data['previous'])
+        assert [j['id'] for j in back.data['results']] == [jobs[2].id, jobs[1].id]
+
+    def test_ties_on_created_at_are_stable(self, api_client, job_factory):
+        jobs = [job_factory() for _ in range(4)]
+        Job.objects.update(created_at=jobs[0].created_at)
+        url = reverse('job-list')
+
+        seen = []
+        response = api_client.get(url, {'page_size': 3})
+        seen += [j['id'] for j in response.data['results']]
+        response = api_client.get(response.data['next'])
+        seen += [j['id'] for j in response.data['results']]
+        assert seen == sorted(job.id for job in jobs)
+
+    def test_filters_apply_to_pages(self, api_client, job_factory):
+        job_factory(job_type='PT')
+        job_factory(job_type='FT')
+        response = api_client.get(reverse('job-list'), {'page_size': 10, 'job_type': 'PT'})
+        assert [j['job_type'] for j in response.data['results']] == ['PT']
+
+    def test_invalid_cursor(self, api_client):
+        response = api_client.get(reverse('job-list'), {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db
+class TestCompactJobList:
+    def test_side_loads_companies_and_employers_once(self, api_client, company_factory, employer_factory, job_factory):
+        company = company_factory(description='Long description ' * 50)
+        employer = employer_factory(company=company)
+        jobs = [job_factory(company=company, posted_by=employer) for _ in range(3)]
+
+        response = api_client.get(reverse('job-list'), {'view': 'compact'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [j['id'] for j in response.data['results']] == [job.id for job in reversed(jobs)]
+        assert {j['company'] for j in response.data['results']} == {company.id}
+        assert list(response.data['companies']) == [str(company.id)]
+        assert 'description' not in response.data['companies'][str(company.id)]
+        assert response.data['employers'][str(employer.id)]['first_name'] == employer.first_name
+
+    def test_constant_queries(self, api_client, job_factory, django_assert_num_queries):
+        for _ in range(5):
+            job_factory()
+        # jobs, companies, employers
+        with django_assert_num_queries(3):
+            api_client.get(reverse('job-list'), {'view': 'compact'})
+
+    def test_paginated(self, api_client, job_factory):
+        for _ in range(3):
+            job_factory()
+        response = api_client.get(reverse('job-list'), {'view': 'compact', 'page_size': 2})
+        assert len(response.data['results']) == 2
+        assert len(response.data['companies']) == 2
+        assert response.data['next'] is not None
+
+
+@pytest.mark.django_db
+class TestExports:
+    def test_job_export_streams_ndjson(self, api_client, settings, job_factory):
+        settings.EXPORT_CHUNK_SIZE = 2
+        jobs = [job_factory() for _ in range(5)]
+        job_factory(is_active=False)
+
+        response = api_client.get(reverse('job-export'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'].startswith('attachment; filename="jobs-')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row['id'] for row in rows] == [job.id for job in jobs]
+        assert rows[0]['company']['name'] == jobs[0].company.name
+
+    def test_application_export_csv_is_scoped_to_employer(self, api_client, application_factory):
+        application = application_factory()
+        application_factory()
+        api_client.force_authenticate(user=application.job.posted_by)
+
+        response = api_client.get(reverse('application-export'), {'file_format': 'csv'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert len(rows) == 1
+        assert rows[0]['id'] == str(application.id)
+        assert rows[0]['job.company.name'] == application.job.company.name
+        assert rows[0]['candidate.email'] == application.candidate.email
+
+    def test_csv_export_defuses_formulas(self, api_client, application_factory):
+        application = application_factory(cover_letter='=HYPERLINK("http://evil.example","Click")')
+        api_client.force_authenticate(user=application.job.posted_by)
+
+        response = api_client.get(reverse('application-export'), {'file_format': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert rows[0]['cover_letter'] == '\'=HYPERLINK("http://evil.example","Click")'
+        assert rows[0]['id'] == str(application.id)
+
+    def test_export_rejects_unknown_format(self, api_client):
+        response = api_client.get(reverse('job-export'), {'file_format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestApplicationListQueries:
+    """Application lists must not issue per-row queries as they grow"""
+
+    @pytest.fixture
+    def employer_with_applications(self, employer_factory, job_factory, user_factory):
+        def create(count):
+            employer = employer_factory()
+            job = job_factory(posted_by=employer)
+            for _ in range(count):
+                Application.objects.create(job=job, candidate=user_factory(user_type='candidate'))
+            return employer, job
+        return create
+
+    @pytest.mark.parametrize('count', [1, 10])
+    def test_application_list(self, api_client, employer_with_applications, django_assert_num_queries, count):
+        employer, _ = employer_with_applications(count)
+        api_client.force_authenticate(user=employer)
+        # page count + page
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('application-list'))
+        assert len(response.data['results']) == count
+
+    @pytest.mark.parametrize('count', [1, 10])
+    def test_job_applications(self, api_client, employer_with_applications, django_assert_num_queries, count):
+        employer, job = employer_with_applications(count)
+        api_client.force_authenticate(user=employer)
+        # job lookup + applications
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('job-applications', args=[job.id]))
+        assert len(response.data) == count
+        assert response.data[0]['job']['company']['name'] == job.company.name
+
+    @pytest.mark.parametrize('count', [1, 10])
+    def test_my_applications(self, api_client, application_factory, user_factory, django_assert_num_queries, count):
+        candidate = user_factory(user_type='candidate')
+        for _ in range(count):
+            application_factory(candidate=candidate)
+        api_client.force_authenticate(user=candidate)
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse('application-my-applications'))
+        assert len(response.data) == count
+        assert 'description' not in response.data[0]['job']
+
+    def test_list_columns_follow_the_serializer(
+        self, api_client, application_factory, user_factory, django_assert_num_queries, monkeypatch
+    ):
+        monkeypatch.setattr(JobListSerializer.Meta, 'fields', [*JobListSerializer.Meta.fields, 'description'])
+        compile_serializer.cache_clear()
+        candidate = user_factory(user_type='candidate')
+        application_factory(candidate=candidate)
+        api_client.force_authenticate(user=candidate)
+        try:
+            with django_assert_num_queries(1):
+                response = api_client.get(reverse('application-my-applications'))
+        finally:
+            compile_serializer.cache_clear()
+        assert 'description' in response.data[0]['job']
+
+
+@pytest.mark.django_db
+class TestCompanyStats:
+    def test_counts(self, api_client, company_factory, job_factory, application_factory):
+        company = company_factory()
+        job = job_factory(company=company)
+        job_factory(company=company, is_active=False)
+        application_factory(job=job)
+        application_factory(job=job, status='INT')
+        application_factory(job=job, status='REJ')
+        empty = company_factory()
+
+        response = api_client.get(reverse('company-detail', args=[company.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['jobs_count'] == 2
+        assert response.data['active_jobs_count'] == 1
+        assert response.data['open_applications_count'] == 2
+
+        listed = {c['id']: c for c in api_client.get(reverse('company-list')).data['results']}
+        assert listed[company.id]['open_applications_count'] == 2
+        assert listed[empty.id]['jobs_count'] == listed[empty.id]['active_jobs_count'] == 0
+
+    @pytest.mark.parametrize('jobs', [1, 10])
+    def test_list_queries_do_not_grow_with_jobs(self, api_client, company_factory, job_factory,
+                                                django_assert_num_queries, jobs):
+        for _ in range(3):
+            company = company_factory()
+            for _ in range(jobs):
+                job_factory(company=company)
+        # page count + page
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('company-list'))
+        assert {c['jobs_count'] for c in response.data['results']} == {jobs}
+
+    def test_create_reports_zero_counts(self, api_client, employer_factory):
+        api_client.force_authenticate(user=employer_factory())
+        response = api_client.post(reverse('company-list'), {'name': 'Fresh Co'})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['jobs_count'] == response.data['open_applications_count'] == 0
+
+
+@pytest.mark.django_db
+class TestBulkStatusUpdate:
+    @pytest.fixture
+    def employer_applications(self, employer_factory, job_factory, user_factory):
+        employer = employer_factory()
+        job = job_factory(posted_by=employer)
+        applications = [
+            Application.objects.create(job=job, candidate=user_factory(), status=app_status)
+            for app_status in ('APP', 'APP', 'INT', 'REJ')
+        ]
+        return employer, applications
+
+    def test_updates_owned_applications_by_id(
+        self, api_client, employer_applications, application_factory, django_assert_max_num_queries
+    ):
+        employer, (first, second, interviewing, rejected) = employer_applications
+        foreign = application_factory()
+        api_client.force_authenticate(user=employer)
+
+        ids = [first.id, second.id, interviewing.id, rejected.id, foreign.id]
+        with django_assert_max_num_queries(8):
+            response = api_client.post(
+                reverse('application-bulk-update-status'), {'status': 'INT', 'ids': ids}, format='json'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 2
+        assert [(row['id'], row['result']) for row in response.data['results']] == [
+            (first.id, 'updated'),
+            (second.id, 'updated'),
+            (interviewing.id, 'unchanged'),
+            (rejected.id, 'invalid'),
+            (foreign.id, 'not_found'),
+        ]
+        statuses = dict(Application.objects.values_list('id', 'status'))
+        assert statuses[first.id] == statuses[second.id] == 'INT'
+        assert statuses[rejected.id] == 'REJ'
+        assert statuses[foreign.id] == 'APP'
+        assert ApplicationStatusChange.objects.count() == 2
+
+    def test_updates_by_filter(self, api_client, employer_applications):
+        employer, applications = employer_applications
+        api_client.force_authenticate(user=employer)
+
+        response = api_client.post(
+            reverse('application-bulk-update-status'),
+            {'status': 'REJ', 'filter': {'status': 'APP', 'job': applications[0].job_id}},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 2
+        assert Application.objects.filter(status='REJ').count() == 3
+
+    @pytest.mark.parametrize('payload', [
+        {'status': 'INT'},
+        {'status': 'INT', 'ids': [1], 'filter': {'status': 'APP'}},
+        {'status': 'XXX', 'ids': [1]},
+        {'status': 'INT', 'filter': {'cover_letter': 'x'}},
+        {'status': 'INT', 'filter': {'job': 'abc'}},
+    ])
+    def test_rejects_invalid_payloads(self, api_client, employer_factory, payload):
+        api_client.force_authenticate(user=employer_factory())
+        response = api_client.post(reverse('application-bulk-update-status'), payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_filter_over_limit_is_rejected(self, api_client, settings, employer_applications):
+        settings.BULK_STATUS_UPDATE_MAX = 2
+        employer, applications = employer_applications
+        api_client.force_authenticate(user=employer)
+        response = api_client.post(
+            reverse('application-bulk-update-status'),
+            {'status': 'REV', 'filter': {'job': applications[0].job_id}},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Application.objects.filter(status='REV').exists()
+
+    def test_candidates_are_forbidden(self, api_client, user_factory):
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.post(
+            reverse('application-bulk-update-status'), {'status': 'REV', 'ids': [1]}, format='json'
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
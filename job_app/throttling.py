@@ -1,4 +1,76 @@
-from rest_framework.throttling import UserRateThrottle
+import logging
 
-class DeleteThrottle(UserRateThrottle):
-    rate = '100/day' 
\ No newline at end of file
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from .ratelimit import RateLimitUnavailable, hit
+
+logger = logging.getLogger(__name__)
+
+
+class ScopedRateLimitThrottle(BaseThrottle):
+    """
+    Applies ``settings.RATE_LIMITS[scope]`` to the actions a view maps in
+    ``rate_limit_scopes``: ``{'create': 'register', 'me:DELETE': 'delete'}``.
+    Action keys may carry a method suffix; actions without a scope are not limited.
+
+    A scope's ``key`` counts requests per ``user`` (falling back to the client
+    address for anonymous requests), per ``ip``, or only for ``anon`` requests.
+    """
+
+    def get_scope(self, request, view):
+        scopes = getattr(view, 'rate_limit_scopes', {})
+        action = getattr(view, 'action', None)
+        return scopes.get(f'{action}:{request.method}', scopes.get(action))
+
+    def get_identity(self, request, config):
+        key = config.get('key', 'user')
+        if request.user and request.user.is_authenticated:
+            if key == 'anon':
+                return None
+            if key == 'user':
+                return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.result = None
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        scope = self.get_scope(request, view)
+        if scope is None:
+            return True
+        identity = self.get_identity(request, settings.RATE_LIMITS[scope])
+        if identity is None:
+            return True
+
+        try:
+            self.result = hit(scope, identity)
+        except RateLimitUnavailable as exc:
+            # No store reachable at all: serve the request rather than fail it
+            logger.error(f"Rate limiting disabled for this request: {exc}")
+            return True
+        request.rate_limit = self.result
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.reset if self.result else None
+
+
+def add_rate_limit_headers(response, result):
+    response['RateLimit-Limit'] = str(result.limit)
+    response['RateLimit-Remaining'] = str(result.remaining)
+    response['RateLimit-Reset'] = str(result.reset)
+    response['RateLimit-Policy'] = f'{result.limit};w={result.window}'
+
+
+class RateLimitMixin:
+    """Scoped rate limits with RateLimit-* headers on limited responses"""
+    throttle_classes = [ScopedRateLimitThrottle]
+    rate_limit_scopes = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        result = getattr(request, 'rate_limit', None)
+        if result is not None:
+            add_rate_limit_headers(response, result)
+        return response
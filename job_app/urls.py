@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from django.http import JsonResponse
+from . import async_views
 from .views import (
     UserViewSet,
     CompanyViewSet,
@@ -22,6 +23,13 @@ router.register(r'applications', ApplicationViewSet, basename='application')
 urlpatterns = [
     # API v1 
     path('', include(router.urls)),
+
+    # Async read endpoints for the ASGI application
+    path('async/jobs/', async_views.job_list, name='async-job-list'),
+    path('async/jobs/search/', async_views.job_search, name='async-job-search'),
+    path('async/jobs/<int:pk>/', async_views.job_detail, name='async-job-detail'),
+    path('async/companies/', async_views.company_list, name='async-company-list'),
+    path('async/companies/<int:pk>/', async_views.company_detail, name='async-company-detail'),
     
     # Health Check
     path('health/', lambda request: JsonResponse({'status': 'ok'})),
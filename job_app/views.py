@@ -4,11 +4,22 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import Q
+from django.conf import settings
 from django.utils import timezone
 from .models import User, Company, Job, Application
 from django.contrib.auth import get_user_model
-from .throttling import DeleteThrottle
+from .throttling import RateLimitMixin
+from .routers import ReplicaRoutingMixin
+from . import outbox
+from .pagination import JobCursorPagination
+from .caching import CachedResponseMixin, ConditionalGetMixin, invalidate_model
+from .compact import CompactJobListMixin
+from .fast_serializers import FastListMixin
+from .events import record_status_changes
+from .exports import StreamingExportMixin
+from .search import SearchUnavailable, get_database_search_backend, get_search_backend
 from .serializers import (
     UserRegisterSerializer,
     UserProfileSerializer,
@@ -18,7 +29,8 @@ from .serializers import (
     JobCreateUpdateSerializer,
     ApplicationListSerializer,
     ApplicationCreateSerializer,
-    ApplicationUpdateSerializer
+    ApplicationUpdateSerializer,
+    ApplicationBulkStatusSerializer,
 )
 from .tasks import (
     send_application_confirmation_email,
@@ -36,12 +48,12 @@ from .permissions import (
 User = get_user_model()
 
 # ViewSets
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaRoutingMixin, RateLimitMixin, viewsets.ModelViewSet):
     queryset = User.objects.filter(is_active=True)  # Only show active users
     serializer_class = UserProfileSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']  # Disable put
     lookup_field = 'id'
-    throttle_classes = [DeleteThrottle]  # Rate limiting for deletions
+    rate_limit_scopes = {'create': 'register', 'destroy': 'delete', 'me:DELETE': 'delete'}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -105,9 +117,12 @@ class UserViewSet(viewsets.ModelViewSet):
         
         return Response(response_data, status=status.HTTP_201_CREATED)
     
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ReplicaRoutingMixin, RateLimitMixin, CachedResponseMixin, viewsets.ModelViewSet):
     serializer_class = CompanySerializer
-    queryset = Company.objects.prefetch_related('jobs')
+    cache_scopes = ('companies',)
+    rate_limit_scopes = {'list': 'anon_list'}
+    queryset = Company.objects.with_stats()
+    token_claims_actions = ('list', 'retrieve')
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['name']
 
@@ -116,10 +131,20 @@ class CompanyViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-class JobViewSet(viewsets.ModelViewSet):
-    pagination_class = None  # Disable pagination for tests expecting list response
+    def perform_create(self, serializer):
+        company = serializer.save()
+        # A new company has nothing to count yet
+        company.jobs_count = company.active_jobs_count = company.open_applications_count = 0
+
+class JobViewSet(ReplicaRoutingMixin, RateLimitMixin, ConditionalGetMixin, CachedResponseMixin, CompactJobListMixin,
+                 FastListMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """ViewSet for managing jobs with full CRUD operations"""
-    queryset = Job.objects.select_related('company', 'posted_by').prefetch_related('applications')
+    pagination_class = JobCursorPagination  # Opt-in via ?cursor= or ?page_size=
+    cache_scopes = ('jobs',)
+    rate_limit_scopes = {'list': 'anon_list', 'search': 'anon_list', 'export': 'anon_list'}
+    replica_actions = ('list', 'retrieve', 'my_jobs')
+    queryset = Job.objects.select_related('company', 'posted_by')
+    token_claims_actions = ('list', 'retrieve', 'search', 'export', 'applications', 'my_jobs')
     filter_backends = [DjangoFilterBackend]
     filterset_fields = {
         'job_type': ['exact'],
@@ -137,7 +162,7 @@ class JobViewSet(viewsets.ModelViewSet):
         return JobListSerializer
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'search', 'export']:
             return [permissions.AllowAny()]
         elif self.action == 'create':
             return [permissions.IsAuthenticated(), IsEmployerOrReadOnly()]
@@ -147,13 +172,13 @@ class JobViewSet(viewsets.ModelViewSet):
         """Filter jobs based on user type and action"""
         qs = super().get_queryset()
         
-        # For list view, show only active jobs to non-owners
-        if self.action == 'list':
+        # For list and search views, show only active jobs to non-owners
+        if self.action in ['list', 'search', 'export']:
             if not self.request.user.is_authenticated or self.request.user.user_type != 'employer':
                 return qs.filter(is_active=True)
             # Employers see all their jobs + active jobs from others
             return qs.filter(
-                Q(posted_by=self.request.user) | Q(is_active=True)
+                Q(posted_by_id=self.request.user.pk) | Q(is_active=True)
             )
         
         return qs
@@ -168,19 +193,47 @@ class JobViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You can only update your own job postings.")
         serializer.save()
 
+    @action(detail=False, methods=['GET'])
+    def search(self, request):
+        """Ranked full-text search over title, description, location and company name"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"detail": "The 'q' query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+        except ValueError:
+            limit = 50
+
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            jobs = get_search_backend().search(queryset, query)
+        except SearchUnavailable:
+            # External engine down or unconfigured: answer from the database index
+            jobs = get_database_search_backend().search(queryset, query)
+        serializer = self.get_serializer(jobs[:limit], many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['GET'])
+    def export(self, request):
+        """Stream the (filtered) job catalogue as NDJSON or CSV"""
+        return self.export_response(self.filter_queryset(self.get_queryset()), 'jobs')
+
     @action(detail=True, methods=['GET'], permission_classes=[IsAuthenticated, IsEmployerForApplications])
     def applications(self, request, pk=None):
         """Get applications for a specific job (employers only)"""
         job = self.get_object()
-        if job.posted_by != request.user:
+        if job.posted_by_id != request.user.pk:
             return Response(
                 {"detail": "You can only view applications for your own jobs."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        applications = job.applications.select_related('candidate').all()
-        serializer = ApplicationListSerializer(applications, many=True)
-        return Response(serializer.data)
+        applications = job.applications.for_list()
+        return Response(self.serialize_list(applications, ApplicationListSerializer))
 
     @action(detail=True, methods=['POST'], permission_classes=[IsAuthenticated])
     def toggle_active(self, request, pk=None):
@@ -204,16 +257,19 @@ class JobViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['GET'], permission_classes=[IsAuthenticated, IsEmployerForApplications])
     def my_jobs(self, request):
         """Get all jobs posted by the current employer"""
-        jobs = self.get_queryset().filter(posted_by=request.user)
-        serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        jobs = self.get_queryset().filter(posted_by_id=request.user.pk)
+        return Response(self.serialize_list(jobs))
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ReplicaRoutingMixin, RateLimitMixin, FastListMixin, StreamingExportMixin,
+                         viewsets.ModelViewSet):
     serializer_class = ApplicationListSerializer
+    rate_limit_scopes = {'create': 'apply'}
+    replica_actions = ('list', 'retrieve', 'my_applications')
     queryset = Application.objects.select_related('job__company', 'job__posted_by', 'candidate')
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'job__id', 'candidate__id']
     http_method_names = ['get', 'post', 'patch', 'delete']
+    token_claims_actions = ('list', 'retrieve', 'my_applications', 'export')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -225,32 +281,31 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action == 'create':
             return [permissions.IsAuthenticated(), IsCandidateForApplications()]
+        if self.action == 'bulk_update_status':
+            return super().get_permissions()  # The action's own permission_classes
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
         """Filter applications based on user type"""
         qs = super().get_queryset()
         user = self.request.user
+        if self.action in ['list', 'my_applications']:
+            qs = qs.for_list()
         
         if user.user_type == 'employer':
             # Employers see applications for their jobs
-            return qs.filter(job__posted_by=user)
+            return qs.filter(job__posted_by_id=user.pk)
         else:
             # Candidates see their own applications
-            return qs.filter(candidate=user)
+            return qs.filter(candidate_id=user.pk)
 
     def perform_create(self, serializer):
         """Create application with current user as candidate"""
-        application = serializer.save(candidate=self.request.user)
-
-        # If tests are running (pytest present), call tasks synchronously to avoid external broker
-        import sys
-        if 'pytest' in sys.modules:
-            # Skip sending emails when running tests to avoid external dependencies
-            return
-        # Send emails asynchronously via Celery in normal runtime
-        send_application_confirmation_email.delay(application.id)
-        send_new_application_notification_to_employer.delay(application.id)
+        with transaction.atomic():
+            application = serializer.save(candidate=self.request.user)
+            # Published to Celery by the outbox dispatcher once this commits
+            outbox.enqueue(send_application_confirmation_email, application.id)
+            outbox.enqueue(send_new_application_notification_to_employer, application.id)
 
     def perform_update(self, serializer):
         """Only allow employers to update application status"""
@@ -275,7 +330,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                     "You can only update applications that haven't been reviewed yet."
                 )
         
-        serializer.save()
+        old_status = application.status
+        with transaction.atomic():
+            application = serializer.save()
+            record_status_changes([(application.id, old_status, application.status)], changed_by=user)
 
     def perform_destroy(self, serializer):
         """Only allow candidates to withdraw their own applications"""
@@ -304,9 +362,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        applications = self.get_queryset().filter(candidate=request.user)
-        serializer = self.get_serializer(applications, many=True)
-        return Response(serializer.data)
+        applications = self.get_queryset().filter(candidate_id=request.user.pk)
+        return Response(self.serialize_list(applications))
+
+    @action(detail=False, methods=['GET'], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """Stream the user's (filtered) applications as NDJSON or CSV"""
+        return self.export_response(self.filter_queryset(self.get_queryset()), 'applications')
 
     @action(detail=True, methods=['POST'], permission_classes=[IsAuthenticated, IsEmployerForApplications])
     def update_status(self, request, pk=None):
@@ -326,8 +388,67 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        application.status = new_status
-        application.save()
+        old_status = application.status
+        with transaction.atomic():
+            application.status = new_status
+            application.save()
+            record_status_changes([(application.id, old_status, new_status)], changed_by=request.user)
         
         serializer = self.get_serializer(application)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['POST'], permission_classes=[IsAuthenticated, IsEmployerForApplications])
+    def bulk_update_status(self, request):
+        """Move many applications to one status (employers only)"""
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        ids = serializer.validated_data.get('ids')
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+        limit = settings.BULK_STATUS_UPDATE_MAX
+
+        # Ownership is part of the WHERE clause: other employers' rows simply never match
+        owned = Application.objects.filter(job__posted_by_id=request.user.pk)
+        if ids is not None:
+            targets = owned.filter(pk__in=ids)
+        else:
+            targets = owned.filter(**serializer.validated_data['filter'])
+
+        with transaction.atomic():
+            current = dict(targets.select_for_update().order_by('pk').values_list('pk', 'status')[:limit + 1])
+            if len(current) > limit:
+                return Response(
+                    {"detail": f"The filter matches more than {limit} applications; narrow it down."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Same transitions as ApplicationUpdateSerializer: rejected applications stay rejected
+            movable = Q(pk__in=list(current)) & ~Q(status=new_status)
+            if new_status != 'REJ':
+                movable &= ~Q(status='REJ')
+            changes = [
+                (pk, old_status, new_status) for pk, old_status in current.items()
+                if old_status != new_status and (new_status == 'REJ' or old_status != 'REJ')
+            ]
+            updated = Application.objects.filter(movable).update(status=new_status)
+            record_status_changes(changes, changed_by=request.user)
+        if updated:
+            invalidate_model('Application')
+
+        changed = {pk for pk, _, _ in changes}
+        results = []
+        for pk in (ids if ids is not None else current):
+            if pk not in current:
+                results.append({'id': pk, 'result': 'not_found'})
+            elif pk in changed:
+                results.append({'id': pk, 'result': 'updated', 'old_status': current[pk]})
+            elif current[pk] == new_status:
+                results.append({'id': pk, 'result': 'unchanged'})
+            else:
+                results.append({
+                    'id': pk,
+                    'result': 'invalid',
+                    'detail': 'Cannot change status of rejected application.',
+                })
+        return Response({'status': new_status, 'updated': updated, 'results': results})
@@ -38,7 +38,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'job_app.middleware.WhiteNoiseMiddleware',  # Async-capable WhiteNoise
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,6 +75,45 @@ DATABASES = {
     )
 }
 
+# Read replicas: DATABASE_REPLICA_URLS=postgres://replica-1/db,postgres://replica-2/db
+# become aliases replica_1, replica_2, ... (mirrors of default under test).
+# job_app.routers sends read-only list/detail requests to them.
+for number, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    DATABASES[f'replica_{number}'] = {**env.db_url_config(url), 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['job_app.routers.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+# Replica probes: interval, tolerated lag and how long a failing replica is skipped (seconds)
+REPLICA_HEALTH_CHECK_INTERVAL = env.int('REPLICA_HEALTH_CHECK_INTERVAL', default=10)
+REPLICA_MAX_LAG = env.float('REPLICA_MAX_LAG', default=5.0)
+REPLICA_EJECT_SECONDS = env.int('REPLICA_EJECT_SECONDS', default=30)
+
+# Connection reuse. PostgreSQL aliases draw from psycopg's connection pool (one
+# pool per worker process and alias); other backends keep persistent
+# connections for CONN_MAX_AGE seconds. Reused connections are health-checked
+# before each request either way.
+DATABASE_POOL = env.bool('DATABASE_POOL', default=True)
+DATABASE_POOL_OPTIONS = {
+    'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=2),
+    'max_size': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+    'timeout': env.float('DATABASE_POOL_TIMEOUT', default=10.0),  # seconds to wait for a free connection
+    'max_idle': env.float('DATABASE_POOL_MAX_IDLE', default=300.0),
+    'max_lifetime': env.float('DATABASE_POOL_MAX_LIFETIME', default=3600.0),
+}
+for alias, database in DATABASES.items():
+    database['CONN_HEALTH_CHECKS'] = True
+    if DATABASE_POOL and database['ENGINE'] == 'django.db.backends.postgresql':
+        # Django passes check=ConnectionPool.check_connection itself when
+        # CONN_HEALTH_CHECKS is on, validating connections on checkout
+        database.setdefault('OPTIONS', {})['pool'] = {**DATABASE_POOL_OPTIONS, 'name': alias}
+    else:
+        database['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)
+# Pool statistics are published to the cache this often (seconds) per process;
+# utilization at or above DATABASE_POOL_SATURATION_WARNING logs a warning
+DATABASE_POOL_STATS_INTERVAL = env.int('DATABASE_POOL_STATS_INTERVAL', default=30)
+DATABASE_POOL_SATURATION_WARNING = env.float('DATABASE_POOL_SATURATION_WARNING', default=0.9)
+
 # Custom User Model
 AUTH_USER_MODEL = 'job_app.User'
 
@@ -106,7 +145,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # DRF Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'job_app.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -130,9 +169,17 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
     'AUTH_HEADER_TYPES': ('JWT', 'Bearer'),
-    # 'TOKEN_OBTAIN_SERIALIZER': 'job_app.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_OBTAIN_SERIALIZER': 'job_app.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'job_app.serializers.CustomTokenRefreshSerializer',
 }
 
+# Answer read-only requests from the access token's claims (job_app.authentication)
+# without loading the user; token versions are cached for TOKEN_VERSION_CACHE_TIMEOUT seconds,
+# which bounds how long a revoked token lives on workers that do not share the cache
+# (check --deploy rejects a per-process cache while this is on)
+JWT_STATELESS_READS = env.bool('JWT_STATELESS_READS', default=True)
+TOKEN_VERSION_CACHE_TIMEOUT = env.int('TOKEN_VERSION_CACHE_TIMEOUT', default=60)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = env.list(
     'CORS_ALLOWED_ORIGINS',
@@ -183,12 +230,89 @@ CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 CELERY_TASK_ROUTES = {
     'job_app.tasks.send_application_confirmation_email': {'queue': 'emails'},
     'job_app.tasks.send_application_status_update_email': {'queue': 'emails'},
+    'job_app.tasks.send_bulk_email_chunk': {'queue': 'emails'},
+    'job_app.tasks.send_next_bulk_email_chunk': {'queue': 'emails'},
 }
 
 # Task time limits
 CELERY_TASK_SOFT_TIME_LIMIT = 300  # 5 minutes
 CELERY_TASK_TIME_LIMIT = 600  # 10 minutes
 
+# Transactional outbox (job_app.outbox): events per dispatch batch, dispatcher
+# poll interval in seconds, and days dispatched events are kept
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=500)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=1.0)
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=7)
+# Failed dispatches after which an event is parked (failed_at) instead of retried
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=10)
+
+# Seconds a status transition waits before notifying the candidate, so rapid
+# successive changes are folded into one email
+APPLICATION_STATUS_NOTIFY_DELAY = env.int('APPLICATION_STATUS_NOTIFY_DELAY', default=120)
+
+# Most applications one bulk_update_status request may change
+BULK_STATUS_UPDATE_MAX = env.int('BULK_STATUS_UPDATE_MAX', default=1000)
+
+# Filtered admin changelists of large tables count at most this many rows
+ADMIN_EXACT_COUNT_LIMIT = env.int('ADMIN_EXACT_COUNT_LIMIT', default=10000)
+
 # Email task specific settings
 EMAIL_TASK_MAX_RETRIES = 3
-EMAIL_TASK_RETRY_DELAY = 60  # seconds
\ No newline at end of file
+EMAIL_TASK_RETRY_DELAY = 60  # seconds
+
+# Pooled mail connection (job_app.mail): NOOP probe after this many idle
+# seconds, and reopen connections older than MAIL_CONNECTION_MAX_AGE
+MAIL_KEEPALIVE = env.int('MAIL_KEEPALIVE', default=30)
+MAIL_CONNECTION_MAX_AGE = env.int('MAIL_CONNECTION_MAX_AGE', default=300)
+
+# send_bulk_email_notifications: applications loaded per query and sent per subtask,
+# and chunk subtasks of one run in flight at once
+EMAIL_BULK_CHUNK_SIZE = env.int('EMAIL_BULK_CHUNK_SIZE', default=500)
+EMAIL_BULK_CONCURRENCY = env.int('EMAIL_BULK_CONCURRENCY', default=4)
+
+# Job search
+# Dotted path to a job_app.search backend; defaults to the database's native
+# full-text engine (FTS5 on SQLite, tsvector on PostgreSQL).
+JOB_SEARCH_BACKEND = env('JOB_SEARCH_BACKEND', default=None)
+
+# Elasticsearch mirror of active jobs (optional). When JOB_SEARCH_BACKEND is
+# 'job_app.search.elastic.ElasticsearchSearchBackend' the search endpoint
+# queries this index and falls back to the database engine if it is down.
+ELASTICSEARCH_URL = env('ELASTICSEARCH_URL', default=None)
+ELASTICSEARCH_JOB_INDEX = env('ELASTICSEARCH_JOB_INDEX', default='jobs')
+ELASTICSEARCH_CLIENT_OPTIONS = {
+    'request_timeout': env.float('ELASTICSEARCH_TIMEOUT', default=2.0),
+}
+ELASTICSEARCH_MAX_RESULTS = 500
+ELASTICSEARCH_SYNC_OVERLAP = 60  # seconds re-scanned before the watermark
+
+# Cache (locmemcache://, filecache:///path, redis://host:6379/1)
+CACHES = {
+    'default': env.cache_url('CACHE_URL', default='locmemcache://'),
+}
+
+# Anonymous job/company list and detail responses
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+
+# Serialize job/application lists with compiled values()-based serializers
+FAST_LIST_SERIALIZERS = env.bool('FAST_LIST_SERIALIZERS', default=False)
+
+# Rows fetched and serialized per round trip by the streaming export endpoints
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Rate limiting (job_app.ratelimit). Counters are shared through Redis when
+# RATE_LIMIT_REDIS_URL is set, otherwise through a SQLite file used by every
+# worker on the host (also the fallback while Redis is unreachable).
+RATE_LIMIT_ENABLED = env.bool('RATE_LIMIT_ENABLED', default=True)
+RATE_LIMIT_REDIS_URL = env('RATE_LIMIT_REDIS_URL', default=None)
+RATE_LIMIT_SQLITE_PATH = env('RATE_LIMIT_SQLITE_PATH', default=str(BASE_DIR / 'ratelimit.sqlite3'))
+RATE_LIMIT_TIMEOUT = env.float('RATE_LIMIT_TIMEOUT', default=0.5)  # seconds
+# Scopes referenced by each view's rate_limit_scopes; 'burst' is the token bucket size
+RATE_LIMITS = {
+    'register': {'algorithm': 'sliding_window', 'rate': env('RATE_LIMIT_REGISTER', default='20/hour'), 'key': 'ip'},
+    'delete': {'algorithm': 'sliding_window', 'rate': env('RATE_LIMIT_DELETE', default='100/day'), 'key': 'user'},
+    'apply': {'algorithm': 'token_bucket', 'rate': env('RATE_LIMIT_APPLY', default='100/hour'), 'burst': 20,
+              'key': 'user'},
+    'anon_list': {'algorithm': 'token_bucket', 'rate': env('RATE_LIMIT_ANON_LIST', default='1000/hour'),
+                  'burst': 100, 'key': 'anon'},
+}